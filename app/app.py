@@ -1,11 +1,12 @@
 # app/app.py
-from flask import Flask, jsonify, request, render_template
+from flask import Flask, Response, jsonify, request, render_template, stream_with_context
 from app.services.mlb_api import MlbApi
 from app.services.season_simulator import SeasonSimulator
 from app.services.database_manager import DatabaseManager
 from app.services.betting_analyzer import BettingAnalyzer
 from app.services.scheduler_service import SchedulerService
 from app.services.live_game_service import LiveGameService
+from app.services.simulation_job_manager import SimulationJobManager
 from app.utils.shutdown_handler import ShutdownHandler
 
 app = Flask(__name__)
@@ -13,6 +14,7 @@ db_manager = DatabaseManager()
 mlb_api = MlbApi(db_manager)
 betting_analyzer = BettingAnalyzer(db_manager)
 live_service = LiveGameService(db_manager)
+simulation_jobs = SimulationJobManager(db_manager, mlb_api)
 
 # Initialize Shutdown Handler
 shutdown_handler = ShutdownHandler()
@@ -65,6 +67,16 @@ def latest_simulation():
     else:
         return jsonify({"error": "No simulation results found."}), 404
 
+@app.route('/api/season-leverage')
+def season_leverage():
+    """
+    Returns remaining games ranked by how much they move playoff odds (nightly).
+    """
+    leverage = db_manager.get_cached_data("season_leverage", max_age_seconds=86400)
+    if leverage is None:
+        return jsonify({"error": "No season leverage ranking found."}), 404
+    return jsonify({"count": len(leverage), "games": leverage})
+
 @app.route('/betting-value')
 def betting_value():
     # Get upcoming games (just next 15 for demo)
@@ -75,7 +87,9 @@ def betting_value():
         return jsonify({"error": "Missing data."}), 500
 
     next_games = schedule[:15]
-    opportunities = betting_analyzer.analyze_schedule(next_games, teams)
+    # Nightly season-leverage ranking (SchedulerService), if available
+    leverage = db_manager.get_cached_data("season_leverage", max_age_seconds=86400)
+    opportunities = betting_analyzer.analyze_schedule(next_games, teams, leverage)
 
     return jsonify({
         "count": len(opportunities),
@@ -115,5 +129,53 @@ def simulate():
         "probabilities": enhanced_probabilities
     })
 
+@app.route('/api/simulations', methods=['POST'])
+def start_simulation_job():
+    """
+    Starts a background season simulation and returns its job id.
+    Follow progress at /api/simulations/<job_id>/stream (Server-Sent Events).
+    """
+    payload = request.get_json(silent=True) or {}
+    iterations = payload.get('iterations', request.args.get('iterations', default=1000, type=int))
+    try:
+        job = simulation_jobs.start(iterations)
+    except (TypeError, ValueError):
+        return jsonify({"error": "iterations must be an integer."}), 400
+    if job is None:
+        return jsonify({"error": "Too many simulations running; try again later."}), 429
+
+    return jsonify({
+        "job_id": job.id,
+        "iterations": job.iterations,
+        "stream_url": f"/api/simulations/{job.id}/stream"
+    }), 202
+
+@app.route('/api/simulations/<job_id>')
+def simulation_job_status(job_id):
+    job = simulation_jobs.get(job_id)
+    if job is None:
+        return jsonify({"error": "Unknown simulation job."}), 404
+    return jsonify(job.to_dict())
+
+@app.route('/api/simulations/<job_id>/stream')
+def simulation_job_stream(job_id):
+    """
+    Streams running probabilities and 95% intervals as each chunk finishes.
+    """
+    if simulation_jobs.get(job_id) is None:
+        return jsonify({"error": "Unknown simulation job."}), 404
+    return Response(
+        stream_with_context(simulation_jobs.stream(job_id)),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
+@app.route('/api/simulations/<job_id>/cancel', methods=['POST'])
+def cancel_simulation_job(job_id):
+    job = simulation_jobs.cancel(job_id)
+    if job is None:
+        return jsonify({"error": "Unknown simulation job."}), 404
+    return jsonify({"job_id": job.id, "status": job.status, "cancel_requested": True})
+
 if __name__ == '__main__':
     app.run(debug=False, host='0.0.0.0', port=5555)
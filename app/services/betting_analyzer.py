@@ -1,6 +1,6 @@
 from app.services.forecasting_model import ForecastingModel
 from app.services.trader_agent import TraderAgent
-import random
+import numpy as np
 from decimal import Decimal
 
 class BettingAnalyzer:
@@ -9,8 +9,9 @@ class BettingAnalyzer:
     Level 300 Update: Implements Vig Removal and Fair Price Discovery.
     """
 
-    def __init__(self, db_manager):
-        self.forecasting_model = ForecastingModel(db_manager)
+    def __init__(self, db_manager, rng=None):
+        self.rng = np.random.default_rng(rng)
+        self.forecasting_model = ForecastingModel(db_manager, rng=self.rng)
         self.trader_agent = TraderAgent()
 
     def generate_mock_odds(self, home_prob):
@@ -39,11 +40,15 @@ class BettingAnalyzer:
         
         return implied_home / overround, implied_away / overround
 
-    def analyze_schedule(self, schedule, teams):
+    def analyze_schedule(self, schedule, teams, leverage=None):
         """
         Analyzes a list of games and returns value opportunities.
+        leverage: optional SeasonCheckpoint.rank_games_by_leverage() list; matching
+        games report their playoff-odds leverage.
         """
         insights = []
+        matchup_matrix, team_index = self.forecasting_model.build_matchup_matrix(teams)
+        leverage_by_game = {entry['game_id']: entry['leverage'] for entry in (leverage or [])}
         
         for game in schedule:
             home_id = game['home_id']
@@ -55,11 +60,11 @@ class BettingAnalyzer:
             home_team = teams[home_id]
             away_team = teams[away_id]
             
-            # 1. Get Model Probability
-            home_prob = self.forecasting_model.get_matchup_probability(home_team, away_team)
+            # 1. Get Model Probability (precomputed Log5 matrix)
+            home_prob = float(matchup_matrix[team_index[home_id], team_index[away_id]])
             
             # 2. Get Market Odds (Mocked for now)
-            variance = random.uniform(-0.10, 0.10) 
+            variance = self.rng.uniform(-0.10, 0.10) 
             market_home_prob = min(max(home_prob + variance, 0.20), 0.80)
             home_odds = self.generate_mock_odds(market_home_prob)
             
@@ -89,7 +94,8 @@ class BettingAnalyzer:
                     "ev_percent": round(trade_decision['edge'] * 100, 1), 
                     "wager_amount": trade_decision['wager_amount'],
                     "wager_percent": round(trade_decision['wager_percent'] * 100, 2),
-                    "reason": trade_decision['reason']
+                    "reason": trade_decision['reason'],
+                    "season_leverage": leverage_by_game.get(game.get('game_id'), 0.0)
                 })
         
         return sorted(insights, key=lambda x: x['ev_percent'], reverse=True)
\ No newline at end of file
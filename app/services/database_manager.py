@@ -1,14 +1,26 @@
 import sqlite3
 import json
 import os
+import threading
+import time
+import numpy as np
 import psycopg
 from psycopg.rows import dict_row
 from datetime import datetime, timedelta
 
 class DatabaseManager:
+    STATS_CACHE_TTL = 60    # Seconds a bulk stats read is trusted before re-checking stats_versions
+    TEAM_STATS_COLUMNS = ('team_id', 'season', 'runs_scored', 'runs_allowed', 'pythagorean_win_pct', 'updated_at')
+    PITCHER_STATS_COLUMNS = ('player_id', 'name', 'team', 'season', 'era', 'fip', 'ip', 'updated_at')
+    NUMERIC_STATS_COLUMNS = {'runs_scored', 'runs_allowed', 'pythagorean_win_pct', 'era', 'fip', 'ip'}
+
     def __init__(self, db_path="data/mlb_data.db"):
         self.db_url = os.getenv("DATABASE_URL")
         self.db_path = db_path
+
+        # In-process bulk stats cache: (table, season) -> {'version', 'rows', 'checked_at'}
+        self._stats_cache = {}
+        self._stats_cache_lock = threading.Lock()
         
         if not self.db_url:
             self._ensure_data_dir()
@@ -120,6 +132,14 @@ class DatabaseManager:
             )
         ''')
 
+        # Write counter per stats table (bumped by every save, read by the bulk stats cache)
+        self._execute(cursor, f'''
+            CREATE TABLE IF NOT EXISTS stats_versions (
+                table_name {text_type} PRIMARY KEY,
+                version INTEGER NOT NULL
+            )
+        ''')
+
         # NEW: Table for Latency Metrics (Phase 1)
         self._execute(cursor, f'''
             CREATE TABLE IF NOT EXISTS feed_latency_metrics (
@@ -339,8 +359,10 @@ class DatabaseManager:
             params = (storage_id, season, runs, runs_allowed, pyth_pct, val_timestamp)
             self._execute(cursor, query, params)
             
+        self._bump_stats_version(cursor, "team_stats_advanced")
         conn.commit()
         conn.close()
+        self._invalidate_stats_cache("team_stats_advanced")
 
     def save_pitcher_stats(self, players_list, season):
         """
@@ -387,14 +409,98 @@ class DatabaseManager:
             )
             self._execute(cursor, query, params)
             
+        self._bump_stats_version(cursor, "pitcher_stats")
         conn.commit()
         conn.close()
-        
+        self._invalidate_stats_cache("pitcher_stats")
+
+    def get_all_team_stats(self, season=None, as_arrays=False):
+        """
+        Every row of team_stats_advanced (optionally one season) in one round trip.
+        Returns {team_id (str): row dict}, or {column: np.ndarray} with as_arrays.
+        Served from the in-process cache, keyed on the table's stats_versions counter
+        and rechecked at most every STATS_CACHE_TTL seconds: writes from other
+        processes can take up to that long to show. Treat as read-only.
+        """
+        rows = self._load_stats_table("team_stats_advanced", season)
+        if as_arrays:
+            return self._rows_to_arrays(rows, self.TEAM_STATS_COLUMNS)
+        return {str(row['team_id']): row for row in rows}
+
+    def get_pitcher_stats(self, season, as_arrays=False):
+        """
+        Every pitcher_stats row for a season in one round trip.
+        Returns {player_id: row dict}, or {column: np.ndarray} with as_arrays.
+        Served from the in-process cache, keyed on the table's stats_versions counter
+        and rechecked at most every STATS_CACHE_TTL seconds: writes from other
+        processes can take up to that long to show. Treat as read-only.
+        """
+        rows = self._load_stats_table("pitcher_stats", season)
+        if as_arrays:
+            return self._rows_to_arrays(rows, self.PITCHER_STATS_COLUMNS)
+        return {row['player_id']: row for row in rows}
+
+    def get_all_pythagorean_win_pcts(self):
+        """Returns {team_id (str): pythagorean_win_pct} for every team in one query."""
+        return {team_id: row['pythagorean_win_pct'] for team_id, row in self.get_all_team_stats().items()}
+
     def get_advanced_team_stats(self, team_key):
         """Returns {pythagorean_win_pct: float}"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        self._execute(cursor, "SELECT pythagorean_win_pct FROM team_stats_advanced WHERE team_id = ?", (str(team_key),))
-        row = cursor.fetchone()
-        conn.close()
+        row = self.get_all_team_stats().get(str(team_key))
         return row['pythagorean_win_pct'] if row else None
+
+    def _load_stats_table(self, table, season=None):
+        """
+        Reads a stats table on one connection. The cached rows are reused while
+        the table's stats_versions counter is unchanged (checked at most every
+        STATS_CACHE_TTL seconds), so writes from other processes are picked up.
+        """
+        key = (table, season)
+        where, params = ("WHERE season = ?", (season,)) if season is not None else ("", None)
+
+        with self._stats_cache_lock:
+            cached = self._stats_cache.get(key)
+        if cached and time.monotonic() - cached['checked_at'] < self.STATS_CACHE_TTL:
+            return cached['rows']
+
+        conn = self.get_connection()
+        try:
+            cursor = conn.cursor()
+            self._execute(cursor, "SELECT version FROM stats_versions WHERE table_name = ?", (table,))
+            row = cursor.fetchone()
+            version = row['version'] if row else 0
+
+            if cached and cached['version'] == version:
+                rows = cached['rows']
+            else:
+                self._execute(cursor, f"SELECT * FROM {table} {where}", params)
+                rows = [dict(r) for r in cursor.fetchall()]
+        finally:
+            conn.close()
+
+        with self._stats_cache_lock:
+            self._stats_cache[key] = {'version': version, 'rows': rows, 'checked_at': time.monotonic()}
+        return rows
+
+    def _bump_stats_version(self, cursor, table):
+        """Increments a table's write counter inside the caller's transaction."""
+        self._execute(cursor, '''
+            INSERT INTO stats_versions (table_name, version) VALUES (?, 1)
+            ON CONFLICT(table_name) DO UPDATE SET version = stats_versions.version + 1
+        ''', (table,))
+
+    def _invalidate_stats_cache(self, table):
+        with self._stats_cache_lock:
+            for key in [k for k in self._stats_cache if k[0] == table]:
+                del self._stats_cache[key]
+
+    def _rows_to_arrays(self, rows, columns):
+        """Column arrays; numeric columns are float with NaN for NULL."""
+        arrays = {}
+        for col in columns:
+            values = [row.get(col) for row in rows]
+            if col in self.NUMERIC_STATS_COLUMNS:
+                arrays[col] = np.array([np.nan if v is None else v for v in values], dtype=float)
+            else:
+                arrays[col] = np.array(values)
+        return arrays
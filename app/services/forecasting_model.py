@@ -1,14 +1,24 @@
 # app/services/forecasting_model.py
 
-import random
+import numpy as np
 
 class ForecastingModel:
     """
     The 'Forecasting Agent'. Its responsibility is to predict the outcome of a single game.
     """
+
+    HOME_FIELD_ADVANTAGE = 0.03     # +3% is standard/conservative
+    MIN_PROBABILITY = 0.01
+    MAX_PROBABILITY = 0.99
     
-    def __init__(self, db_manager=None):
+    def __init__(self, db_manager=None, rng=None):
+        """
+        Args:
+            db_manager: Optional DB connection for advanced stats.
+            rng: numpy Generator or seed shared with the calling simulator.
+        """
         self.db = db_manager
+        self.rng = np.random.default_rng(rng)
         self.stats_cache = {}
 
     def predict_winner(self, home_team, away_team):
@@ -17,28 +27,63 @@ class ForecastingModel:
         """
         home_prob = self.get_matchup_probability(home_team, away_team)
 
-        if random.random() < home_prob:
+        if self.rng.random() < home_prob:
             return home_team
         else:
             return away_team
 
+    def build_matchup_matrix(self, teams):
+        """
+        Precomputes P(home wins) for every pair of teams in one pass.
+        Strengths come from a fresh bulk DB query on every call (stats_cache is
+        refreshed with them). The matrix is returned, not stored, so shared
+        models stay safe across requests.
+
+        Args:
+            teams (dict): Teams indexed by ID; matrix rows/columns follow its order.
+
+        Returns (matrix, team_index): matrix[h, a] = P(h beats a at home),
+        team_index maps team id -> row/column.
+        """
+        team_list = list(teams.values())
+
+        # 1. Strengths: one query for every team, falling back to standings win %
+        pyth = self.db.get_all_pythagorean_win_pcts() if self.db else {}
+        pct = np.empty(len(team_list))
+        for i, team in enumerate(team_list):
+            key = str(team['id'])
+            value = pyth.get(key)
+            pct[i] = value if value is not None else team.get('win_percentage', 0.5)
+            self.stats_cache[key] = pct[i]
+
+        # 2. Log5 for every (home, away) pair
+        matrix = self.log5_home_probability(pct[:, None], pct[None, :])
+        team_index = {team['id']: i for i, team in enumerate(team_list)}
+        return matrix, team_index
+
     def get_matchup_probability(self, home_team, away_team):
         """
         Returns the probability (0.0 to 1.0) of the home team winning.
         """
-        # 1. Base Probability (Pythagorean or Standard)
-        home_prob = self._get_base_probability(home_team, away_team)
-        
-        # 2. Home Field Advantage (+3% is standard/conservative)
-        home_prob += 0.03
-        
-        # 3. Clamp probability between 1% and 99%
-        return min(max(home_prob, 0.01), 0.99)
+        h_pct, a_pct = self._get_win_pcts(home_team, away_team)
+        return float(self.log5_home_probability(h_pct, a_pct))
 
-    def _get_base_probability(self, home_team, away_team):
+    @classmethod
+    def log5_home_probability(cls, h_pct, a_pct):
         """
-        Calculates the base win probability for the home team using Log5
-        with either Pythagorean Win % (preferred) or actual Win %.
+        Log5 with home field and clamp; scalars or broadcastable arrays.
+        Log5 Formula: (A - A*B) / (A + B - 2*A*B), A = home, B = away win %.
+        """
+        h = np.asarray(h_pct, dtype=float)
+        a = np.asarray(a_pct, dtype=float)
+        num = h - (h * a)
+        den = h + a - (2 * h * a)
+        base = np.divide(num, den, out=np.full(den.shape, 0.5), where=den != 0)
+        return np.clip(base + cls.HOME_FIELD_ADVANTAGE, cls.MIN_PROBABILITY, cls.MAX_PROBABILITY)
+
+    def _get_win_pcts(self, home_team, away_team):
+        """
+        Strength of each team: Pythagorean Win % (preferred) or actual Win %.
         """
         h_id = str(home_team['id'])
         a_id = str(away_team['id'])
@@ -64,14 +109,4 @@ class ForecastingModel:
         if a_pct is None:
             a_pct = away_team.get('win_percentage', 0.5)
             
-        # 3. Log5 Formula: (A - A*B) / (A + B - 2*A*B)
-        # This handles the relative strength better than simple ratio
-        # A = h_pct, B = a_pct
-        
-        num = h_pct - (h_pct * a_pct)
-        den = h_pct + a_pct - (2 * h_pct * a_pct)
-        
-        if den == 0:
-            return 0.5
-            
-        return num / den
+        return h_pct, a_pct
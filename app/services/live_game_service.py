@@ -7,7 +7,9 @@ from app.services.market_simulator import MarketSimulator
 from app.services.latency_monitor import LatencyMonitor
 from app.services.markov_chain_service import MarkovChainService
 from app.services.notification_service import NotificationService
+from app.services.transition_ingestor import TransitionStore
 import datetime
+import os
 
 class LiveGameService:
     """
@@ -18,7 +20,13 @@ class LiveGameService:
     def __init__(self, db_manager=None):
         self.mlb_api = MlbApi(db_manager)
         self.state_engine = StateEngine()
-        self.markov_service = MarkovChainService()
+        # Empirical event rates (memory-mapped once), hardcoded rates if never ingested
+        self.transition_store = TransitionStore.load_or_none()
+        # MARKOV_LOOKUP_TABLE=1 serves win probs from the precomputed tensor
+        self.markov_service = MarkovChainService(
+            use_lookup_table=os.getenv("MARKOV_LOOKUP_TABLE") == "1",
+            transition_store=self.transition_store
+        )
         self.bullpen_service = BullpenHistoryService()
         self.trader_agent = TraderAgent()
         self.market_sim = MarketSimulator() # Placeholder for real odds API
@@ -57,13 +65,33 @@ class LiveGameService:
             return self._get_mock_games()
         # --------------------------------------------
 
+        # 2. Extract state for every live game
+        game_states = []
         for game in schedule:
             # Check status
             status = game.get('status', 'Unknown')
             if status == 'I': 
-                game_data = self._process_live_game(game['game_id'])
-                if game_data:
-                    live_games.append(game_data)
+                game_state = self._extract_game_state(game['game_id'])
+                if game_state:
+                    game_states.append(game_state)
+                    
+        if not game_states:
+            return live_games
+            
+        # 3. Score the full slate in a single vectorized pass
+        sharp_probs = self.markov_service.get_instant_win_prob_batch(
+            innings=[g['inning'] for g in game_states],
+            outs=[g['outs'] for g in game_states],
+            runner_masks=[g['runners'][0] + 2 * g['runners'][1] + 4 * g['runners'][2] for g in game_states],
+            score_diffs=[g['home_score'] - g['away_score'] for g in game_states],
+            is_top_innings=[g['is_top'] for g in game_states],
+            pitcher_mods=[g['pitcher_modifier'] for g in game_states],
+            defense_mods=[1.0] * len(game_states) # Placeholder for Phase 3 Hardening
+        )
+        
+        # 4. Trader Analysis per game
+        for game_state, sharp_prob in zip(game_states, sharp_probs):
+            live_games.append(self._evaluate_game_state(game_state, float(sharp_prob)))
         
         return live_games
 
@@ -140,6 +168,28 @@ class LiveGameService:
         """
         Analyzes a single live game.
         """
+        game_state = self._extract_game_state(game_pk)
+        if not game_state:
+            return None
+            
+        # Phase 2: Use Markov Service for Instant Lookup
+        sharp_prob = self.markov_service.get_instant_win_prob(
+            inning=game_state['inning'],
+            outs=game_state['outs'],
+            runners=game_state['runners'],
+            score_diff=game_state['home_score'] - game_state['away_score'],
+            is_top_inning=game_state['is_top'],
+            pitcher_mod=game_state['pitcher_modifier'],
+            defense_mod=1.0 # Placeholder for Phase 3 Hardening
+        )
+        
+        return self._evaluate_game_state(game_state, sharp_prob)
+
+    def _extract_game_state(self, game_pk):
+        """
+        Fetches a live game and extracts the state needed for scoring.
+        Also runs the latency check and updates the pitcher monitors.
+        """
         # 1. Fetch Granular Data
         live_data = self.mlb_api.get_live_game_data(game_pk)
         if not live_data:
@@ -204,19 +254,42 @@ class LiveGameService:
         # Update Monitor (Simplified for poll-based: just update ID)
         active_monitor.update_pitcher(pitcher_id, is_starter=True) 
         
-        # 4. Calculate Probabilities
+        # 4. Pitcher Modifier
         pitcher_modifier = active_monitor.get_performance_modifier()
         
-        # Phase 2: Use Markov Service for Instant Lookup
-        sharp_prob = self.markov_service.get_instant_win_prob(
-            inning=current_inning,
-            outs=outs,
-            runners=[r1, r2, r3],
-            score_diff=home_score - away_score,
-            is_top_inning=is_top,
-            pitcher_mod=pitcher_modifier,
-            defense_mod=1.0 # Placeholder for Phase 3 Hardening
-        )
+        return {
+            "game_pk": game_pk,
+            "home_name": home_name,
+            "away_name": away_name,
+            "inning": current_inning,
+            "is_top": is_top,
+            "outs": outs,
+            "home_score": home_score,
+            "away_score": away_score,
+            "runners": [r1, r2, r3],
+            "state_idx": state_idx,
+            "pitcher_name": pitcher_name,
+            "pitcher_modifier": pitcher_modifier,
+            "latency_safe": is_latency_safe
+        }
+
+    def _evaluate_game_state(self, game_state, sharp_prob):
+        """
+        Runs market lookup, trader analysis and signal logging for one scored game.
+        """
+        game_pk = game_state['game_pk']
+        home_name = game_state['home_name']
+        away_name = game_state['away_name']
+        current_inning = game_state['inning']
+        is_top = game_state['is_top']
+        outs = game_state['outs']
+        home_score = game_state['home_score']
+        away_score = game_state['away_score']
+        r1, r2, r3 = game_state['runners']
+        state_idx = game_state['state_idx']
+        pitcher_name = game_state['pitcher_name']
+        pitcher_modifier = game_state['pitcher_modifier']
+        is_latency_safe = game_state['latency_safe']
         
         # 5. Market Odds (Simulated for Phase 3 until API upgrade)
         market_odds = self.market_sim.get_market_odds(
@@ -1,5 +1,9 @@
 import numpy as np
+import threading
+from collections import OrderedDict
+from scipy.linalg import lu_factor, lu_solve
 from app.services.state_engine import StateEngine
+from app.services.win_prob_table import WinProbabilityTable
 
 class MarkovChainService:
     """
@@ -19,12 +23,58 @@ class MarkovChainService:
     STATE_TO_IDX = {state: i for i, state in enumerate(STATES)}
     IDX_TO_STATE = {i: state for i, state in enumerate(STATES)}
     END_STATE_IDX = 24 # 3 Outs
+    EVENTS = ('out', 'bb', '1b', '2b', '3b', 'hr')
 
-    def __init__(self):
+    # League-average PA event rates. Replaced by the ingested empirical rates
+    # when a TransitionStore is passed in (scripts/ingest_transitions.py).
+    BASE_EVENT_RATES = {'out': 0.68, 'bb': 0.085, '1b': 0.15, '2b': 0.05, '3b': 0.005, 'hr': 0.03}
+
+    # RE24 Cache (keyed on quantized modifiers)
+    CACHE_MAX_SIZE = 256   # Distinct (pitcher_mod, ttto, defense_mod) combos kept hot
+    CACHE_PRECISION = 3    # Modifiers rounded to 0.001 before keying
+
+    # Sigmoid constants (from StateEngine)
+    BASELINE_RE24 = 0.51
+    VOLATILITY_SCALE = 1.17
+    HOME_FIELD_Z = 0.10
+
+    def __init__(self, cache_size=CACHE_MAX_SIZE, use_lookup_table=False,
+                 table_path=WinProbabilityTable.DEFAULT_PATH, base_rates=None, transition_store=None):
+        """
+        Args:
+            cache_size: Max RE24 vectors held in the LRU cache.
+            use_lookup_table: If True, serve get_instant_win_prob from the
+                              precomputed WinProbabilityTable (loaded once here).
+            table_path: .npy table built by scripts/build_win_prob_table.py.
+            base_rates: Optional {event: rate} overriding BASE_EVENT_RATES.
+            transition_store: Optional TransitionStore; its latest league rates
+                              are used when base_rates is not given.
+        """
         self.state_engine = StateEngine()
-        self.transition_cache = {}
+        if base_rates is None and transition_store is not None:
+            base_rates = transition_store.get_league_event_rates()
+        self.base_rates = dict(self.BASE_EVENT_RATES, **(base_rates or {}))
+        # LRU: key -> solved RE24 vector (read-only)
+        # Shared across request threads; every cache access goes through the lock.
+        self.transition_cache = OrderedDict()
+        self.cache_size = cache_size
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self._cache_lock = threading.Lock()
         self._init_masks()
         self._init_run_masks()
+        
+        # Stacked in EVENTS order for vectorized matrix builds
+        self.event_masks = np.stack([
+            self.mask_out, self.mask_bb, self.mask_1b, self.mask_2b, self.mask_3b, self.mask_hr
+        ])
+        self.event_runs = np.stack([
+            np.zeros(24), self.runs_bb, self.runs_1b, self.runs_2b, self.runs_3b, self.runs_hr
+        ])
+        
+        self.win_prob_table = None
+        if use_lookup_table:
+            self.win_prob_table = WinProbabilityTable.load_or_build(self, table_path)
 
     def _init_masks(self):
         """Pre-compute transition masks for O(1) matrix generation."""
@@ -110,135 +160,296 @@ class MarkovChainService:
         # TTTO approximation (placeholder, should be passed in)
         ttto = 1 
         
-        # 2. Get Matrix
-        matrix = self._get_transition_matrix(pitcher_mod, ttto, defense_mod)
+        # 2. Get Current State Index
+        state_idx = self.state_engine.get_current_state_index(outs, runners[0], runners[1], runners[2])
         
-        # 3. Calculate RE24 Vector (Expected Runs) from Matrix
-        re24_vector = self._calculate_re24_vector(matrix)
+        # Fast Path: Precomputed tensor (defense_mod only bites above 1.0)
+        if self.win_prob_table is not None and defense_mod <= 1.0:
+            win_prob = self.win_prob_table.lookup(inning, is_top_inning, state_idx, score_diff, pitcher_mod)
+            if win_prob is not None:
+                return win_prob
         
-        # 4. Get Current State Index
-        state_idx = self.state_engine.get_current_state_index(outs, runners[0], runners[1], runners[2])
+        # 3. Get RE24 Vector (Expected Runs) - cached per modifier combo
+        re24_vector = self.get_re24_vector(pitcher_mod, ttto, defense_mod)
         
-        # 5. Extract Expected Runs for current state
+        # 4. Extract Expected Runs for current state
         if state_idx < 24:
             current_re24 = re24_vector[state_idx]
         else:
             current_re24 = 0.0
             
-        # 6. Apply Sigmoid Logic (Leverage Delta)
-        # Constants from StateEngine
-        BASELINE_RE24 = 0.51
-        VOLATILITY_SCALE = 1.17
-        HOME_FIELD_Z = 0.10
-        
-        leverage = current_re24 - BASELINE_RE24
-        
-        if is_top_inning: # Away batting
-            effective_diff = score_diff - leverage
-        else: # Home batting
-            effective_diff = score_diff + leverage
+        # 5. Apply Sigmoid Logic (Leverage Delta)
+        return float(self._sigmoid_win_prob(current_re24, inning, score_diff, is_top_inning))
+
+    def get_instant_win_prob_batch(self, innings, outs, runner_masks, score_diffs, is_top_innings,
+                                   pitcher_mods=None, defense_mods=None):
+        """
+        Vectorized get_instant_win_prob for a full slate in one NumPy pass.
+
+        Args:
+            innings, outs, score_diffs: int arrays (one entry per game)
+            runner_masks: int array, bit 1 = 1st, bit 2 = 2nd, bit 4 = 3rd
+            is_top_innings: bool array
+            pitcher_mods, defense_mods: float arrays (default 1.0)
+
+        Returns:
+            np.ndarray of Home Win Probabilities.
+        """
+        innings = np.asarray(innings, dtype=int)
+        outs = np.asarray(outs, dtype=int)
+        runner_masks = np.asarray(runner_masks, dtype=int)
+        score_diffs = np.asarray(score_diffs, dtype=int)
+        is_top_innings = np.asarray(is_top_innings, dtype=bool)
+        n_games = innings.shape[0]
+        
+        pitcher_mods = np.ones(n_games) if pitcher_mods is None else np.asarray(pitcher_mods, dtype=float)
+        defense_mods = np.ones(n_games) if defense_mods is None else np.asarray(defense_mods, dtype=float)
+        
+        # TTTO approximation (placeholder, matches get_instant_win_prob)
+        ttto = 1
+        
+        # 1. State Indices (STATES order: outs, r1, r2, r3)
+        r1 = runner_masks & 1
+        r2 = (runner_masks >> 1) & 1
+        r3 = (runner_masks >> 2) & 1
+        state_idxs = np.where(outs >= 3, self.END_STATE_IDX, outs * 8 + r1 * 4 + r2 * 2 + r3)
+        
+        win_probs = np.empty(n_games)
+        todo = np.ones(n_games, dtype=bool)
+        
+        # 2. Fast Path: Precomputed tensor
+        if self.win_prob_table is not None:
+            table_probs, valid = self.win_prob_table.lookup_batch(
+                innings, is_top_innings, state_idxs, score_diffs, pitcher_mods
+            )
+            valid &= (defense_mods <= 1.0)
+            win_probs[valid] = table_probs[valid]
+            todo = ~valid
+            
+        if not np.any(todo):
+            return win_probs
+            
+        # 3. One RE24 solve per distinct modifier combo (cache hits after the first poll)
+        mod_pairs = np.round(np.column_stack([pitcher_mods[todo], defense_mods[todo]]), self.CACHE_PRECISION)
+        unique_pairs, pair_idx = np.unique(mod_pairs, axis=0, return_inverse=True)
+        
+        re24_table = np.zeros((len(unique_pairs), 25)) # Column 24 = End of Inning (0 runs)
+        for i, (pitcher_mod, defense_mod) in enumerate(unique_pairs):
+            re24_table[i, :24] = self.get_re24_vector(pitcher_mod, ttto, defense_mod)
+            
+        current_re24 = re24_table[pair_idx.ravel(), state_idxs[todo]]
+        
+        # 4. Vectorized Sigmoid
+        win_probs[todo] = self._sigmoid_win_prob(
+            current_re24, innings[todo], score_diffs[todo], is_top_innings[todo]
+        )
+        return win_probs
+
+    def _sigmoid_win_prob(self, current_re24, inning, score_diff, is_top_inning):
+        """
+        Leverage-delta sigmoid. Works on scalars or broadcastable NumPy arrays
+        (used by the lookup table builder).
+        """
+        leverage = current_re24 - self.BASELINE_RE24
+        
+        # Away batting: leverage hurts Home. Home batting: leverage helps Home.
+        effective_diff = np.where(is_top_inning, score_diff - leverage, score_diff + leverage)
             
         # Innings remaining logic
-        if inning >= 9:
-            innings_remaining = 0.5 + (1.0 if not is_top_inning else 0.0)
-        else:
-            innings_remaining = (9 - inning) + (1.0 if not is_top_inning else 0.5)
-        innings_remaining = max(innings_remaining, 0.5)
+        innings_remaining = np.where(
+            inning >= 9,
+            0.5 + np.where(is_top_inning, 0.0, 1.0),
+            (9 - inning) + np.where(is_top_inning, 0.5, 1.0)
+        )
+        innings_remaining = np.maximum(innings_remaining, 0.5)
         
-        std_dev = VOLATILITY_SCALE * np.sqrt(innings_remaining)
-        z = (effective_diff / std_dev) + HOME_FIELD_Z
+        std_dev = self.VOLATILITY_SCALE * np.sqrt(innings_remaining)
+        z = (effective_diff / std_dev) + self.HOME_FIELD_Z
         win_prob = 1.0 / (1.0 + np.exp(-z))
         
-        return min(0.999, max(0.001, win_prob))
+        return np.clip(win_prob, 0.001, 0.999)
 
-    def _get_transition_matrix(self, pitcher_mod=1.0, ttto=0, defense_mod=1.0):
+    def get_re24_vector(self, pitcher_mod=1.0, ttto=0, defense_mod=1.0):
         """
-        Generates a 25x25 transition matrix adjusted for pitcher fatigue.
-        Optimized: Uses pre-computed masks for vector addition.
+        Returns the solved RE24 vector for a modifier combination.
+        Hot path: a dictionary hit once the quantized key has been seen.
+        """
+        key = self._cache_key(pitcher_mod, ttto, defense_mod)
+        
+        with self._cache_lock:
+            re24_vector = self.transition_cache.get(key)
+            if re24_vector is not None:
+                self.transition_cache.move_to_end(key)
+                self.cache_hits += 1
+                return re24_vector
+            self.cache_misses += 1
+        
+        # Solve outside the lock (pure function of the key) with the quantized values,
+        # so every caller mapped to this key gets the same vector
+        matrix, r_imm = self._build_transition(*key)
+        re24_vector = self._calculate_re24_vector(matrix, r_imm)
+        re24_vector.flags.writeable = False # Shared between callers
+        
+        with self._cache_lock:
+            # Another thread may have solved the same key meanwhile; keep the first
+            re24_vector = self.transition_cache.setdefault(key, re24_vector)
+            self.transition_cache.move_to_end(key)
+            if len(self.transition_cache) > self.cache_size:
+                self.transition_cache.popitem(last=False) # Evict least recently used
+            
+        return re24_vector
+
+    def get_cache_stats(self):
+        """Returns hit/miss counters for the RE24 cache."""
+        with self._cache_lock:
+            total = self.cache_hits + self.cache_misses
+            return {
+                "hits": self.cache_hits,
+                "misses": self.cache_misses,
+                "size": len(self.transition_cache),
+                "max_size": self.cache_size,
+                "hit_rate": self.cache_hits / total if total else 0.0
+            }
+
+    def clear_cache(self):
+        """Drops all cached RE24 vectors and resets the counters."""
+        with self._cache_lock:
+            self.transition_cache.clear()
+            self.cache_hits = 0
+            self.cache_misses = 0
+
+    def _cache_key(self, pitcher_mod, ttto, defense_mod):
+        return (
+            round(float(pitcher_mod), self.CACHE_PRECISION),
+            int(ttto),
+            round(float(defense_mod), self.CACHE_PRECISION)
+        )
+
+    def _get_event_probabilities(self, pitcher_mod=1.0, ttto=0, defense_mod=1.0):
+        """
+        Returns normalized PA event probabilities in EVENTS order
+        (out, bb, 1b, 2b, 3b, hr). Accepts scalars or arrays of modifiers;
+        the event axis is last.
         """
+        pitcher_mod = np.asarray(pitcher_mod, dtype=float)
+        ttto = np.asarray(ttto, dtype=float)
+        defense_mod = np.asarray(defense_mod, dtype=float)
+        
         # Base Probabilities
-        p_out = 0.68
-        p_1b = 0.15
-        p_2b = 0.05
-        p_3b = 0.005
-        p_hr = 0.03
-        p_bb = 0.085
+        p_out = np.full(np.broadcast(pitcher_mod, ttto, defense_mod).shape, self.base_rates['out'])
+        p_1b = self.base_rates['1b']
+        p_2b = self.base_rates['2b']
+        p_3b = self.base_rates['3b']
+        p_hr = self.base_rates['hr']
+        p_bb = self.base_rates['bb']
         
         # Adjustments
-        if ttto > 1:
-            p_bb *= (1.0 + (0.10 * (ttto - 1)))
+        p_bb = p_bb * np.where(ttto > 1, 1.0 + (0.10 * (ttto - 1)), 1.0)
 
-        p_1b *= pitcher_mod
-        p_bb *= pitcher_mod
+        p_1b = p_1b * pitcher_mod
+        p_bb = p_bb * pitcher_mod
         
-        power_scaler = pitcher_mod
-        if pitcher_mod > 1.0:
-            power_scaler *= 1.1
+        power_scaler = np.where(pitcher_mod > 1.0, pitcher_mod * 1.1, pitcher_mod)
             
-        p_2b *= power_scaler
-        p_3b *= power_scaler
-        p_hr *= power_scaler
+        p_2b = p_2b * power_scaler
+        p_3b = p_3b * power_scaler
+        p_hr = p_hr * power_scaler
         
         # Defense Adjustment (Phase 3 Hardening)
-        if defense_mod > 1.0:
-            p_1b *= defense_mod
-            p_bb *= defense_mod # Errors extend innings like walks
-        
-        # Vectorized Combination
-        matrix = (
-            self.mask_out * p_out +
-            self.mask_bb * p_bb +
-            self.mask_1b * p_1b +
-            self.mask_2b * p_2b +
-            self.mask_3b * p_3b +
-            self.mask_hr * p_hr
-        )
-        
-        # Row Normalization (Fast)
-        row_sums = matrix.sum(axis=1)[:, np.newaxis]
-        matrix /= row_sums
+        defense_scaler = np.where(defense_mod > 1.0, defense_mod, 1.0)
+        p_1b = p_1b * defense_scaler
+        p_bb = p_bb * defense_scaler # Errors extend innings like walks
         
-        # R_imm Construction (Immediate Runs Vector)
-        # We only care about the first 24 states for R_imm
-        inv_row_sums_24 = 1.0 / row_sums[:24].flatten()
+        probs = np.stack(np.broadcast_arrays(p_out, p_bb, p_1b, p_2b, p_3b, p_hr), axis=-1)
         
-        r_imm = (
-            (self.runs_hr * p_hr) +
-            (self.runs_3b * p_3b) +
-            (self.runs_2b * p_2b) +
-            (self.runs_1b * p_1b) +
-            (self.runs_bb * p_bb)
-        )
+        # Normalize (every transient row receives exactly one event of each type)
+        return probs / probs.sum(axis=-1, keepdims=True)
+
+    def _get_transition_matrix(self, pitcher_mod=1.0, ttto=0, defense_mod=1.0):
+        """
+        Generates a 25x25 transition matrix adjusted for pitcher fatigue.
+        Optimized: Uses pre-computed masks for vector addition.
+        """
+        matrix, _ = self._build_transition(pitcher_mod, ttto, defense_mod)
+        return matrix
+
+    def _build_transition(self, pitcher_mod=1.0, ttto=0, defense_mod=1.0):
+        """
+        Returns (matrix, r_imm) for one modifier combination.
+        Stateless: nothing is stashed on the instance, so one service can
+        be shared across threads.
+        """
+        probs = self._get_event_probabilities(pitcher_mod, ttto, defense_mod)
         
-        # Normalize R_imm by the same row_sums
-        r_imm *= inv_row_sums_24
+        # Vectorized Combination
+        matrix = np.tensordot(probs, self.event_masks, axes=1)
+        matrix[self.END_STATE_IDX, self.END_STATE_IDX] = 1.0
         
-        # Store for solver
-        self._last_r_imm = r_imm
+        # R_imm Construction (Immediate Runs Vector, first 24 states)
+        r_imm = probs @ self.event_runs
         
-        return matrix
+        return matrix, r_imm
 
-    def _calculate_re24_vector(self, matrix):
+    def _calculate_re24_vector(self, matrix, r_imm):
         """
-        Solves (I - Q)^-1 * R_imm to get Expected Runs for all states.
+        Solves (I - Q) * E = R_imm to get Expected Runs for all states.
         """
         # Extract Q (Transient 24x24)
         Q = matrix[:24, :24]
-        I = np.eye(24)
         
+        # Total Expected Runs = (I - Q)^-1 * R_imm, without forming the inverse
+        return self._solve_re24_systems((np.eye(24) - Q)[np.newaxis], r_imm[np.newaxis])[0]
+
+    def solve_re24_batch(self, pitcher_mods, ttto=0, defense_mods=None):
+        """
+        Solves RE24 for many modifier variants at once.
+        Builds a stacked (k, 24, 24) system and runs one batched LU solve.
+
+        Returns:
+            np.ndarray of shape (k, 24).
+        """
+        pitcher_mods = np.atleast_1d(np.asarray(pitcher_mods, dtype=float))
+        if defense_mods is None:
+            defense_mods = np.ones_like(pitcher_mods)
+        
+        probs = self._get_event_probabilities(pitcher_mods, ttto, defense_mods) # (k, 6)
+        
+        Q = np.einsum('ke,eij->kij', probs, self.event_masks[:, :24, :24])
+        R_imm = probs @ self.event_runs # (k, 24)
+        
+        return self._solve_re24_systems(np.eye(24) - Q, R_imm)
+
+    def _solve_re24_systems(self, A, R_imm):
+        """
+        Solves the stacked systems A[k] E[k] = R_imm[k]; (k, 24, 24) and (k, 24).
+        A singular variant (the inning never ends) gets zeros, the same in the
+        single-variant and batched paths.
+        """
         try:
-            N = np.linalg.inv(I - Q)
+            return np.linalg.solve(A, R_imm[..., np.newaxis])[..., 0]
         except np.linalg.LinAlgError:
-            return np.zeros(24)
-            
-        if hasattr(self, '_last_r_imm'):
-            R_imm = self._last_r_imm
-        else:
-            R_imm = np.zeros(24)
-        
-        # Total Expected Runs = N * R_imm
-        E = N @ R_imm
-        return E
+            # Fall back per slice so one singular variant does not sink the batch
+            re24 = np.zeros(R_imm.shape)
+            for k in range(len(A)):
+                try:
+                    re24[k] = np.linalg.solve(A[k], R_imm[k])
+                except np.linalg.LinAlgError:
+                    pass
+            return re24
+
+    def _factorize(self, A):
+        """
+        LU-factorizes A once so it can be reused across right-hand sides.
+        Returns None if A is singular.
+        """
+        lu, piv = lu_factor(A, check_finite=False)
+        if not np.all(np.abs(np.diag(lu)) > 0):
+            return None
+        return lu, piv
+
+    def _solve_factorized(self, lu_piv, rhs):
+        """Solves A x = rhs given _factorize(A). rhs may be (n,) or (n, k)."""
+        return lu_solve(lu_piv, rhs, check_finite=False)
 
     def _get_state_index(self, outs, r1, r2, r3):
         if outs >= 3: return self.END_STATE_IDX
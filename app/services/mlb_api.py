@@ -105,6 +105,7 @@ class MlbApi:
             for game in schedule:
                 if game.get('game_type') == 'R': # Regular Season
                     formatted_schedule.append({
+                        'game_id': game['game_id'],
                         'home_id': game['home_id'],
                         'away_id': game['away_id']
                     })
@@ -118,6 +119,20 @@ class MlbApi:
             print(f"Error fetching schedule for simulation: {e}")
             return []
 
+    def get_final_results(self, date):
+        """
+        Returns {game_id: home_won} for the regular-season games that finished on a date.
+        """
+        results = {}
+        for game in self.get_schedule(date):
+            if game.get('game_type') != 'R' or game.get('status') != 'Final':
+                continue
+            home_score = int(game.get('home_score') or 0)
+            away_score = int(game.get('away_score') or 0)
+            if home_score != away_score:
+                results[game['game_id']] = home_score > away_score
+        return results
+
     def get_live_game_data(self, game_pk):
         """
         Fetches real-time granular data for a specific game (play-by-play, linescore, boxscore).
@@ -131,4 +146,26 @@ class MlbApi:
             return statsapi.get('game', {'gamePk': game_pk})
         except Exception as e:
             print(f"Error fetching live data for game {game_pk}: {e}")
-            return None
\ No newline at end of file
+            return None
+
+    def get_cached_game_feed(self, game_pk):
+        """
+        Fetches a full game feed, caching it once the game is Final.
+        Completed feeds never change, so the cache entry does not expire in practice.
+        """
+        cache_key = f"game_feed_{game_pk}"
+        
+        # 1. Check Cache
+        cached_feed = self.db.get_cached_data(cache_key, max_age_seconds=365 * 24 * 3600)
+        if cached_feed:
+            return cached_feed
+            
+        # 2. Fetch from API
+        feed = self.get_live_game_data(game_pk)
+        
+        # 3. Save to Cache (Final games only)
+        status = (feed or {}).get('gameData', {}).get('status', {}).get('abstractGameState')
+        if status == 'Final':
+            self.db.set_cached_data(cache_key, feed)
+            
+        return feed
\ No newline at end of file
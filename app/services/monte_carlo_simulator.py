@@ -1,6 +1,94 @@
+import os
+import math
+import time
 import numpy as np
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from statistics import NormalDist
 from app.services.state_engine import StateEngine
 
+class GameSimulationResult:
+    """
+    Rest-of-game outcome of one simulated scenario.
+    score_hist[h, a] counts sims ending home h - away a (last row/column
+    holds MAX_RUNS or more). Ties left in the histogram are games stopped
+    in extras; they count toward home wins with tie_value.
+    """
+
+    MAX_RUNS = 30
+
+    def __init__(self, score_hist, tie_value=0.5):
+        self.score_hist = score_hist
+        self.tie_value = tie_value
+        self.iterations = int(score_hist.sum())
+
+        runs = np.arange(self.MAX_RUNS + 1)
+        self._margins = runs[:, None] - runs[None, :]
+        self._totals = runs[:, None] + runs[None, :]
+
+    @classmethod
+    def from_scores(cls, final_home, final_away, tie_value=0.5):
+        """Bins per-sim final scores into the compact joint histogram."""
+        size = cls.MAX_RUNS + 1
+        flat = np.minimum(final_home, cls.MAX_RUNS).astype(np.intp) * size + np.minimum(final_away, cls.MAX_RUNS)
+        score_hist = np.bincount(flat.ravel(), minlength=size * size).reshape(size, size).astype(np.uint32)
+        return cls(score_hist, tie_value)
+
+    @property
+    def joint_distribution(self):
+        """P(final home = h, final away = a)."""
+        return self.score_hist / self.iterations
+
+    @property
+    def home_win_prob(self):
+        probs = self.joint_distribution
+        return float(probs[self._margins > 0].sum() + self.tie_value * probs[self._margins == 0].sum())
+
+    def home_runs_distribution(self):
+        return self.joint_distribution.sum(axis=1)
+
+    def away_runs_distribution(self):
+        return self.joint_distribution.sum(axis=0)
+
+    def expected_total(self):
+        return float((self.joint_distribution * self._totals).sum())
+
+    def total_probs(self, line):
+        """Over/under/push probabilities for a game total line (e.g. 8.5)."""
+        probs = self.joint_distribution
+        return {
+            'over': float(probs[self._totals > line].sum()),
+            'under': float(probs[self._totals < line].sum()),
+            'push': float(probs[self._totals == line].sum())
+        }
+
+    def run_line_probs(self, home_spread=-1.5):
+        """
+        Run line from the home side: home covers when margin + home_spread > 0.
+        E.g. home -1.5 needs a 2+ run win; home +1.5 covers any loss by 1.
+        """
+        probs = self.joint_distribution
+        adjusted = self._margins + home_spread
+        return {
+            'home': float(probs[adjusted > 0].sum()),
+            'away': float(probs[adjusted < 0].sum()),
+            'push': float(probs[adjusted == 0].sum())
+        }
+
+    def to_dict(self, total_line=8.5, home_spread=-1.5):
+        return {
+            'home_win_prob': self.home_win_prob,
+            'expected_total': self.expected_total(),
+            'total': total_line,
+            'total_probs': self.total_probs(total_line),
+            'home_spread': home_spread,
+            'run_line_probs': self.run_line_probs(home_spread),
+            'iterations': self.iterations
+        }
+
+
 class MonteCarloSimulator:
     """
     High-performance Vectorized Monte Carlo Simulator for MLB Live Games.
@@ -8,53 +96,255 @@ class MonteCarloSimulator:
     Level 300 Upgrade: Roster-Aware Fatigue Modeling.
     """
 
-    def __init__(self, state_engine=None):
+    # League-average PA event rates (same as MarkovChainService.BASE_EVENT_RATES)
+    BASE_EVENT_RATES = {'out': 0.68, 'bb': 0.085, '1b': 0.15, '2b': 0.05, '3b': 0.005, 'hr': 0.03}
+
+    EVENTS = ('out', 'bb', '1b', '2b', '3b', 'hr')
+
+    LATE_INNING = 7             # Scalar bullpen modifiers apply from here
+
+    # Modifier bank: one transition table per grid point (0.75 .. 1.50).
+    # Each half-inning samples from the table nearest its pitching modifier.
+    MODIFIER_GRID_MIN = 0.75
+    MODIFIER_GRID_STEP = 0.05
+    MODIFIER_GRID_POINTS = 16
+    SCHEDULE_INNINGS = 12       # Per-inning schedules: the last entry covers later extras
+
+    # Extra innings: each half-inning from the 10th starts with a runner on second
+    REGULATION_INNINGS = 9
+    GHOST_RUNNER_STATE = 2      # 0 outs, runner on 2nd
+    MAX_HALF_INNING_RUNS = 20   # Run support for the analytic extra-inning value
+
+    # Reusable per-thread buffers: compact dtypes keep the hot loop in cache
+    SCRATCH_DTYPES = {
+        'states': np.int8,
+        'innings': np.int16,
+        'is_top': np.bool_,
+        'runs_home': np.int16,
+        'runs_away': np.int16,
+        'sim_ids': np.int32,
+        'half_pa': np.int16,
+        'final_home': np.int16,
+        'final_away': np.int16,
+    }
+    # Largest double below 1.0: mirrors [0, 1) onto itself for antithetic draws
+    ANTITHETIC_ONE = np.nextafter(1.0, 0.0)
+
+    # Adaptive mode defaults
+    ADAPTIVE_CHUNK_SIZE = 2000
+    ADAPTIVE_MAX_ITERATIONS = 200000
+
+    # Precision mode: iterations per shard. Fixed so a seed reproduces for any worker count.
+    PARALLEL_CHUNK_SIZE = 100000
+
+    # Buffers that follow the active set when finished sims are swapped out
+    ACTIVE_BUFFERS = ('states', 'innings', 'is_top', 'runs_home', 'runs_away', 'sim_ids', 'half_pa')
+
+    def __init__(self, state_engine=None, base_rates=None, rng=None, transition_store=None):
+        """
+        Args:
+            state_engine: Optional shared StateEngine.
+            base_rates: Optional {event: rate} overriding BASE_EVENT_RATES,
+                        e.g. TransitionStore.get_event_rates("2025/all").
+                        Rates are normalized to sum to 1 (so 'out' counts).
+            rng: numpy Generator or seed. Seeded simulators are deterministic.
+            transition_store: Optional TransitionStore; its latest league rates
+                              are used when base_rates is not given.
+        """
         self.state_engine = state_engine if state_engine else StateEngine()
+        self.rng = np.random.default_rng(rng)
+        if base_rates is None and transition_store is not None:
+            base_rates = transition_store.get_league_event_rates()
+        rates = dict(self.BASE_EVENT_RATES, **(base_rates or {}))
+        total = sum(rates[e] for e in self.EVENTS)
+        if total <= 0 or rates['out'] < 0:
+            raise ValueError(f"Invalid base rates: {rates}")
+        self.base_rates = {e: rates[e] / total for e in self.EVENTS}
         
-        # Dimensions: 25 States (0-23 + End)
-        self.transition_matrix_normal = np.zeros((25, 25))
-        self.transition_matrix_fatigued = np.zeros((25, 25))
+        # Dimensions: Bank x 25 States (0-23 + End)
+        self.modifier_grid = np.round(
+            self.MODIFIER_GRID_MIN + self.MODIFIER_GRID_STEP * np.arange(self.MODIFIER_GRID_POINTS), 2
+        )
+        self.baseline_table = self.get_table_index(1.0)
+        self.transition_matrices = np.zeros((self.MODIFIER_GRID_POINTS, 25, 25))
         self.run_matrix = np.zeros((25, 25))
         
-        # Build both Normal and Fatigued environment matrices
-        self._build_matrices(modifier=1.0, target_matrix=self.transition_matrix_normal)
-        self._build_matrices(modifier=1.25, target_matrix=self.transition_matrix_fatigued) # 25% degradation
+        self.event_next_states, self.event_runs = self._build_event_outcomes()
+        
+        # Build the bank once (modifier > 1.0 means pitcher fatigue)
+        self.table_out_probs = np.array([
+            self._build_matrices(modifier=mod, target_matrix=matrix)
+            for mod, matrix in zip(self.modifier_grid, self.transition_matrices)
+        ])
+        self.transition_matrix_normal = self.transition_matrices[self.baseline_table]
+        self.transition_matrix_fatigued = self.transition_matrices[self.get_table_index(1.25)] # 25% degradation
+        
+        # Event-level sampling (paired mode): modifiers only move mass between
+        # Out and offense, the offensive mix is the same for every table
+        offense = np.array([self.base_rates[e] for e in self.EVENTS[1:]])
+        self.offense_mix_bins = np.cumsum(offense / offense.sum())[:-1]
         
-        # Pre-compute CDFs for fast sampling
-        self.cdf_normal = np.cumsum(self.transition_matrix_normal, axis=1)
-        self.cdf_fatigued = np.cumsum(self.transition_matrix_fatigued, axis=1)
+        # Alias tables for O(1) per-sim sampling (row = table * 25 + state)
+        self.alias_prob, self.alias_idx = self._build_alias_tables(
+            self.transition_matrices.reshape(-1, 25)
+        )
+        self.alias_idx = self.alias_idx.astype(np.int8)
+        self.run_matrix_int8 = self.run_matrix.astype(np.int8)
+        
+        self._scratch = threading.local()
+        self._extra_value_cache = {}
+
+    def get_table_index(self, modifier):
+        """Nearest bank slot for a pitching modifier (clamped to the grid)."""
+        pos = np.rint((np.asarray(modifier, dtype=float) - self.MODIFIER_GRID_MIN) / self.MODIFIER_GRID_STEP)
+        return np.clip(pos, 0, self.MODIFIER_GRID_POINTS - 1).astype(np.int16)
+
+    def _table_schedule(self, bullpen_mod):
+        """
+        Bank slot per inning (index = inning, 0..SCHEDULE_INNINGS) for one pitching side.
+        A scalar applies from LATE_INNING on; a sequence gives per-inning
+        modifiers starting at inning 1 (e.g. starter then tiring reliever),
+        with its last entry carried forward.
+        """
+        schedule = np.full(self.SCHEDULE_INNINGS + 1, self.baseline_table, dtype=np.int16)
+        if np.ndim(bullpen_mod) == 0:
+            schedule[self.LATE_INNING:] = self.get_table_index(bullpen_mod)
+            return schedule
+        
+        mods = np.asarray(bullpen_mod, dtype=float)[:self.SCHEDULE_INNINGS]
+        schedule[1:len(mods) + 1] = self.get_table_index(mods)
+        schedule[len(mods) + 1:] = schedule[len(mods)]
+        return schedule
+
+    def _build_alias_tables(self, matrix):
+        """
+        Builds Vose alias tables for every row of a transition matrix.
+        Returns (prob, alias), both shaped like matrix.
+        """
+        n_rows, n_cols = matrix.shape
+        prob = np.ones((n_rows, n_cols))
+        alias = np.tile(np.arange(n_cols), (n_rows, 1))
+        
+        for row in range(n_rows):
+            scaled = matrix[row] * n_cols / matrix[row].sum()
+            small = [j for j in range(n_cols) if scaled[j] < 1.0]
+            large = [j for j in range(n_cols) if scaled[j] >= 1.0]
+            
+            while small and large:
+                s = small.pop()
+                l = large.pop()
+                prob[row, s] = scaled[s]
+                alias[row, s] = l
+                scaled[l] -= (1.0 - scaled[s])
+                if scaled[l] < 1.0:
+                    small.append(l)
+                else:
+                    large.append(l)
+            # Leftovers are 1.0 up to rounding
+            for j in small + large:
+                prob[row, j] = 1.0
+                
+        return prob, alias
+
+    def _sample_next_states(self, table_rows, rand_vals):
+        """
+        Alias draw: one uniform picks the column (integer part) and
+        resolves the coin flip (fractional part). O(N), no (N, 25) temporaries.
+        """
+        scaled = rand_vals * self.alias_prob.shape[1]
+        cols = scaled.astype(np.int8)
+        scaled -= cols
+        
+        next_states = self.alias_idx[table_rows, cols]
+        keep_col = scaled < self.alias_prob[table_rows, cols]
+        next_states[keep_col] = cols[keep_col]
+        return next_states
+
+    def _sample_paired_next_states(self, states, table_rows, draw_idx, innings, is_top, half_pa,
+                                   draw_key, antithetic_iterations):
+        """
+        Event-level draw for common random numbers.
+        Uniforms are keyed by (draw_idx, half-inning, PA within the half-inning),
+        so paired sims re-synchronize at every half-inning even after their
+        paths diverge. One uniform decides Out vs offense against the row's
+        table, a second picks the offensive event from the shared mix: the
+        arms see different events only with probability |out_prob_a - out_prob_b|.
+        antithetic_iterations > 0 mirrors the second half of draw_idx (u -> 1 - u).
+        """
+        mirrored = None
+        if antithetic_iterations:
+            half = antithetic_iterations // 2
+            mirrored = draw_idx >= half
+            draw_idx = draw_idx - mirrored * half
+        
+        counter = (
+            draw_idx.astype(np.uint64) * np.uint64(0x100000000)
+            + (innings.astype(np.uint64) * np.uint64(2) + ~is_top) * np.uint64(0x10000)
+            + half_pa.astype(np.uint64)
+        )
+        u_out = _counter_uniform(counter, draw_key)
+        u_mix = _counter_uniform(counter, draw_key + np.uint64(1))
+        if mirrored is not None:
+            u_out[mirrored] = self.ANTITHETIC_ONE - u_out[mirrored]
+            u_mix[mirrored] = self.ANTITHETIC_ONE - u_mix[mirrored]
+        
+        events = np.searchsorted(self.offense_mix_bins, u_mix, side='right') + 1
+        events[u_out < self.table_out_probs[table_rows // 25]] = 0
+        return self.event_next_states[states, events]
 
     def _build_matrices(self, modifier, target_matrix):
         """
         Builds a transition matrix with a specific offensive modifier.
         modifier > 1.0 means MORE offense (Pitcher Fatigue).
+        Returns the per-PA out probability of the resulting matrix.
         """
         # Base Probabilities (League Average)
         # We scale offensive events by the modifier, and reduce Out prob to normalize.
-        p_1b = 0.15 * modifier
-        p_2b = 0.05 * modifier
-        p_3b = 0.005 * modifier
-        p_hr = 0.03 * modifier
-        p_bb = 0.085 * modifier
+        p_1b = self.base_rates['1b'] * modifier
+        p_2b = self.base_rates['2b'] * modifier
+        p_3b = self.base_rates['3b'] * modifier
+        p_hr = self.base_rates['hr'] * modifier
+        p_bb = self.base_rates['bb'] * modifier
         
         total_offense = p_1b + p_2b + p_3b + p_hr + p_bb
         if total_offense > 0.99: # Safety cap
             total_offense = 0.99
             
         p_out = 1.0 - total_offense
+        event_probs = (p_out, p_bb, p_1b, p_2b, p_3b, p_hr) # EVENTS order
+        
+        for idx in range(24):
+            for event, p_event in enumerate(event_probs):
+                next_state = self.event_next_states[idx, event]
+                target_matrix[idx, next_state] += p_event
+                # Run matrix is shared/static (runs don't change, just likelihood)
+                if modifier == 1.0: self.run_matrix[idx, next_state] = self.event_runs[idx, event]
+            
+            # Normalize
+            row_sum = np.sum(target_matrix[idx])
+            if row_sum > 0:
+                target_matrix[idx] /= row_sum
+                
+        # End State Identity
+        target_matrix[self.state_engine.END_STATE_IDX, self.state_engine.END_STATE_IDX] = 1.0
+        
+        return p_out / sum(event_probs)
+
+    def _build_event_outcomes(self):
+        """
+        Deterministic PA outcomes per base/out state, in EVENTS order.
+        Returns (next_states, runs), both (25, 6); End maps to itself.
+        """
+        END = self.state_engine.END_STATE_IDX
+        next_states = np.full((25, len(self.EVENTS)), END, dtype=np.int8)
+        runs = np.zeros((25, len(self.EVENTS)), dtype=np.int8)
         
         for idx in range(24):
             outs, r1, r2, r3 = self.state_engine.IDX_TO_STATE[idx]
             
             # 1. OUTS
             if outs < 2:
-                next_state_out = self.state_engine.get_current_state_index(outs + 1, r1, r2, r3)
-                target_matrix[idx, next_state_out] += p_out
-                # Run matrix is shared/static (runs don't change, just likelihood)
-                if modifier == 1.0: self.run_matrix[idx, next_state_out] = 0 
-            else:
-                target_matrix[idx, self.state_engine.END_STATE_IDX] += p_out
-                if modifier == 1.0: self.run_matrix[idx, self.state_engine.END_STATE_IDX] = 0
+                next_states[idx, 0] = self.state_engine.get_current_state_index(outs + 1, r1, r2, r3)
 
             # 2. WALKS
             new_r1, new_r2, new_r3 = 1, r1, r2
@@ -66,161 +356,519 @@ class MonteCarloSimulator:
                 else: new_r2 = 1
             else: new_r2, new_r3 = r2, r3
             
-            next_state_bb = self.state_engine.get_current_state_index(outs, new_r1, new_r2, new_r3)
-            target_matrix[idx, next_state_bb] += p_bb
-            if modifier == 1.0: self.run_matrix[idx, next_state_bb] = runs_bb
+            next_states[idx, 1] = self.state_engine.get_current_state_index(outs, new_r1, new_r2, new_r3)
+            runs[idx, 1] = runs_bb
 
             # 3. SINGLES
-            runs_1b = r3 + r2
-            next_state_1b = self.state_engine.get_current_state_index(outs, 1, 1 if r1 else 0, 0)
-            target_matrix[idx, next_state_1b] += p_1b
-            if modifier == 1.0: self.run_matrix[idx, next_state_1b] = runs_1b
+            next_states[idx, 2] = self.state_engine.get_current_state_index(outs, 1, 1 if r1 else 0, 0)
+            runs[idx, 2] = r3 + r2
 
             # 4. DOUBLES
-            runs_2b = r3 + r2
-            next_state_2b = self.state_engine.get_current_state_index(outs, 0, 1, 1 if r1 else 0)
-            target_matrix[idx, next_state_2b] += p_2b
-            if modifier == 1.0: self.run_matrix[idx, next_state_2b] = runs_2b
+            next_states[idx, 3] = self.state_engine.get_current_state_index(outs, 0, 1, 1 if r1 else 0)
+            runs[idx, 3] = r3 + r2
 
             # 5. TRIPLES
-            runs_3b = r1 + r2 + r3
-            next_state_3b = self.state_engine.get_current_state_index(outs, 0, 0, 1)
-            target_matrix[idx, next_state_3b] += p_3b
-            if modifier == 1.0: self.run_matrix[idx, next_state_3b] = runs_3b
+            next_states[idx, 4] = self.state_engine.get_current_state_index(outs, 0, 0, 1)
+            runs[idx, 4] = r1 + r2 + r3
 
             # 6. HOMERS
-            runs_hr = r1 + r2 + r3 + 1
-            next_state_hr = self.state_engine.get_current_state_index(outs, 0, 0, 0)
-            target_matrix[idx, next_state_hr] += p_hr
-            if modifier == 1.0: self.run_matrix[idx, next_state_hr] = runs_hr
+            next_states[idx, 5] = self.state_engine.get_current_state_index(outs, 0, 0, 0)
+            runs[idx, 5] = r1 + r2 + r3 + 1
             
-            # Normalize
-            row_sum = np.sum(target_matrix[idx])
-            if row_sum > 0:
-                target_matrix[idx] /= row_sum
-                
-        # End State Identity
-        target_matrix[self.state_engine.END_STATE_IDX, self.state_engine.END_STATE_IDX] = 1.0
+        return next_states, runs
 
     def simulate_game_vectorized(self, initial_state_idx, home_score, away_score, inning, is_top, 
-                                 home_bullpen_mod=1.0, away_bullpen_mod=1.0, iterations=10000):
+                                 home_bullpen_mod=1.0, away_bullpen_mod=1.0, iterations=10000,
+                                 max_extra_innings=None):
         """
         Simulates the remainder of the game N times using vectorized operations.
         Accepts bullpen modifiers to degrade pitching performance in late innings (7+).
+        
+        Extra innings follow the runner-on-second rule. Games still tied after
+        max_extra_innings extra innings (or when the step limit is hit) are
+        credited with the analytic tied-extras value instead of being played out.
+        """
+        probs = self.simulate_games_batch(
+            [initial_state_idx], [home_score], [away_score], [inning], [is_top],
+            home_bullpen_mods=[home_bullpen_mod], away_bullpen_mods=[away_bullpen_mod],
+            iterations=iterations, max_extra_innings=max_extra_innings
+        )
+        return float(probs[0])
+
+    def simulate_game_distribution(self, initial_state_idx, home_score, away_score, inning, is_top,
+                                   home_bullpen_mod=1.0, away_bullpen_mod=1.0, iterations=10000,
+                                   max_extra_innings=None):
+        """
+        Same simulation as simulate_game_vectorized, but keeps the final scores.
+        Returns a GameSimulationResult (joint final-score histogram) so moneyline,
+        totals and run line are priced from one pass. Leave max_extra_innings
+        unset for exact totals: capped games keep their tied score.
+        """
+        final_home, final_away, tie_values = self._simulate_scores(
+            [initial_state_idx], [home_score], [away_score], [inning], [is_top],
+            [home_bullpen_mod], [away_bullpen_mod], iterations, None, max_extra_innings
+        )
+        return GameSimulationResult.from_scores(final_home[0], final_away[0], tie_values[0])
+
+    def simulate_games_batch(self, initial_state_idxs, home_scores, away_scores, innings, is_tops,
+                             home_bullpen_mods=None, away_bullpen_mods=None, iterations=10000, rng=None,
+                             max_extra_innings=None):
+        """
+        Simulates K scenarios (e.g. every live game, or every candidate next
+        base/out state) x N iterations in one array program.
+        Returns a K-length Home Win Probability vector.
+        """
+        home_wins = self._count_home_wins(
+            initial_state_idxs, home_scores, away_scores, innings, is_tops,
+            home_bullpen_mods, away_bullpen_mods, iterations, rng, max_extra_innings
+        )
+        return home_wins / iterations
+
+    def simulate_game_adaptive(self, initial_state_idx, home_score, away_score, inning, is_top,
+                               home_bullpen_mod=1.0, away_bullpen_mod=1.0, tolerance=0.01,
+                               time_budget=None, confidence=0.95, chunk_size=ADAPTIVE_CHUNK_SIZE,
+                               max_iterations=ADAPTIVE_MAX_ITERATIONS, max_extra_innings=None):
         """
-        n_sims = iterations
+        Runs in chunks until the Wilson confidence half-width on Home Win
+        Probability drops below tolerance, the time budget (seconds) is spent,
+        or max_iterations is reached. Lopsided states stop after a chunk or two,
+        coin flips keep going.
         
-        # 1. Initialize State Vectors
-        current_states = np.full(n_sims, initial_state_idx, dtype=int)
-        runs_home = np.zeros(n_sims, dtype=int)
-        runs_away = np.zeros(n_sims, dtype=int)
-        current_innings = np.full(n_sims, inning, dtype=int)
-        is_top_inning = np.full(n_sims, is_top, dtype=bool) 
-        game_over = np.zeros(n_sims, dtype=bool)
+        Returns:
+            dict: home_win_prob, ci (low, high), half_width, iterations, converged.
+        """
+        if chunk_size <= 0 or max_iterations <= 0:
+            raise ValueError(f"chunk_size and max_iterations must be positive: {chunk_size}, {max_iterations}")
 
-        # Simulation Loop
-        max_steps = 200 
+        z = NormalDist().inv_cdf(0.5 + confidence / 2)
+        deadline = time.perf_counter() + time_budget if time_budget is not None else None
+        scenario = (
+            [initial_state_idx], [home_score], [away_score], [inning], [is_top],
+            [home_bullpen_mod], [away_bullpen_mod]
+        )
         
-        for _ in range(max_steps):
-            if np.all(game_over): break
-                
-            active_mask = ~game_over
-            if not np.any(active_mask): break
-                
-            active_indices = np.where(active_mask)[0]
-            active_states = current_states[active_mask]
-            active_innings = current_innings[active_mask]
-            active_is_top = is_top_inning[active_mask]
+        home_wins = 0
+        iterations = 0
+        while True:
+            size = min(chunk_size, max_iterations - iterations)
+            home_wins += float(self._count_home_wins(*scenario, size, None, max_extra_innings)[0])
+            iterations += size
             
-            # --- Determine Fatigue Application ---
-            # Rule: If Inning >= 7, apply bullpen modifiers.
-            # If Top Inning (Home Pitching), use home_bullpen_mod
-            # If Bot Inning (Away Pitching), use away_bullpen_mod
+            prob, low, high = _wilson_interval(home_wins, iterations, z)
+            half_width = (high - low) / 2
+            converged = half_width <= tolerance
             
-            # We construct a boolean mask for "Is Fatigued?"
-            # We assume "Fatigued" means mod > 1.10. 
-            # If mod is low (1.0), we stick to Normal matrix.
+            if converged or iterations >= max_iterations:
+                break
+            if deadline is not None and time.perf_counter() >= deadline:
+                break
+        
+        return {
+            'home_win_prob': home_wins / iterations,
+            'ci': (low, high),
+            'half_width': half_width,
+            'iterations': iterations,
+            'converged': converged
+        }
+
+    def simulate_game_parallel(self, initial_state_idx, home_score, away_score, inning, is_top,
+                               home_bullpen_mod=1.0, away_bullpen_mod=1.0, iterations=1000000,
+                               seed=None, n_workers=None, chunk_size=PARALLEL_CHUNK_SIZE, max_extra_innings=None):
+        """
+        Precision mode for pregame pricing (e.g. 1M iterations).
+        Shards iterations across a process pool. Each shard draws from its own
+        Generator spawned from SeedSequence(seed) and writes its win count into
+        a shared-memory array, so results are reproducible for a given seed
+        regardless of n_workers.
+
+        For scripts and batch jobs only. Spawned workers re-import the caller's
+        __main__, and app/app.py builds its services (scheduler, live feed) at
+        import time, so the pool is only started from the main thread; called
+        from a server thread (request handler, scheduler job) the shards run
+        in-process instead.
+        """
+        n_workers = n_workers if n_workers else (os.cpu_count() or 1)
+        if threading.current_thread() is not threading.main_thread():
+            n_workers = 1
+        if seed is None:
+            seed = int(self.rng.integers(2**63)) # Deterministic under a seeded simulator
+        
+        # 1. Fixed shards + independent streams
+        n_shards = -(-iterations // chunk_size)
+        shard_sizes = [chunk_size] * (n_shards - 1) + [iterations - chunk_size * (n_shards - 1)]
+        shard_seeds = np.random.SeedSequence(seed).spawn(n_shards)
+        scenario = (
+            [initial_state_idx], [home_score], [away_score], [inning], [is_top],
+            [home_bullpen_mod], [away_bullpen_mod]
+        )
+        
+        if n_workers <= 1 or n_shards == 1:
+            home_wins = [
+                self._count_home_wins(*scenario, size, np.random.default_rng(ss), max_extra_innings)[0]
+                for size, ss in zip(shard_sizes, shard_seeds)
+            ]
+            return sum(home_wins) / iterations
+        
+        # 2. Fan out; workers write per-shard win counts into shared memory
+        shm = shared_memory.SharedMemory(create=True, size=n_shards * np.dtype(np.float64).itemsize)
+        try:
+            # Spawn: never fork a live server's threads
+            ctx = multiprocessing.get_context("spawn")
+            with ProcessPoolExecutor(max_workers=min(n_workers, n_shards), mp_context=ctx,
+                                     initializer=_init_parallel_worker, initargs=(self.base_rates,)) as pool:
+                futures = [
+                    pool.submit(_simulate_shard, shm.name, n_shards, shard_idx, ss, scenario, size, max_extra_innings)
+                    for shard_idx, (size, ss) in enumerate(zip(shard_sizes, shard_seeds))
+                ]
+                for future in futures:
+                    future.result() # Surface worker errors
             
-            is_late_game = (active_innings >= 7)
+            home_wins = float(np.ndarray((n_shards,), dtype=np.float64, buffer=shm.buf).sum())
+        finally:
+            shm.close()
+            shm.unlink()
             
-            # Home Pitching (Top) & Fatigued
-            home_pitching_mask = active_is_top & is_late_game & (home_bullpen_mod > 1.10)
+        return home_wins / iterations
+
+    def simulate_paired(self, initial_state_idx, home_score, away_score, inning, is_top,
+                        mods_a=(1.0, 1.0), mods_b=(1.0, 1.25), iterations=20000, antithetic=False,
+                        max_extra_innings=None):
+        """
+        A/B comparison of two (home_bullpen_mod, away_bullpen_mod) settings
+        using common random numbers: sim i in both arms consumes the same uniform
+        on every plate appearance, so shared noise cancels in the difference.
+        antithetic=True also pairs each draw u with 1 - u.
+        
+        Returns:
+            dict: prob_a, prob_b, diff (b - a), std_error (of diff), iterations.
+        """
+        if antithetic:
+            iterations += iterations % 2
+        
+        margins, tie_values = self._simulate_margins(
+            [initial_state_idx] * 2, [home_score] * 2, [away_score] * 2, [inning] * 2, [is_top] * 2,
+            [mods_a[0], mods_b[0]], [mods_a[1], mods_b[1]], iterations, None, max_extra_innings,
+            common_draws=True, antithetic=antithetic
+        )
+        home_wins = _home_win_values(margins, tie_values)
+        
+        # Paired differences are i.i.d. (antithetic: one sample per (u, 1 - u) pair)
+        diffs = home_wins[1] - home_wins[0]
+        if antithetic:
+            half = iterations // 2
+            diffs = (diffs[:half] + diffs[half:]) / 2
+        
+        return {
+            'prob_a': float(home_wins[0].mean()),
+            'prob_b': float(home_wins[1].mean()),
+            'diff': float(diffs.mean()),
+            'std_error': float(diffs.std(ddof=1) / np.sqrt(len(diffs))),
+            'iterations': iterations
+        }
+
+    def _count_home_wins(self, initial_state_idxs, home_scores, away_scores, innings, is_tops,
+                         home_bullpen_mods, away_bullpen_mods, iterations, rng, max_extra_innings=None):
+        """
+        Runs the K x N batch and returns home win counts per scenario.
+        Unresolved ties count fractionally (analytic tied-extras value).
+        """
+        margins, tie_values = self._simulate_margins(
+            initial_state_idxs, home_scores, away_scores, innings, is_tops,
+            home_bullpen_mods, away_bullpen_mods, iterations, rng, max_extra_innings
+        )
+        return _home_win_values(margins, tie_values).sum(axis=1)
+
+    def _simulate_margins(self, initial_state_idxs, home_scores, away_scores, innings, is_tops,
+                          home_bullpen_mods, away_bullpen_mods, iterations, rng, max_extra_innings=None,
+                          common_draws=False, antithetic=False):
+        """
+        Runs the K x N batch.
+        Returns (margins, tie_values): final (home - away) margins, shape (K, N),
+        and each scenario's P(home wins) from a tied extra inning, shape (K,).
+        """
+        final_home, final_away, tie_values = self._simulate_scores(
+            initial_state_idxs, home_scores, away_scores, innings, is_tops,
+            home_bullpen_mods, away_bullpen_mods, iterations, rng, max_extra_innings,
+            common_draws=common_draws, antithetic=antithetic
+        )
+        return final_home - final_away, tie_values
+
+    def _simulate_scores(self, initial_state_idxs, home_scores, away_scores, innings, is_tops,
+                         home_bullpen_mods, away_bullpen_mods, iterations, rng, max_extra_innings=None,
+                         common_draws=False, antithetic=False):
+        """
+        Runs the K x N batch.
+        Returns (final_home, final_away, tie_values): final scores, shape (K, N),
+        and each scenario's P(home wins) from a tied extra inning, shape (K,).
+        """
+        initial_state_idxs = np.asarray(initial_state_idxs, dtype=np.int8)
+        n_scenarios = len(initial_state_idxs)
+        n_sims = n_scenarios * iterations
+        
+        score_diffs = np.asarray(home_scores, dtype=np.int16) - np.asarray(away_scores, dtype=np.int16)
+        if home_bullpen_mods is None: home_bullpen_mods = np.ones(n_scenarios)
+        if away_bullpen_mods is None: away_bullpen_mods = np.ones(n_scenarios)
+        
+        # 1. Initialize State Vectors (active set = first n rows of each buffer)
+        # Scenario k owns sim ids [k * N, (k + 1) * N)
+        buf = self._get_scratch(n_sims)
+        buf['states'][:n_sims] = np.repeat(initial_state_idxs, iterations)
+        buf['innings'][:n_sims] = np.repeat(np.asarray(innings, dtype=np.int16), iterations)
+        buf['is_top'][:n_sims] = np.repeat(np.asarray(is_tops, dtype=bool), iterations)
+        buf['runs_home'][:n_sims] = 0
+        buf['runs_away'][:n_sims] = 0
+        buf['sim_ids'][:n_sims] = np.arange(n_sims)
+        buf['half_pa'][:n_sims] = 0
+        
+        # Bank slot per (scenario, inning) for each pitching side
+        home_tables = np.stack([self._table_schedule(mod) for mod in home_bullpen_mods])
+        away_tables = np.stack([self._table_schedule(mod) for mod in away_bullpen_mods])
+        
+        self._run_active_set(
+            buf, n_sims, iterations, score_diffs, home_tables, away_tables,
+            rng=rng, max_extra_innings=max_extra_innings,
+            common_draws=common_draws, antithetic=antithetic
+        )
+        
+        # Extras are stationary from the last scheduled inning on
+        tie_values = np.array([
+            self.get_extra_inning_value(home_slot, away_slot)
+            for home_slot, away_slot in zip(home_tables[:, -1], away_tables[:, -1])
+        ])
+        
+        final_home = buf['final_home'][:n_sims].reshape(n_scenarios, iterations) + np.asarray(home_scores, dtype=np.int16)[:, None]
+        final_away = buf['final_away'][:n_sims].reshape(n_scenarios, iterations) + np.asarray(away_scores, dtype=np.int16)[:, None]
+        return final_home, final_away, tie_values
+
+    def _run_active_set(self, buf, n_sims, iterations, score_diffs, home_tables, away_tables, rng=None,
+                        max_extra_innings=None, common_draws=False, antithetic=False):
+        """
+        Core loop over a shrinking active set.
+        Finished sims record their runs into final_home/final_away and are
+        swapped out, so each step only touches games still in progress.
+        Per-scenario inputs are gathered through sim_id // iterations.
+        home_tables/away_tables: (K, SCHEDULE_INNINGS + 1) bank slots for the
+        half-innings each side pitches.
+        max_extra_innings: retire games still tied after this many extra innings
+        (their margin stays 0 and the caller credits the analytic value).
+        
+        common_draws: sim i of every scenario reads the same keyed uniforms
+        (see _sample_paired_next_states). antithetic mirrors the first half of
+        those draws into the second half.
+        """
+        END = self.state_engine.END_STATE_IDX
+        LAST = self.REGULATION_INNINGS
+        tie_cap_inning = LAST + max_extra_innings + 1 if max_extra_innings is not None else None
+        n = n_sims
+        single_scenario = len(score_diffs) == 1
+        all_baseline = np.all(home_tables == self.baseline_table) and np.all(away_tables == self.baseline_table)
+        rng = rng if rng is not None else self.rng
+        draw_key = np.uint64(rng.integers(2**63)) if common_draws else None
+        
+        # Simulation Loop
+        max_steps = 200 
+        
+        for _ in range(max_steps):
+            if n == 0: break
             
-            # Away Pitching (Bot) & Fatigued
-            away_pitching_mask = (~active_is_top) & is_late_game & (away_bullpen_mod > 1.10)
+            states = buf['states'][:n]
+            innings = buf['innings'][:n]
+            is_top = buf['is_top'][:n]
+            runs_home = buf['runs_home'][:n]
+            runs_away = buf['runs_away'][:n]
+            scenario = 0 if single_scenario else buf['sim_ids'][:n] // iterations
             
-            fatigue_mask = home_pitching_mask | away_pitching_mask
+            # --- Determine Fatigue Application ---
+            # Each half-inning samples from the bank slot of the side pitching it:
+            # Top Inning (Home Pitching) -> home_tables, Bot Inning (Away Pitching) -> away_tables
+            table_rows = states.astype(np.int16)
+            if all_baseline:
+                table_rows += self.baseline_table * 25
+            else:
+                schedule_inning = np.minimum(innings, self.SCHEDULE_INNINGS)
+                table_rows += 25 * np.where(
+                    is_top, home_tables[scenario, schedule_inning], away_tables[scenario, schedule_inning]
+                )
             
             # --- Vectorized Transition ---
-            rand_vals = np.random.rand(len(active_indices))
-            
-            # Conditional Matrix Lookup
-            # If fatigue_mask is True, look up from cdf_fatigued. Else cdf_normal.
-            
-            # We need to map the global 'state' indices to the correct CDF
-            # np.where allows us to select values, but we need to select ROWS from 2D matrices.
-            # efficient way:
-            # cdf_normal[active_states] -> shape (N, 25)
-            # cdf_fatigued[active_states] -> shape (N, 25)
-            # np.where(fatigue_mask[:, None], A, B)
-            
-            current_cdf = np.where(
-                fatigue_mask[:, None], 
-                self.cdf_fatigued[active_states], 
-                self.cdf_normal[active_states]
-            )
+            if common_draws:
+                half_pa = buf['half_pa'][:n]
+                next_states = self._sample_paired_next_states(
+                    states, table_rows, buf['sim_ids'][:n] % iterations, innings, is_top, half_pa,
+                    draw_key, iterations if antithetic else 0
+                )
+                half_pa += 1
+            else:
+                rand_vals = rng.random(n)
+                next_states = self._sample_next_states(table_rows, rand_vals)
             
-            # Next state selection
-            next_states = (current_cdf >= rand_vals[:, None]).argmax(axis=1)
+            transition_runs = self.run_matrix_int8[states, next_states]
+            np.add(runs_away, transition_runs, out=runs_away, where=is_top)
+            np.add(runs_home, transition_runs, out=runs_home, where=~is_top)
             
-            transition_runs = self.run_matrix[active_states, next_states]
+            states[:] = next_states
             
-            runs_away[active_indices] += (transition_runs * active_is_top).astype(int)
-            runs_home[active_indices] += (transition_runs * (~active_is_top)).astype(int)
+            # --- Handle Inning Changes ---
+            inning_end_mask = (states == END)
             
-            current_states[active_indices] = next_states
+            diff = runs_home - runs_away
+            diff += score_diffs[scenario]
             
-            # --- Handle Inning Changes ---
-            inning_end_mask = (current_states[active_indices] == self.state_engine.END_STATE_IDX)
+            # --- Check Game Over Conditions ---
+            # Bottom 9th+: home wins the moment it leads (walk-off)
+            over_mask = (innings >= LAST) & ~is_top & (diff > 0)
             
             if np.any(inning_end_mask):
-                ended_indices_local = np.where(inning_end_mask)[0]
-                ended_indices_global = active_indices[ended_indices_local]
-                
-                current_states[ended_indices_global] = 0
+                # A completed 9th+ inning with the away team ahead is final;
+                # tied games go to extras (or stop at the cap for the analytic value)
+                bot_end_mask = inning_end_mask & ~is_top
+                over_mask |= bot_end_mask & (innings >= LAST) & (diff < 0)
+                if tie_cap_inning is not None:
+                    over_mask |= bot_end_mask & (diff == 0) & (innings + 1 >= tie_cap_inning)
                 
-                # Flip Sides
-                top_end_mask = is_top_inning[ended_indices_global]
-                bot_end_mask = ~top_end_mask
+                # Flip Sides (bottom half ending starts the next inning)
+                innings[bot_end_mask] += 1
+                is_top[inning_end_mask] = ~is_top[inning_end_mask]
+                if common_draws: buf['half_pa'][:n][inning_end_mask] = 0
                 
-                top_end_global = ended_indices_global[top_end_mask]
-                bot_end_global = ended_indices_global[bot_end_mask]
+                # New half-inning: runner on second from the 10th on
+                states[inning_end_mask] = np.where(
+                    innings[inning_end_mask] > LAST, self.GHOST_RUNNER_STATE, 0
+                )
                 
-                is_top_inning[top_end_global] = False 
-                is_top_inning[bot_end_global] = True 
-                current_innings[bot_end_global] += 1 
+                # Home ahead after the top of the 9th+: no bottom half needed
+                over_mask |= inning_end_mask & (innings >= LAST) & ~is_top & (diff > 0)
                 
-            # --- Check Game Over Conditions ---
-            total_home = home_score + runs_home
-            total_away = away_score + runs_away
-            
-            cond_9plus = (current_innings >= 9)
-            cond_home_leads = (total_home > total_away)
-            cond_away_leads = (total_away > total_home)
-            cond_bot = (~is_top_inning)
-            cond_top = (is_top_inning)
-            
-            win_home_mask = cond_9plus & cond_bot & cond_home_leads
-            win_away_mask = cond_9plus & cond_top & cond_away_leads & (current_states == 0) & (current_innings > 9)
+            if np.any(over_mask):
+                n = self._retire_finished(buf, n, over_mask)
+        
+        # Anything still active after max_steps keeps its current score (ties get the analytic value)
+        active_ids = buf['sim_ids'][:n]
+        buf['final_home'][active_ids] = buf['runs_home'][:n]
+        buf['final_away'][active_ids] = buf['runs_away'][:n]
+
+    def get_extra_inning_value(self, home_slot, away_slot):
+        """
+        P(home wins) from the start of a tied extra inning (runner on second),
+        with home pitching from bank slot home_slot and away from away_slot.
+        Extras are stationary, so X = A / (1 - B), where A = P(home outscores
+        away in one inning) and B = P(inning stays tied). Cached per slot pair.
+        """
+        key = (int(home_slot), int(away_slot))
+        value = self._extra_value_cache.get(key)
+        if value is None:
+            away_runs = self._half_inning_run_distribution(key[0], self.GHOST_RUNNER_STATE)
+            home_runs = self._half_inning_run_distribution(key[1], self.GHOST_RUNNER_STATE)
             
-            over_mask = win_home_mask | win_away_mask
-            game_over[over_mask] = True
+            home_gt = 1.0 - np.cumsum(home_runs) # P(home scores > k)
+            A = away_runs @ home_gt
+            B = away_runs @ home_runs
+            value = float(A / (1.0 - B))
+            self._extra_value_cache[key] = value
+        return value
+
+    def _half_inning_run_distribution(self, slot, start_state):
+        """
+        P(k runs score in a half-inning from start_state) under one bank table.
+        Pushes the (state, runs) distribution forward until it is absorbed;
+        the last bucket holds P(>= MAX_HALF_INNING_RUNS).
+        """
+        END = self.state_engine.END_STATE_IDX
+        max_runs = self.MAX_HALF_INNING_RUNS
+        matrix = self.transition_matrices[slot]
+        run_values = self.run_matrix.astype(int)
+        by_runs = [(r, matrix * (run_values == r)) for r in range(run_values.max() + 1)]
+        
+        dist = np.zeros((25, max_runs + 1)) # (state, runs so far)
+        dist[start_state, 0] = 1.0
+        runs_dist = np.zeros(max_runs + 1)
+        
+        while dist.sum() > 1e-12:
+            pushed = np.zeros_like(dist)
+            for r, P_r in by_runs:
+                moved = P_r.T @ dist
+                pushed[:, r:] += moved[:, :max_runs + 1 - r]
+                if r: pushed[:, -1] += moved[:, max_runs + 1 - r:].sum(axis=1) # Lump the tail
+            runs_dist += pushed[END]
+            pushed[END] = 0.0
+            dist = pushed
             
-        final_home = home_score + runs_home
-        final_away = away_score + runs_away
-        home_wins = np.sum(final_home > final_away)
+        return runs_dist / runs_dist.sum()
+
+    def _retire_finished(self, buf, n, over_mask):
+        """
+        Records finished sims and swaps surviving rows from the tail into
+        their slots. Moves O(finished) rows instead of rebuilding the arrays.
+        Returns the new active count.
+        """
+        done = np.flatnonzero(over_mask)
+        done_ids = buf['sim_ids'][done]
+        buf['final_home'][done_ids] = buf['runs_home'][done]
+        buf['final_away'][done_ids] = buf['runs_away'][done]
+        
+        new_n = n - len(done)
+        holes = done[done < new_n]
+        sources = new_n + np.flatnonzero(~over_mask[new_n:])
         
-        return home_wins / n_sims
+        for name in self.ACTIVE_BUFFERS:
+            arr = buf[name]
+            arr[holes] = arr[sources]
+            
+        return new_n
+
+    def _get_scratch(self, n_sims):
+        """
+        Per-thread preallocated buffers, grown on demand and reused between calls.
+        """
+        buf = getattr(self._scratch, 'buffers', None)
+        if buf is None or len(buf['sim_ids']) < n_sims:
+            buf = {name: np.empty(n_sims, dtype=dtype) for name, dtype in self.SCRATCH_DTYPES.items()}
+            self._scratch.buffers = buf
+        return buf
+
+def _home_win_values(margins, tie_values):
+    """Per-sim home win credit: 1 for a win, 0 for a loss, the tied-extras value for a tie."""
+    return np.where(margins > 0, 1.0, np.where(margins == 0, tie_values[:, None], 0.0))
+
+def _wilson_interval(successes, n, z):
+    """Wilson score interval: (center, low, high). Stays sane at p = 0 or 1."""
+    p = successes / n
+    denom = 1 + z * z / n
+    center = (p + z * z / (2 * n)) / denom
+    margin = z * math.sqrt(p * (1 - p) / n + z * z / (4 * n * n)) / denom
+    return center, max(center - margin, 0.0), min(center + margin, 1.0)
+
+def _counter_uniform(counter, key):
+    """
+    Counter-based uniforms in [0, 1): splitmix64 finalizer over (counter, key).
+    Same (counter, key) always gives the same draw, in any order.
+    """
+    z = counter * np.uint64(0x9E3779B97F4A7C15) + key
+    z = (z ^ (z >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    z = (z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    z ^= z >> np.uint64(31)
+    return (z >> np.uint64(11)) * (1.0 / (1 << 53))
+
+# --- Process-pool workers (module level so they can be pickled) ---
+_worker_simulator = None
+
+def _init_parallel_worker(base_rates):
+    """Builds one simulator (and its alias tables) per worker process."""
+    global _worker_simulator
+    _worker_simulator = MonteCarloSimulator(base_rates=base_rates)
+
+def _simulate_shard(shm_name, n_shards, shard_idx, seed_seq, scenario, iterations, max_extra_innings):
+    """Runs one shard on its own stream and stores the win count in shared memory."""
+    rng = np.random.default_rng(seed_seq)
+    home_wins = _worker_simulator._count_home_wins(*scenario, iterations, rng, max_extra_innings)[0]
+    
+    shm = shared_memory.SharedMemory(name=shm_name, track=False)
+    try:
+        counts = np.ndarray((n_shards,), dtype=np.float64, buffer=shm.buf)
+        counts[shard_idx] = home_wins
+        del counts # Release the view before closing
+    finally:
+        shm.close()
 
 # Alias for backward compatibility
 GameSimulator = MonteCarloSimulator
\ No newline at end of file
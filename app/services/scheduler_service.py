@@ -1,12 +1,19 @@
 from apscheduler.schedulers.background import BackgroundScheduler
 from app.services.data_processor import DataProcessor
-from app.services.season_simulator import SeasonSimulator
+from app.services.season_simulator import SeasonSimulator, SeasonCheckpoint
 from app.services.mlb_api import MlbApi
 from app.services.database_manager import DatabaseManager
+from datetime import datetime, timedelta
 import logging
 import atexit
+import os
+import time
 
 class SchedulerService:
+    SIMULATION_ITERATIONS = 2000
+    LEVERAGE_TOP_N = 100            # Games kept in the nightly season-leverage ranking
+    CHECKPOINT_MAX_AGE_DAYS = 7     # Full rerun weekly (picks up reschedules and rating changes)
+
     def __init__(self):
         self.scheduler = BackgroundScheduler()
         self.db_manager = DatabaseManager()
@@ -45,12 +52,25 @@ class SchedulerService:
         
         if teams and schedule:
             logging.info("Running Daily Simulation...")
-            # We run a high number of iterations for the daily cached result
+            # We run a high number of iterations for the daily cached result.
+            # Finals since the last applied date are applied to the saved checkpoint as a delta when possible.
             simulator = SeasonSimulator(teams, schedule, self.db_manager)
-            simulator.run_simulation(iterations=2000)
+            checkpoint = self._load_checkpoint(simulator)
+            yesterday = (datetime.now() - timedelta(days=1)).strftime('%Y-%m-%d')
+            if checkpoint:
+                rerun = checkpoint.apply_results_through(yesterday, mlb_api.get_final_results, simulator)
+                logging.info(f"Checkpoint updated: {rerun} of {checkpoint.iterations} brackets re-run.")
+            else:
+                checkpoint = simulator.create_checkpoint(self.SIMULATION_ITERATIONS)
+                checkpoint.applied_through = yesterday # The remaining schedule starts today
+            checkpoint.save()
+            
+            # Rank remaining games by playoff-odds leverage from the same iterations
+            leverage = checkpoint.rank_games_by_leverage(top_n=self.LEVERAGE_TOP_N)
+            self.db_manager.set_cached_data("season_leverage", leverage)
             
             # Save results
-            probs = simulator.get_probabilities()
+            probs = checkpoint.get_probabilities()
             
             # Enhance with team names for DB storage
             enhanced_probs = {}
@@ -59,7 +79,27 @@ class SchedulerService:
                 if team_id in teams:
                     enhanced_probs[team_id]['name'] = teams[team_id]['name']
             
-            run_id = self.db_manager.save_simulation_results(2000, enhanced_probs)
+            run_id = self.db_manager.save_simulation_results(checkpoint.iterations, enhanced_probs)
             logging.info(f"Daily Simulation Complete. Run ID: {run_id}")
         else:
             logging.error("Skipping simulation due to missing data.")
+
+    def _load_checkpoint(self, simulator):
+        """
+        Returns the saved checkpoint if it still describes this league, else None.
+        """
+        path = SeasonCheckpoint.DEFAULT_PATH
+        if not os.path.exists(path):
+            return None
+        try:
+            checkpoint = SeasonCheckpoint.load(path)
+        except Exception as e:
+            logging.error(f"Could not load season checkpoint: {e}")
+            return None
+
+        age_days = (time.time() - checkpoint.created_at) / 86400
+        if checkpoint.team_ids != simulator.team_ids or age_days > self.CHECKPOINT_MAX_AGE_DAYS:
+            return None
+        if not checkpoint.game_col: # Schedule without game ids: results cannot be matched
+            return None
+        return checkpoint
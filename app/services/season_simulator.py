@@ -1,15 +1,32 @@
 # app/services/monte_carlo_simulator.py
 
-import copy
-import random
+import os
+import time
+from datetime import datetime, timedelta
+import numpy as np
 from app.services.forecasting_model import ForecastingModel
 
 class SeasonSimulator:
     """
     The 'Monte Carlo Simulation Agent'. It orchestrates the season simulation.
+
+    The regular season is resolved as arrays: one home-win probability per
+    game, an (iterations, games) uniform matrix drawn in chunks, and wins
+    accumulated per team with bincount.
     """
 
-    def __init__(self, teams, schedule, db_manager=None):
+    MAX_CHUNK_DRAWS = 4000000   # Uniforms per chunk (~32 MB of float64)
+    MILESTONES = ("division_winner", "playoff_spot", "league_champion", "world_series_winner")
+    SERIES_FORMATS = (2, 3, 4)  # Games needed: Wild Card Bo3, Division Series Bo5, LCS/WS Bo7
+    # Games hosted by the team with home field, in order (Bo3 all home, 2-2-1, 2-3-2)
+    SERIES_HOME_PATTERNS = {
+        2: (True, True, True),
+        3: (True, True, False, False, True),
+        4: (True, True, False, False, False, True, True),
+    }
+    WILD_CARDS = 3
+
+    def __init__(self, teams, schedule, db_manager=None, rng=None):
         """
         Initializes the simulator with teams and the remaining schedule.
 
@@ -17,11 +34,19 @@ class SeasonSimulator:
             teams (dict): A dictionary of teams indexed by ID.
             schedule (list): A list of game dictionaries for the remaining season.
             db_manager (DatabaseManager): Optional DB connection for advanced stats.
+            rng (np.random.Generator | int): Optional generator or seed. Seeded runs are deterministic.
         """
         self.teams = teams
         self.schedule = schedule
-        self.forecasting_model = ForecastingModel(db_manager)
+        self.rng = np.random.default_rng(rng)
+        self.forecasting_model = ForecastingModel(db_manager, rng=self.rng)
         self.simulations_run = 0
+        self.team_ids = list(teams)
+        self.team_index = {team_id: i for i, team_id in enumerate(self.team_ids)}
+        self.game_ids = None
+        self._matchup_matrix = None
+        self._game_arrays = None
+        self._series_table = None
         # Results tracking: {team_id: {milestone: count}}
         self.results = {
             team_id: {
@@ -40,40 +65,119 @@ class SeasonSimulator:
             iterations (int): The number of times to simulate the season.
         """
         print(f"Running {iterations} simulations...")
+        self._run_batch(iterations)
+        print("Simulations complete.")
+
+    def iter_simulation(self, iterations, chunk_size=1000):
+        """
+        Runs the simulation in chunks, yielding the running total of
+        simulations after each one so callers can report partial results
+        (get_probabilities / get_confidence_intervals) or stop early.
+        """
+        remaining = iterations
+        while remaining > 0:
+            batch = min(chunk_size, remaining)
+            self._run_batch(batch)
+            remaining -= batch
+            yield self.simulations_run
 
-        for _ in range(iterations):
-            # 1. Initialize standings for this simulation run
-            sim_teams = copy.deepcopy(self.teams)
-            for team_id in sim_teams:
-                # Add current stats if they don't exist
-                if 'w' not in sim_teams[team_id]: sim_teams[team_id]['w'] = 0
-                if 'l' not in sim_teams[team_id]: sim_teams[team_id]['l'] = 0
-                
-            # 2. Simulate remaining games
-            for game in self.schedule:
-                home_id = game['home_id']
-                away_id = game['away_id']
-                
-                if home_id not in sim_teams or away_id not in sim_teams:
-                    continue
-                    
-                home_team = sim_teams[home_id]
-                away_team = sim_teams[away_id]
-                
-                winner_team = self.forecasting_model.predict_winner(home_team, away_team)
-                
-                if winner_team['id'] == home_id:
-                    sim_teams[home_id]['w'] += 1
-                    sim_teams[away_id]['l'] += 1
-                else:
-                    sim_teams[away_id]['w'] += 1
-                    sim_teams[home_id]['l'] += 1
-
-            # 3. Determine playoff participants and winners
-            self._process_simulation_results(sim_teams)
+    def _run_batch(self, iterations):
+        # 1. Simulate the remaining regular season for every iteration at once
+        wins = self.simulate_season_wins(iterations)
+
+        # 2. Determine playoff participants and winners for every iteration
+        counts = self.simulate_postseason(wins)
+        for milestone, team_counts in counts.items():
+            for team_id, count in zip(self.team_ids, team_counts):
+                self.results[team_id][milestone] += int(count)
 
         self.simulations_run += iterations
-        print("Simulations complete.")
+
+    def simulate_season_wins(self, iterations, return_outcomes=False):
+        """
+        Returns an (iterations, teams) int16 matrix of final win totals
+        (current wins + simulated wins), columns in self.team_ids order.
+        With return_outcomes, also returns the per-game home-win bits packed
+        along the game axis (np.packbits), shape (iterations, ceil(games / 8)).
+        """
+        home_idx, away_idx, home_probs = self.get_game_arrays()
+        n_teams = len(self.team_ids)
+        n_games = len(home_probs)
+
+        base_wins = np.array([team.get('w', 0) for team in self.teams.values()], dtype=np.int16)
+        wins = np.empty((iterations, n_teams), dtype=np.int16)
+        wins[:] = base_wins
+        outcomes = np.zeros((iterations, (n_games + 7) // 8), dtype=np.uint8) if return_outcomes else None
+        if n_games == 0:
+            return (wins, outcomes) if return_outcomes else wins
+
+        chunk_size = min(max(1, self.MAX_CHUNK_DRAWS // n_games), iterations)
+        row_offsets = (np.arange(chunk_size, dtype=np.int32) * n_teams)[:, None]
+        home_minus_away = (home_idx - away_idx).astype(np.int32)
+        winners = np.empty((chunk_size, n_games), dtype=np.int32)
+
+        for start in range(0, iterations, chunk_size):
+            rows = min(chunk_size, iterations - start)
+
+            # 1. Resolve every game of every iteration in the chunk
+            home_won = self.rng.random((rows, n_games)) < home_probs
+            if return_outcomes:
+                outcomes[start:start + rows] = np.packbits(home_won, axis=1)
+
+            # 2. Winner slot = away + home_won * (home - away), offset into the row's block
+            chunk = winners[:rows]
+            np.multiply(home_won, home_minus_away, out=chunk)
+            chunk += away_idx.astype(np.int32)
+            chunk += row_offsets[:rows]
+
+            # 3. Count wins per (iteration, team)
+            counts = np.bincount(chunk.ravel(), minlength=rows * n_teams)
+            wins[start:start + rows] += counts.reshape(rows, n_teams).astype(np.int16)
+
+        return (wins, outcomes) if return_outcomes else wins
+
+    def get_game_arrays(self):
+        """
+        Returns (home_idx, away_idx, home_probs) for the schedule, computed once.
+        Games involving unknown teams are dropped; self.game_ids keeps the
+        matching schedule 'game_id' (or -1 when the schedule has none).
+        """
+        if self._game_arrays is not None:
+            return self._game_arrays
+
+        home_idx, away_idx, game_ids = [], [], []
+        for game in self.schedule:
+            home_id = game['home_id']
+            away_id = game['away_id']
+            if home_id not in self.team_index or away_id not in self.team_index:
+                continue
+
+            game_ids.append(game.get('game_id', -1))
+            home_idx.append(self.team_index[home_id])
+            away_idx.append(self.team_index[away_id])
+
+        home_idx = np.array(home_idx, dtype=np.intp)
+        away_idx = np.array(away_idx, dtype=np.intp)
+        self._game_arrays = (home_idx, away_idx, self.get_matchup_matrix()[home_idx, away_idx])
+        self.game_ids = np.array(game_ids, dtype=np.int64)
+        return self._game_arrays
+
+    def create_checkpoint(self, iterations):
+        """
+        Simulates the season once and keeps every iteration (wins, game
+        outcomes, playoff flags) so later results can be applied as deltas.
+        """
+        wins, outcomes = self.simulate_season_wins(iterations, return_outcomes=True)
+        home_idx, away_idx, _ = self.get_game_arrays()
+        return SeasonCheckpoint(
+            team_ids=self.team_ids,
+            game_ids=self.game_ids,
+            home_idx=home_idx,
+            away_idx=away_idx,
+            wins=wins.astype(np.uint8),
+            outcomes=outcomes,
+            flags=self.simulate_postseason_flags(wins)
+        )
 
     def get_probabilities(self):
         """
@@ -92,105 +196,413 @@ class SeasonSimulator:
             }
         return probabilities
 
-    def _simulate_series(self, team1, team2, games_needed):
+    def get_confidence_intervals(self, z=1.96):
         """
-        Simulates a playoff series (e.g., Best of 3, 5, 7).
-        Returns the winning team dict.
+        Wilson score intervals for every probability: {team_id: {milestone: (low, high)}}.
         """
-        wins1 = 0
-        wins2 = 0
-        while wins1 < games_needed and wins2 < games_needed:
-            # Home field: Higher seed (better record) usually hosts.
-            # Simplified: Random home field or alternating.
-            # Ideally: Pass home field info. For now, assume team1 is higher seed/home.
-            winner = self.forecasting_model.predict_winner(team1, team2)
-            if winner['id'] == team1['id']:
-                wins1 += 1
-            else:
-                wins2 += 1
-        
-        return team1 if wins1 == games_needed else team2
+        n = self.simulations_run
+        if n == 0:
+            return {}
+
+        intervals = {}
+        for team_id, stats in self.results.items():
+            intervals[team_id] = {}
+            for milestone in self.MILESTONES:
+                p = stats[milestone] / n
+                denom = 1 + z * z / n
+                center = (p + z * z / (2 * n)) / denom
+                margin = z * (p * (1 - p) / n + z * z / (4 * n * n)) ** 0.5 / denom
+                intervals[team_id][milestone] = (max(center - margin, 0.0), min(center + margin, 1.0))
+        return intervals
+
+    def simulate_postseason(self, wins):
+        """
+        Resolves the playoff bracket for every iteration of an (iterations, teams)
+        wins matrix. Returns {milestone: (teams,) count array}.
+        """
+        flags = self.simulate_postseason_flags(wins)
+        return {
+            milestone: np.count_nonzero(flags & (1 << bit), axis=0)
+            for bit, milestone in enumerate(self.MILESTONES)
+        }
+
+    def simulate_postseason_flags(self, wins):
+        """
+        Same bracket, kept per iteration: (iterations, teams) uint8 where
+        bit b is set if the team reached MILESTONES[b] in that iteration.
+
+        Standings ties keep the input team order (as a stable sort would).
+        Series are decided with one uniform each against the exact
+        series-win probability, not game by game. The higher seed has home
+        field through the LCS; the World Series goes to the better record.
+        """
+        wins = np.asarray(wins)
+        n_iter, n_teams = wins.shape
+        flags = np.zeros((n_iter, n_teams), dtype=np.uint8)
+        bits = {milestone: np.uint8(1 << b) for b, milestone in enumerate(self.MILESTONES)}
+
+        # Sort key: wins first, then earlier team order
+        keys = wins.astype(np.int64) * n_teams + (n_teams - 1 - np.arange(n_teams))
+        series_table = self.get_series_table()
+        rows = np.arange(n_iter)[:, None]
+        wc, ds, cs = np.moveaxis(series_table, -1, 0) # Bo3, Bo5, Bo7
+
+        league_champs = {}
+        for l_id, divisions in self._get_league_structure().items():
+            # 1. Division winners: argmax inside each division's columns
+            div_winners = np.stack([cols[np.argmax(keys[:, cols], axis=1)] for cols in divisions], axis=1)
+            flags[rows, div_winners] |= bits["division_winner"]
+
+            # 2. Wild cards: best non-division winners in the league
+            league_cols = np.concatenate(divisions)
+            is_div_winner = (league_cols[None, None, :] == div_winners[:, :, None]).any(axis=1)
+            league_keys = np.where(is_div_winner, -1, keys[:, league_cols])
+            n_wild = min(self.WILD_CARDS, len(league_cols) - len(divisions))
+            wild_cards = league_cols[np.argsort(-league_keys, axis=1, kind='stable')[:, :n_wild]]
+
+            flags[rows, div_winners] |= bits["playoff_spot"]
+            flags[rows, wild_cards] |= bits["playoff_spot"]
+
+            # Bracket needs three division winners and three wild cards
+            if len(divisions) < 3 or n_wild < 3:
+                continue
+
+            # 3. Seeds 1-3: division winners by record, 4-6: wild cards by record
+            div_order = np.argsort(-keys[rows, div_winners], axis=1, kind='stable')
+            seeds = np.concatenate([div_winners[rows, div_order][:, :3], wild_cards], axis=1)
+            seed_of = np.zeros((n_iter, n_teams), dtype=np.int8)
+            seed_of[rows, seeds] = np.arange(1, 7)
+
+            # 4. Wild Card (Bo3): 3 v 6, 4 v 5. 1 and 2 have byes
+            winner_3v6 = self._resolve_series(seeds[:, 2], seeds[:, 5], wc)
+            winner_4v5 = self._resolve_series(seeds[:, 3], seeds[:, 4], wc)
+
+            # 5. Division Series (Bo5), League Championship Series (Bo7)
+            winner_lds_1 = self._resolve_series(seeds[:, 0], winner_4v5, ds)
+            winner_lds_2 = self._resolve_series(seeds[:, 1], winner_3v6, ds)
+            lds_1_home = seed_of[rows[:, 0], winner_lds_1] < seed_of[rows[:, 0], winner_lds_2]
+            league_champs[l_id] = self._resolve_series(winner_lds_1, winner_lds_2, cs, lds_1_home)
+            flags[rows[:, 0], league_champs[l_id]] |= bits["league_champion"]
+
+        # 6. World Series (Bo7)
+        if "103" in league_champs and "104" in league_champs:
+            al_champ, nl_champ = league_champs["103"], league_champs["104"]
+            al_home = keys[rows[:, 0], al_champ] > keys[rows[:, 0], nl_champ]
+            ws_winner = self._resolve_series(al_champ, nl_champ, cs, al_home)
+            flags[rows[:, 0], ws_winner] |= bits["world_series_winner"]
+
+        return flags
+
+    def get_matchup_matrix(self):
+        """(teams, teams) home-win probabilities in team_ids order, built once per simulator."""
+        if self._matchup_matrix is None:
+            self._matchup_matrix, _ = self.forecasting_model.build_matchup_matrix(self.teams)
+        return self._matchup_matrix
+
+    def get_series_table(self):
+        """
+        Returns the (teams, teams, formats) table, built once per simulator:
+        [i, j, f] = P(team i beats team j | i has home field), format f
+        in SERIES_FORMATS order.
+        """
+        if self._series_table is not None:
+            return self._series_table
+
+        # game_probs[h, a] = P(h wins at home vs a)
+        game_probs = self.get_matchup_matrix()
+        p_home = game_probs
+        p_away = 1.0 - game_probs.T
+
+        self._series_table = np.stack([
+            series_win_probability(p_home, p_away, self.SERIES_HOME_PATTERNS[n])
+            for n in self.SERIES_FORMATS
+        ], axis=-1)
+        return self._series_table
+
+    def get_series_probability(self, team1_id, team2_id, games_needed=4, team1_home=True):
+        """P(team1 wins a best-of-(2n-1) series), read from the cached table."""
+        table = self.get_series_table()[..., self.SERIES_FORMATS.index(games_needed)]
+        i, j = self.team_index[team1_id], self.team_index[team2_id]
+        return float(table[i, j] if team1_home else 1.0 - table[j, i])
 
-    def _process_simulation_results(self, sim_teams):
+    def _resolve_series(self, team1, team2, series_table, team1_home=True):
         """
-        Determines playoff qualifiers and simulates the full postseason bracket.
+        Vectorized series from one uniform each. team1 has home field
+        unless team1_home says otherwise (bool array).
+        """
+        team1_prob = np.where(team1_home, series_table[team1, team2], 1.0 - series_table[team2, team1])
+        team1_wins = self.rng.random(len(team1)) < team1_prob
+        return np.where(team1_wins, team1, team2)
+
+    def _get_league_structure(self):
+        """
+        Returns {league_id: [division column arrays]} for the AL (103) and NL (104).
         """
         leagues = {"103": {}, "104": {}} # 103: American, 104: National
-        
-        # Organize teams by League and Division
-        for team_id, team in sim_teams.items():
+
+        for col, team in enumerate(self.teams.values()):
             l_id = str(team.get('league_id'))
             d_id = str(team.get('division_id'))
             if l_id not in leagues: continue
-            if d_id not in leagues[l_id]: leagues[l_id][d_id] = []
-            leagues[l_id][d_id].append(team)
+            leagues[l_id].setdefault(d_id, []).append(col)
 
-        league_champs = {}
+        return {
+            l_id: [np.array(cols, dtype=np.intp) for cols in divisions.values()]
+            for l_id, divisions in leagues.items() if divisions
+        }
 
-        # Process each League (AL/NL) independently
-        for l_id, divisions in leagues.items():
-            div_winners = []
-            all_teams_in_league = []
-            
-            # Determine Division Winners
-            for d_id, teams in divisions.items():
-                sorted_teams = sorted(teams, key=lambda x: x['w'], reverse=True)
-                div_winner = sorted_teams[0]
-                div_winners.append(div_winner)
-                self.results[div_winner['id']]["division_winner"] += 1
-                all_teams_in_league.extend(teams)
-
-            # Determine Wild Cards (Top 3 non-division winners)
-            div_winner_ids = {t['id'] for t in div_winners}
-            non_winners = [t for t in all_teams_in_league if t['id'] not in div_winner_ids]
-            wild_cards = sorted(non_winners, key=lambda x: x['w'], reverse=True)[:3]
-            
-            # Record Playoff Spots
-            playoff_field = div_winners + wild_cards
-            for t in playoff_field:
-                self.results[t['id']]["playoff_spot"] += 1
-                
-            # --- SEEDING (1-6) ---
-            # Seeds 1-3: Division winners sorted by record
-            sorted_div_winners = sorted(div_winners, key=lambda x: x['w'], reverse=True)
-            # Seeds 4-6: Wild Cards sorted by record
-            sorted_wild_cards = sorted(wild_cards, key=lambda x: x['w'], reverse=True)
-            
-            seeds = {}
-            if len(sorted_div_winners) >= 3:
-                seeds[1] = sorted_div_winners[0]
-                seeds[2] = sorted_div_winners[1]
-                seeds[3] = sorted_div_winners[2]
-            else:
-                # Handle unexpected data (fewer than 3 divisions)
-                continue 
-            
-            if len(sorted_wild_cards) >= 3:
-                seeds[4] = sorted_wild_cards[0]
-                seeds[5] = sorted_wild_cards[1]
-                seeds[6] = sorted_wild_cards[2]
+
+class SeasonCheckpoint:
+    """
+    Saved SeasonSimulator run that can be updated as games resolve.
+
+        wins[i, t]:     final win total of team t in iteration i (uint8)
+        outcomes[i]:    home-win bit of every simulated game, packed 8 per byte
+        flags[i, t]:    milestone bits (SeasonSimulator.MILESTONES order)
+        resolved[g]:    game g has a real result applied
+        applied_through: last date ('YYYY-MM-DD') whose finals were applied
+
+    Games are independent, so conditioning on a real result just overwrites
+    that game in every iteration that simulated it the other way: the rest
+    of each iteration keeps its draws and every iteration keeps weight 1.
+    Only the flipped iterations have their brackets re-run.
+    """
+
+    DEFAULT_PATH = "data/season_checkpoint.npz"
+    LEVERAGE_CHUNK_ROWS = 5000  # Iterations unpacked per matmul
+    LEVERAGE_Z = 3.0            # Swings within this many standard errors count as noise
+
+    def __init__(self, team_ids, game_ids, home_idx, away_idx, wins, outcomes, flags, created_at=None,
+                 applied_through=None, resolved=None):
+        self.team_ids = list(team_ids)
+        self.game_ids = np.asarray(game_ids, dtype=np.int64)
+        self.home_idx = np.asarray(home_idx, dtype=np.intp)
+        self.away_idx = np.asarray(away_idx, dtype=np.intp)
+        self.wins = wins
+        self.outcomes = outcomes
+        self.flags = flags
+        self.created_at = created_at if created_at is not None else time.time()
+        self.applied_through = applied_through
+        self.resolved = np.zeros(len(self.game_ids), dtype=bool) if resolved is None else np.asarray(resolved, dtype=bool)
+        self.game_col = {int(g): col for col, g in enumerate(self.game_ids) if g >= 0}
+
+    @property
+    def iterations(self):
+        return len(self.wins)
+
+    def apply_results(self, results, simulator):
+        """
+        Conditions the checkpoint on final results in place.
+
+        Args:
+            results (dict): {game_id: home_won}. Unknown game ids are ignored.
+            simulator (SeasonSimulator): Supplies the bracket (same teams).
+
+        Returns the number of iterations whose bracket was re-run.
+        """
+        affected, wins, outcomes = self._condition(results)
+        for g in results:
+            if int(g) in self.game_col:
+                self.resolved[self.game_col[int(g)]] = True
+        if len(affected):
+            self.wins[affected] = wins
+            self.outcomes[affected] = outcomes
+            self.flags[affected] = simulator.simulate_postseason_flags(wins)
+        return len(affected)
+
+    def apply_results_through(self, end_date, get_final_results, simulator):
+        """
+        Applies the finals of every date after applied_through up to end_date,
+        so a missed daily run does not leave games unresolved.
+
+        Args:
+            end_date (str): Last date to apply, 'YYYY-MM-DD'.
+            get_final_results (callable): date -> {game_id: home_won} (MlbApi.get_final_results).
+            simulator (SeasonSimulator): Supplies the bracket (same teams).
+
+        Returns the number of iterations whose bracket was re-run.
+        """
+        end = datetime.strptime(end_date, '%Y-%m-%d')
+        if self.applied_through:
+            day = datetime.strptime(self.applied_through, '%Y-%m-%d') + timedelta(days=1)
+        else:
+            day = end # Unknown history: only the last date can be assumed missing
+
+        results = {}
+        while day <= end:
+            results.update(get_final_results(day.strftime('%Y-%m-%d')))
+            day += timedelta(days=1)
+        rerun = self.apply_results(results, simulator)
+        self.applied_through = max(self.applied_through or end_date, end_date)
+        return rerun
+
+    def what_if(self, results, simulator):
+        """
+        Probabilities if the given games ({game_id: home_won}) go that way.
+        The checkpoint itself is not modified.
+        """
+        affected, wins, _ = self._condition(results)
+        flags = self.flags.copy() if len(affected) else self.flags
+        if len(affected):
+            flags[affected] = simulator.simulate_postseason_flags(wins)
+        return self.get_probabilities(flags)
+
+    def get_probabilities(self, flags=None):
+        """Same format as SeasonSimulator.get_probabilities()."""
+        flags = self.flags if flags is None else flags
+        probs = {
+            milestone: np.count_nonzero(flags & (1 << bit), axis=0) / self.iterations
+            for bit, milestone in enumerate(SeasonSimulator.MILESTONES)
+        }
+        return {
+            team_id: {milestone: float(p[t]) for milestone, p in probs.items()}
+            for t, team_id in enumerate(self.team_ids)
+        }
+
+    def get_game_leverage(self, milestone="playoff_spot"):
+        """
+        Conditional milestone probabilities for every remaining game, from the
+        stored iterations (no extra simulation):
+            if_home[g, t]: P(team t reaches the milestone | home team wins game g)
+            if_away[g, t]: same given the away team wins
+        Returns (if_home, if_away, std_error), each (games, teams).
+        """
+        bit = SeasonSimulator.MILESTONES.index(milestone)
+        n_games, n_teams = len(self.home_idx), len(self.team_ids)
+
+        # 1. Joint counts via one matmul per chunk: outcome bits^T @ milestone hits
+        home_hits = np.zeros((n_games, n_teams))
+        home_games = np.zeros(n_games)
+        total_hits = np.zeros(n_teams)
+        for start in range(0, self.iterations, self.LEVERAGE_CHUNK_ROWS):
+            stop = start + self.LEVERAGE_CHUNK_ROWS
+            home_won = np.unpackbits(self.outcomes[start:stop], axis=1, count=n_games).astype(np.float32)
+            hits = ((self.flags[start:stop] >> bit) & 1).astype(np.float32)
+            home_hits += home_won.T @ hits
+            home_games += home_won.sum(axis=0)
+            total_hits += hits.sum(axis=0)
+
+        # 2. Condition on each outcome (a never-simulated outcome falls back to the overall rate)
+        away_hits = total_hits - home_hits
+        away_games = self.iterations - home_games
+        overall = total_hits / self.iterations
+        if_home = np.where(home_games[:, None] > 0, home_hits / np.maximum(home_games, 1)[:, None], overall)
+        if_away = np.where(away_games[:, None] > 0, away_hits / np.maximum(away_games, 1)[:, None], overall)
+
+        std_error = np.sqrt(
+            if_home * (1.0 - if_home) / np.maximum(home_games, 1)[:, None] +
+            if_away * (1.0 - if_away) / np.maximum(away_games, 1)[:, None]
+        )
+        return if_home, if_away, std_error
+
+    def rank_games_by_leverage(self, milestone="playoff_spot", top_n=None):
+        """
+        Remaining games ranked by how much their outcome moves the league's
+        milestone odds: leverage = sum over teams of |if_home - if_away|,
+        counting only swings larger than LEVERAGE_Z standard errors.
+        Games already resolved by apply_results are left out.
+        """
+        if_home, if_away, std_error = self.get_game_leverage(milestone)
+        swings = if_home - if_away
+        significant = np.abs(swings) > self.LEVERAGE_Z * std_error
+        leverage = np.where(significant, np.abs(swings), 0.0).sum(axis=1)
+
+        remaining = np.flatnonzero(~self.resolved)
+        ranked = []
+        for g in remaining[np.argsort(-leverage[remaining], kind='stable')][:top_n]:
+            teams = np.flatnonzero(significant[g])
+            ranked.append({
+                "game_id": int(self.game_ids[g]),
+                "home_id": self.team_ids[self.home_idx[g]],
+                "away_id": self.team_ids[self.away_idx[g]],
+                "leverage": round(float(leverage[g]), 4),
+                # Change in each team's odds if the home team wins instead of losing
+                "swings": {self.team_ids[t]: round(float(swings[g, t]), 4) for t in teams[np.argsort(-np.abs(swings[g, teams]))]}
+            })
+        return ranked
+
+    def _condition(self, results):
+        """
+        Returns (affected rows, their updated wins, their updated outcome bytes).
+        """
+        cols = [(self.game_col[int(g)], bool(home_won)) for g, home_won in results.items() if int(g) in self.game_col]
+
+        # 1. Iterations that simulated at least one of these games the other way
+        flipped = np.zeros(self.iterations, dtype=bool)
+        for col, home_won in cols:
+            byte, mask = col // 8, np.uint8(0x80 >> (col % 8)) # packbits is big-endian
+            flipped |= ((self.outcomes[:, byte] & mask) != 0) != home_won
+
+        affected = np.flatnonzero(flipped)
+        wins = self.wins[affected].astype(np.int16)
+        outcomes = self.outcomes[affected].copy()
+
+        # 2. Swap the win to the actual winner and record the actual outcome
+        for col, home_won in cols:
+            byte, mask = col // 8, np.uint8(0x80 >> (col % 8))
+            flip = ((outcomes[:, byte] & mask) != 0) != home_won
+            winner, loser = (self.home_idx[col], self.away_idx[col]) if home_won else (self.away_idx[col], self.home_idx[col])
+            wins[flip, winner] += 1
+            wins[flip, loser] -= 1
+            if home_won:
+                outcomes[:, byte] |= mask
             else:
-                continue
+                outcomes[:, byte] &= ~mask
 
-            # --- WILD CARD ROUND (Best of 3) ---
-            # 1 and 2 have Byes
-            # 3 vs 6
-            winner_3v6 = self._simulate_series(seeds[3], seeds[6], 2)
-            # 4 vs 5
-            winner_4v5 = self._simulate_series(seeds[4], seeds[5], 2)
-            
-            # --- DIVISION SERIES (Best of 5) ---
-            # 1 vs winner_4v5
-            winner_lds_1 = self._simulate_series(seeds[1], winner_4v5, 3)
-            # 2 vs winner_3v6
-            winner_lds_2 = self._simulate_series(seeds[2], winner_3v6, 3)
-            
-            # --- LEAGUE CHAMPIONSHIP SERIES (Best of 7) ---
-            league_champion = self._simulate_series(winner_lds_1, winner_lds_2, 4)
-            self.results[league_champion['id']]["league_champion"] += 1
-            league_champs[l_id] = league_champion
-
-        # --- WORLD SERIES (Best of 7) ---
-        if "103" in league_champs and "104" in league_champs:
-            ws_winner = self._simulate_series(league_champs["103"], league_champs["104"], 4)
-            self.results[ws_winner['id']]["world_series_winner"] += 1
\ No newline at end of file
+        return affected, wins.astype(np.uint8), outcomes
+
+    def save(self, path=DEFAULT_PATH):
+        directory = os.path.dirname(path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+        np.savez(
+            path,
+            team_ids=np.array(self.team_ids),
+            game_ids=self.game_ids,
+            home_idx=self.home_idx,
+            away_idx=self.away_idx,
+            wins=self.wins,
+            outcomes=self.outcomes,
+            flags=self.flags,
+            created_at=self.created_at,
+            applied_through=self.applied_through or '',
+            resolved=self.resolved
+        )
+
+    @classmethod
+    def load(cls, path=DEFAULT_PATH):
+        with np.load(path) as data:
+            return cls(
+                team_ids=data['team_ids'].tolist(),
+                game_ids=data['game_ids'],
+                home_idx=data['home_idx'],
+                away_idx=data['away_idx'],
+                wins=data['wins'],
+                outcomes=data['outcomes'],
+                flags=data['flags'],
+                created_at=float(data['created_at']),
+                applied_through=(str(data['applied_through']) or None) if 'applied_through' in data.files else None,
+                resolved=data['resolved'] if 'resolved' in data.files else None
+            )
+
+
+def series_win_probability(p_home, p_away, home_pattern):
+    """
+    Exact P(team wins the series) given its per-game win probability at home
+    and away, and the game-by-game home pattern (True = team hosts).
+    A best-of-(2n-1) is won by whoever would take the majority of all 2n-1
+    games, so this is a Poisson-binomial tail. Works elementwise on arrays.
+    """
+    p_home = np.asarray(p_home, dtype=float)
+    p_away = np.asarray(p_away, dtype=float)
+    n_games = len(home_pattern)
+
+    # dist[k] = P(k wins so far)
+    dist = np.zeros((n_games + 1,) + np.broadcast(p_home, p_away).shape)
+    dist[0] = 1.0
+    for g, is_home in enumerate(home_pattern):
+        p = p_home if is_home else p_away
+        dist[1:g + 2] = dist[1:g + 2] * (1.0 - p) + dist[:g + 1] * p
+        dist[0] *= 1.0 - p
+
+    return dist[n_games // 2 + 1:].sum(axis=0)
@@ -0,0 +1,183 @@
+import json
+import threading
+import uuid
+from app.services.season_simulator import SeasonSimulator
+
+class SimulationJob:
+    """
+    One background season simulation. Progress snapshots are published under
+    a condition variable so any number of stream readers can wait on them.
+    """
+
+    TERMINAL_STATES = ("completed", "cancelled", "failed")
+
+    def __init__(self, iterations):
+        self.id = uuid.uuid4().hex
+        self.iterations = iterations
+        self.status = "queued"
+        self.completed = 0
+        self.probabilities = {}
+        self.run_id = None
+        self.error = None
+        self.version = 0
+
+        self._cancel_event = threading.Event()
+        self._condition = threading.Condition()
+
+    @property
+    def is_finished(self):
+        return self.status in self.TERMINAL_STATES
+
+    @property
+    def is_cancelled(self):
+        return self._cancel_event.is_set()
+
+    def cancel(self):
+        self._cancel_event.set()
+
+    def publish(self, **fields):
+        """Updates the job and wakes every waiting stream."""
+        with self._condition:
+            for key, value in fields.items():
+                setattr(self, key, value)
+            self.version += 1
+            self._condition.notify_all()
+
+    def wait_for_update(self, last_version, timeout):
+        """
+        Blocks until the job moves past last_version or timeout expires.
+        Returns the latest snapshot, or None on timeout.
+        """
+        with self._condition:
+            self._condition.wait_for(lambda: self.version != last_version, timeout)
+            if self.version == last_version:
+                return None
+            return self.to_dict()
+
+    def to_dict(self):
+        return {
+            "job_id": self.id,
+            "status": self.status,
+            "completed": self.completed,
+            "iterations": self.iterations,
+            "run_id": self.run_id,
+            "error": self.error,
+            "version": self.version,
+            "probabilities": self.probabilities
+        }
+
+
+class SimulationJobManager:
+    """
+    Runs SeasonSimulator jobs on background threads so requests return at once.
+    Partial probabilities (with 95% intervals) are published after every chunk
+    and can be followed as Server-Sent Events.
+    """
+
+    CHUNK_SIZE = 1000
+    MAX_ITERATIONS = 1000000
+    HEARTBEAT_SECONDS = 15      # Keeps proxies from closing idle streams
+    MAX_FINISHED_JOBS = 20
+    MAX_RUNNING_JOBS = 2        # Each job holds a full simulator and a CPU core
+
+    def __init__(self, db_manager, mlb_api):
+        self.db_manager = db_manager
+        self.mlb_api = mlb_api
+        self.jobs = {}
+        self._lock = threading.Lock()
+
+    def start(self, iterations):
+        """
+        Starts a job in the background and returns it, or None if
+        MAX_RUNNING_JOBS are already running.
+        """
+        iterations = min(max(int(iterations), 1), self.MAX_ITERATIONS)
+        job = SimulationJob(iterations)
+
+        with self._lock:
+            self._prune_finished()
+            if sum(not j.is_finished for j in self.jobs.values()) >= self.MAX_RUNNING_JOBS:
+                return None
+            self.jobs[job.id] = job
+
+        threading.Thread(target=self._run, args=(job,), daemon=True).start()
+        return job
+
+    def get(self, job_id):
+        with self._lock:
+            return self.jobs.get(job_id)
+
+    def cancel(self, job_id):
+        """Requests cancellation; the job stops after its current chunk."""
+        job = self.get(job_id)
+        if job is None:
+            return None
+        if not job.is_finished:
+            job.cancel()
+        return job
+
+    def stream(self, job_id):
+        """
+        Generator of Server-Sent Event frames for a job: one 'progress' event
+        per published snapshot, a final 'done' event, comment heartbeats between.
+        """
+        job = self.get(job_id)
+        if job is None:
+            return
+
+        version = -1
+        while True:
+            snapshot = job.wait_for_update(version, self.HEARTBEAT_SECONDS)
+            if snapshot is None:
+                yield ": keep-alive\n\n"
+                continue
+
+            version = snapshot["version"]
+            event = "done" if snapshot["status"] in SimulationJob.TERMINAL_STATES else "progress"
+            yield f"event: {event}\ndata: {json.dumps(snapshot)}\n\n"
+            if event == "done":
+                return
+
+    def _run(self, job):
+        try:
+            job.publish(status="loading")
+            teams = self.mlb_api.get_teams_for_simulation()
+            schedule = self.mlb_api.get_remaining_schedule()
+            if not teams or not schedule:
+                job.publish(status="failed", error="Missing data for simulation.")
+                return
+
+            simulator = SeasonSimulator(teams, schedule, self.db_manager)
+            job.publish(status="running")
+
+            for completed in simulator.iter_simulation(job.iterations, self.CHUNK_SIZE):
+                if job.is_cancelled:
+                    break
+                job.publish(completed=completed, probabilities=self._snapshot(simulator, teams))
+
+            if job.is_cancelled:
+                job.publish(status="cancelled")
+                return
+
+            probabilities = self._snapshot(simulator, teams)
+            run_id = self.db_manager.save_simulation_results(simulator.simulations_run, probabilities)
+            job.publish(status="completed", probabilities=probabilities, run_id=run_id)
+
+        except Exception as e:
+            print(f"[SimulationJobManager] Job {job.id} failed: {e}")
+            job.publish(status="failed", error=str(e))
+
+    def _snapshot(self, simulator, teams):
+        """Probabilities with team names and 95% intervals, keyed by team id."""
+        probabilities = simulator.get_probabilities()
+        intervals = simulator.get_confidence_intervals()
+        for team_id, probs in probabilities.items():
+            probs['name'] = teams[team_id]['name']
+            probs['ci'] = intervals[team_id]
+        return probabilities
+
+    def _prune_finished(self):
+        """Forgets the oldest finished jobs beyond MAX_FINISHED_JOBS."""
+        finished = [job_id for job_id, job in self.jobs.items() if job.is_finished]
+        for job_id in finished[:max(len(finished) - self.MAX_FINISHED_JOBS, 0)]:
+            del self.jobs[job_id]
@@ -0,0 +1,309 @@
+import os
+import struct
+import zipfile
+import numpy as np
+from app.services.mlb_api import MlbApi
+from app.services.game_replay_service import match_key_exists
+
+class TransitionStore:
+    """
+    Compact on-disk store of empirical base/out transition counts.
+
+    One group per key (e.g. "2025/all", "2025/team/147", "2025/park/3313"):
+        transitions[g, i, j]: PAs that moved base/out state i -> j (25x25)
+        runs[g, i, j]:        total runs scored on those PAs
+        events[g, i, e]:      PA event counts from state i in MarkovChainService.EVENTS order
+
+    Saved as an uncompressed .npz so members can be memory-mapped at startup
+    (loaded stores are read-only).
+    """
+
+    DEFAULT_PATH = "data/transition_counts.npz"
+    EVENTS = ('out', 'bb', '1b', '2b', '3b', 'hr')
+
+    def __init__(self, keys=None, transitions=None, runs=None, events=None):
+        self.keys = list(keys) if keys is not None else []
+        self.key_to_idx = {key: i for i, key in enumerate(self.keys)}
+        self.transitions = transitions if transitions is not None else np.zeros((0, 25, 25), dtype=np.uint32)
+        self.runs = runs if runs is not None else np.zeros((0, 25, 25), dtype=np.uint32)
+        self.events = events if events is not None else np.zeros((0, 24, len(self.EVENTS)), dtype=np.uint32)
+
+    def add_counts(self, key, from_idx, to_idx, runs, event_idx):
+        """
+        Accumulates one batch of PAs (arrays) into a group.
+        event_idx < 0 marks PAs that do not map to a modelled event.
+        """
+        g = self._get_or_create_group(key)
+
+        np.add.at(self.transitions[g], (from_idx, to_idx), 1)
+        np.add.at(self.runs[g], (from_idx, to_idx), runs)
+
+        known = (event_idx >= 0) & (from_idx < 24)
+        np.add.at(self.events[g], (from_idx[known], event_idx[known]), 1)
+
+    def get_event_rates(self, key):
+        """
+        Returns {event: probability} pooled over all states, or None if the key is missing.
+        Drop-in replacement for the hardcoded base rates in the engines.
+        """
+        g = self.key_to_idx.get(key)
+        if g is None:
+            return None
+        totals = np.asarray(self.events[g]).sum(axis=0).astype(float)
+        if totals.sum() == 0:
+            return None
+        return dict(zip(self.EVENTS, totals / totals.sum()))
+
+    def get_league_event_rates(self):
+        """
+        Event rates of the latest ingested season ("<season>/all"), or None if empty.
+        This pooled rate is what the engines load; the team and park groups are
+        kept for analysis and are not read by them yet.
+        """
+        seasons = [key for key in self.keys if key.endswith('/all')]
+        if not seasons:
+            return None
+        return self.get_event_rates(max(seasons, key=lambda key: int(key.split('/')[0])))
+
+    def get_transition_matrix(self, key):
+        """
+        Returns (matrix, run_matrix) for a key:
+            matrix: row-normalized 25x25 empirical transition matrix
+            run_matrix: mean runs scored on each transition
+        Unobserved rows fall back to the absorbing End state.
+        """
+        g = self.key_to_idx.get(key)
+        if g is None:
+            return None, None
+
+        counts = np.asarray(self.transitions[g], dtype=float)
+        runs = np.asarray(self.runs[g], dtype=float)
+
+        row_sums = counts.sum(axis=1, keepdims=True)
+        matrix = np.divide(counts, row_sums, out=np.zeros_like(counts), where=row_sums > 0)
+        matrix[row_sums[:, 0] == 0, 24] = 1.0
+        matrix[24] = 0.0
+        matrix[24, 24] = 1.0
+
+        run_matrix = np.divide(runs, counts, out=np.zeros_like(runs), where=counts > 0)
+        return matrix, run_matrix
+
+    def save(self, path=DEFAULT_PATH):
+        directory = os.path.dirname(path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+        # Uncompressed on purpose: compressed members cannot be memory-mapped
+        np.savez(
+            path,
+            keys=np.array(self.keys, dtype=str),
+            transitions=self.transitions,
+            runs=self.runs,
+            events=self.events
+        )
+
+    @classmethod
+    def load_or_none(cls, path=DEFAULT_PATH):
+        """
+        Memory-maps the store if it has been ingested, else returns None so the
+        engines keep their hardcoded league-average rates.
+        """
+        if path and os.path.exists(path):
+            return cls.load(path)
+        print(f"[TransitionStore] {path} not found. Using hardcoded event rates.")
+        return None
+
+    @classmethod
+    def load(cls, path=DEFAULT_PATH):
+        """Memory-maps every array in a store written by save()."""
+        arrays = _mmap_npz(path)
+        return cls(
+            keys=[str(k) for k in arrays['keys']],
+            transitions=arrays['transitions'],
+            runs=arrays['runs'],
+            events=arrays['events']
+        )
+
+    def _get_or_create_group(self, key):
+        g = self.key_to_idx.get(key)
+        if g is not None:
+            return g
+
+        g = len(self.keys)
+        self.keys.append(key)
+        self.key_to_idx[key] = g
+        self.transitions = np.concatenate([self.transitions, np.zeros((1, 25, 25), dtype=np.uint32)])
+        self.runs = np.concatenate([self.runs, np.zeros((1, 25, 25), dtype=np.uint32)])
+        self.events = np.concatenate([self.events, np.zeros((1, 24, len(self.EVENTS)), dtype=np.uint32)])
+        return g
+
+
+class TransitionIngestor:
+    """
+    Streams play-by-play feeds (one game in memory at a time) and counts
+    base/out transitions, runs scored and PA events per season, team and park.
+    """
+
+    # result.eventType -> index into TransitionStore.EVENTS
+    EVENT_MAP = {
+        'walk': 1, 'intent_walk': 1, 'hit_by_pitch': 1,
+        'single': 2,
+        'double': 3,
+        'triple': 4,
+        'home_run': 5,
+    }
+    OUT_IDX = 0
+    GHOST_RUNNER_SEASON = 2020  # Regular-season extra innings start with a runner on 2nd
+    REGULATION_INNINGS = 9
+
+    def __init__(self, db_manager=None, store=None):
+        self.mlb_api = MlbApi(db_manager)
+        self.store = store if store else TransitionStore()
+        self.games_ingested = 0
+
+    def ingest_season(self, game_pks, season):
+        """
+        Single streaming pass over a season's games.
+        Feeds are pulled through the API cache and released after counting.
+        """
+        for game_pk in game_pks:
+            live_data = self.mlb_api.get_cached_game_feed(game_pk)
+            if live_data:
+                self.ingest_game(live_data, season)
+        return self.store
+
+    def ingest_game(self, live_data, season):
+        """Counts one game feed into the season/team/park groups."""
+        game_data = live_data.get('gameData', {})
+        all_plays = live_data.get('liveData', {}).get('plays', {}).get('allPlays', [])
+        if not all_plays:
+            return
+
+        home_id = game_data.get('teams', {}).get('home', {}).get('id')
+        away_id = game_data.get('teams', {}).get('away', {}).get('id')
+        venue_id = game_data.get('venue', {}).get('id')
+        ghost_runner = (
+            int(season) >= self.GHOST_RUNNER_SEASON and
+            game_data.get('game', {}).get('type', 'R') == 'R'
+        )
+
+        from_idx, to_idx, runs, event_idx, batting_ids = self._parse_plays(all_plays, home_id, away_id, ghost_runner)
+        if len(from_idx) == 0:
+            return
+
+        self.store.add_counts(f"{season}/all", from_idx, to_idx, runs, event_idx)
+        if venue_id is not None:
+            self.store.add_counts(f"{season}/park/{venue_id}", from_idx, to_idx, runs, event_idx)
+        for team_id in (home_id, away_id):
+            if team_id is None: continue
+            mask = batting_ids == team_id
+            self.store.add_counts(f"{season}/team/{team_id}", from_idx[mask], to_idx[mask], runs[mask], event_idx[mask])
+
+        self.games_ingested += 1
+
+    def _parse_plays(self, all_plays, home_id, away_id, ghost_runner=True):
+        """
+        Walks allPlays (as GameReplayService does) and returns per-PA arrays:
+        from state, to state, runs scored, event index, batting team id.
+        ghost_runner: extra half-innings start with the automatic runner on 2nd.
+        """
+        from_idx, to_idx, runs, event_idx, batting_ids = [], [], [], [], []
+
+        half_inning = None
+        state = 0
+        prev_total = 0
+
+        for play in all_plays:
+            result = play.get('result', {})
+            about = play.get('about', {})
+            count = play.get('count', {})
+            if result.get('type') != 'atBat':
+                continue
+
+            inning = about.get('inning')
+            is_top = about.get('isTopInning')
+
+            # New half-inning: bases empty, or the placed runner on 2nd in extras.
+            # (runners only lists players who moved, so it cannot tell us the start state)
+            if (inning, is_top) != half_inning:
+                half_inning = (inning, is_top)
+                placed_runner = ghost_runner and inning > self.REGULATION_INNINGS
+                state = _state_index(0, False, placed_runner, False)
+
+            outs = count.get('outs', 0)
+            next_state = _state_index(
+                outs,
+                match_key_exists(play, 'matchup.postOnFirst'),
+                match_key_exists(play, 'matchup.postOnSecond'),
+                match_key_exists(play, 'matchup.postOnThird')
+            )
+
+            total = (result.get('homeScore') or 0) + (result.get('awayScore') or 0)
+            scored = max(total - prev_total, 0)
+            prev_total = total
+
+            event = self.EVENT_MAP.get(result.get('eventType'))
+            if event is None:
+                prev_outs = state // 8 if state < 24 else 3
+                event = self.OUT_IDX if outs > prev_outs else -1
+
+            if state < 24:
+                from_idx.append(state)
+                to_idx.append(next_state)
+                runs.append(scored)
+                event_idx.append(event)
+                batting_ids.append(away_id if is_top else home_id)
+
+            state = next_state
+
+        return (
+            np.array(from_idx, dtype=np.intp),
+            np.array(to_idx, dtype=np.intp),
+            np.array(runs, dtype=np.uint32),
+            np.array(event_idx, dtype=np.intp),
+            np.array(batting_ids)
+        )
+
+
+def _state_index(outs, r1, r2, r3):
+    """Same ordering as StateEngine.STATES: (outs, r1, r2, r3)."""
+    if outs >= 3:
+        return 24
+    return outs * 8 + int(bool(r1)) * 4 + int(bool(r2)) * 2 + int(bool(r3))
+
+
+def _mmap_npz(path):
+    """
+    Memory-maps the members of an uncompressed .npz.
+    Compressed members are read normally.
+    """
+    arrays = {}
+    with zipfile.ZipFile(path) as zf, open(path, 'rb') as f:
+        for info in zf.infolist():
+            name = info.filename[:-4] if info.filename.endswith('.npy') else info.filename
+
+            if info.compress_type != zipfile.ZIP_STORED:
+                with zf.open(info) as member:
+                    arrays[name] = np.lib.format.read_array(member)
+                continue
+
+            # Skip the local file header to reach the .npy payload
+            f.seek(info.header_offset)
+            local_header = f.read(30)
+            name_len, extra_len = struct.unpack('<HH', local_header[26:30])
+            f.seek(info.header_offset + 30 + name_len + extra_len)
+
+            version = np.lib.format.read_magic(f)
+            if version == (1, 0):
+                shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(f)
+            else:
+                shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(f)
+
+            if int(np.prod(shape)) == 0:
+                arrays[name] = np.empty(shape, dtype=dtype)
+                continue
+
+            arrays[name] = np.memmap(
+                path, dtype=dtype, mode='r', offset=f.tell(), shape=shape,
+                order='F' if fortran_order else 'C'
+            )
+    return arrays
@@ -0,0 +1,209 @@
+import numpy as np
+import threading
+from collections import OrderedDict
+from app.services.markov_chain_service import MarkovChainService
+
+class WinExpectancyEngine:
+    """
+    Exact Full-Game Win Expectancy (no sampling).
+    Models the game as an absorbing Markov chain over
+    (inning, half, base/out state, run differential), built from the
+    transition masks and run vectors in MarkovChainService.
+
+    1. Half-inning run distributions are solved per base/out state with one
+       LU factorization of (I - P0) reused for every run total.
+    2. Win probability is solved by dynamic programming from the last
+       inning backwards. Extra innings (runner on second) are stationary,
+       so their value is closed-form.
+    """
+
+    MAX_RUNS = 20           # Half-inning run support (tail mass lumped into the last bucket)
+    MAX_RUN_DIFF = 30       # Run differential clamp (beyond this the game is decided)
+    REGULATION_INNINGS = 9
+    GHOST_RUNNER_STATE = 2  # Extra innings start with a runner on second (0 outs)
+    LATE_INNING = 7         # Bullpen modifiers apply from here (matches MonteCarloSimulator)
+    CACHE_MAX_SIZE = 64
+
+    def __init__(self, markov_service=None, cache_size=CACHE_MAX_SIZE):
+        self.markov = markov_service if markov_service else MarkovChainService()
+        self.cache_size = cache_size
+
+        # LRU caches: quantized modifiers -> solved tables (read-only, shared across threads)
+        self.run_dist_cache = OrderedDict()   # (pitcher_mod, ttto, defense_mod) -> (24, R+1)
+        self.value_cache = OrderedDict()      # (home_bullpen_mod, away_bullpen_mod) -> value tables
+        self._cache_lock = threading.Lock()
+
+        # Gather indices for the run-differential convolutions
+        n_diffs = 2 * self.MAX_RUN_DIFF + 1
+        diffs = np.arange(n_diffs)
+        runs = np.arange(self.MAX_RUNS + 1)
+        self._away_scores_idx = np.clip(diffs[:, None] - runs[None, :], 0, n_diffs - 1)
+        self._home_scores_idx = np.clip(diffs[:, None] + runs[None, :], 0, n_diffs - 1)
+
+    def get_win_prob(self, inning, outs, runners, score_diff, is_top_inning,
+                     pitcher_mod=1.0, defense_mod=1.0, home_bullpen_mod=1.0, away_bullpen_mod=1.0):
+        """
+        Returns the exact Home Win Probability.
+
+        Args:
+            inning, outs, runners, score_diff, is_top_inning: Current game state
+                (same convention as MarkovChainService.get_instant_win_prob).
+            pitcher_mod, defense_mod: Applied to the rest of the current half-inning.
+            home_bullpen_mod, away_bullpen_mod: Applied to future half-innings from
+                the LATE_INNING on (home pitches the top, away pitches the bottom).
+        """
+        state_idx = self.markov._get_state_index(outs, runners[0], runners[1], runners[2])
+        values = self.get_value_tables(home_bullpen_mod, away_bullpen_mod)
+
+        # 1. Rest of current half-inning
+        if state_idx >= 24:
+            current_dist = np.zeros(self.MAX_RUNS + 1)
+            current_dist[0] = 1.0
+        else:
+            current_dist = self.get_run_distribution(pitcher_mod, 0, defense_mod)[state_idx]
+
+        inning = min(max(int(inning), 1), self.REGULATION_INNINGS + 1) # Row 10 = every extra inning
+        d = int(np.clip(score_diff, -self.MAX_RUN_DIFF, self.MAX_RUN_DIFF)) + self.MAX_RUN_DIFF
+
+        # 2. Roll forward into the next half-inning's value table
+        if is_top_inning:
+            return float(values['bot'][inning][self._away_scores_idx[d]] @ current_dist)
+
+        if inning < self.REGULATION_INNINGS:
+            return float(values['top'][inning + 1][self._home_scores_idx[d]] @ current_dist)
+
+        # Bottom 9th+: walk-off logic
+        return float(self._walkoff_values(current_dist, values['extra_tie'])[d])
+
+    def get_run_distribution(self, pitcher_mod=1.0, ttto=0, defense_mod=1.0):
+        """
+        Returns D[s, k] = P(k more runs score this half-inning | base/out state s).
+        Last column holds P(>= MAX_RUNS).
+        """
+        key = self.markov._cache_key(pitcher_mod, ttto, defense_mod)
+
+        dist = self._cache_get(self.run_dist_cache, key)
+        if dist is not None:
+            return dist
+
+        dist = self._solve_run_distribution(*key)
+        dist.flags.writeable = False
+        return self._cache_put(self.run_dist_cache, key, dist)
+
+    def get_value_tables(self, home_bullpen_mod=1.0, away_bullpen_mod=1.0):
+        """
+        Returns the per-modifier win value tables:
+            'top'[i][d]: P(home wins) at the start of the top of inning i (d = run diff index)
+            'bot'[i][d]: same for the bottom of inning i
+            'extra_tie': P(home wins) at the start of a tied extra inning
+        Inning 10 rows cover every extra inning (runner on second).
+        """
+        key = (
+            round(float(home_bullpen_mod), self.markov.CACHE_PRECISION),
+            round(float(away_bullpen_mod), self.markov.CACHE_PRECISION)
+        )
+
+        values = self._cache_get(self.value_cache, key)
+        if values is not None:
+            return values
+
+        values = self._solve_value_tables(*key)
+        return self._cache_put(self.value_cache, key, values)
+
+    def _solve_run_distribution(self, pitcher_mod, ttto, defense_mod):
+        markov = self.markov
+        probs = markov._get_event_probabilities(pitcher_mod, ttto, defense_mod)
+        rows = np.arange(24)
+
+        # 1. Split transient transitions by runs scored: P_by_runs[r] is (24, 24)
+        max_event_runs = int(markov.event_runs.max())
+        P_by_runs = np.zeros((max_event_runs + 1, 24, 24))
+        for e in range(len(markov.EVENTS)):
+            np.add.at(P_by_runs, (markov.event_runs[e].astype(int), rows),
+                      probs[e] * markov.event_masks[e, :24, :24])
+
+        # Inning ends only on an out (no runs)
+        exit_probs = probs[0] * markov.event_masks[0, :24, markov.END_STATE_IDX]
+
+        # 2. (I - P0) D[:, k] = sum_r P_r D[:, k - r], one factorization for all k
+        lu_piv = markov._factorize(np.eye(24) - P_by_runs[0])
+
+        dist = np.zeros((24, self.MAX_RUNS + 1))
+        dist[:, 0] = markov._solve_factorized(lu_piv, exit_probs)
+        for k in range(1, self.MAX_RUNS + 1):
+            rhs = np.zeros(24)
+            for r in range(1, min(k, max_event_runs) + 1):
+                rhs += P_by_runs[r] @ dist[:, k - r]
+            dist[:, k] = markov._solve_factorized(lu_piv, rhs)
+
+        # 3. Lump the tail into the last bucket
+        dist[:, -1] += np.maximum(1.0 - dist.sum(axis=1), 0.0)
+        return dist
+
+    def _solve_value_tables(self, home_bullpen_mod, away_bullpen_mod):
+        n_diffs = 2 * self.MAX_RUN_DIFF + 1
+        last = self.REGULATION_INNINGS
+
+        # Half-inning run distributions from a clean inning (bases empty, 0 outs)
+        # and from an extra-inning start (runner on second, 0 outs)
+        base_dist = self.get_run_distribution(1.0)[0]
+        away_dists = self.get_run_distribution(home_bullpen_mod)   # Away bats vs home bullpen
+        home_dists = self.get_run_distribution(away_bullpen_mod)   # Home bats vs away bullpen
+        away_late, away_extra = away_dists[0], away_dists[self.GHOST_RUNNER_STATE]
+        home_late, home_extra = home_dists[0], home_dists[self.GHOST_RUNNER_STATE]
+
+        top = np.zeros((last + 2, n_diffs))
+        bot = np.zeros((last + 2, n_diffs))
+
+        # 1. Extra innings (stationary): X = A / (1 - B)
+        home_gt = 1.0 - np.cumsum(home_extra)   # P(home scores > k)
+        A = away_extra @ home_gt
+        B = away_extra @ home_extra
+        extra_tie = A / (1.0 - B)
+
+        bot[last + 1] = self._walkoff_values(home_extra, extra_tie)
+        top[last + 1] = bot[last + 1][self._away_scores_idx] @ away_extra
+
+        # 2. Inning 9 (walk-off rules, a tie sends the game to extras)
+        bot[last] = self._walkoff_values(home_late, extra_tie)
+        top[last] = bot[last][self._away_scores_idx] @ away_late
+
+        # 3. Backward induction through regulation
+        for inning in range(last - 1, 0, -1):
+            is_late = inning >= self.LATE_INNING
+            bot[inning] = top[inning + 1][self._home_scores_idx] @ (home_late if is_late else base_dist)
+            top[inning] = bot[inning][self._away_scores_idx] @ (away_late if is_late else base_dist)
+
+        top.flags.writeable = False
+        bot.flags.writeable = False
+        return {'top': top, 'bot': bot, 'extra_tie': extra_tie}
+
+    def _walkoff_values(self, home_dist, extra_tie):
+        """
+        Bottom of the 9th or later: home wins as soon as it leads,
+        a tie sends the game to extras, otherwise away wins.
+        """
+        diffs = np.arange(-self.MAX_RUN_DIFF, self.MAX_RUN_DIFF + 1)
+        home_gt = 1.0 - np.cumsum(home_dist)
+
+        deficit = np.clip(-diffs, 0, self.MAX_RUNS)
+        values = home_gt[deficit] + home_dist[deficit] * extra_tie
+        values[diffs > 0] = 1.0
+        values[-diffs > self.MAX_RUNS] = 0.0
+        return values
+
+    def _cache_get(self, cache, key):
+        with self._cache_lock:
+            value = cache.get(key)
+            if value is not None:
+                cache.move_to_end(key)
+            return value
+
+    def _cache_put(self, cache, key, value):
+        """Inserts (solved outside the lock) and returns the winning entry."""
+        with self._cache_lock:
+            value = cache.setdefault(key, value)
+            cache.move_to_end(key)
+            if len(cache) > self.cache_size:
+                cache.popitem(last=False) # Evict least recently used
+            return value
@@ -0,0 +1,133 @@
+import os
+import numpy as np
+
+class WinProbabilityTable:
+    """
+    Precomputed Win Probability tensor for the Tier 1 hot path.
+    Built offline from MarkovChainService, memory-mapped at startup.
+
+    Axes: (inning 1-12, half [top, bot], base/out state 0-23, score_diff -15..+15, pitcher_mod)
+    Modifier axis: slot 0 is the exact baseline (1.0), slots 1.. are the grid
+    1.00+ .. 1.50. The transition model adds a power boost for any mod > 1.0,
+    so the first grid point is its limit from above and interpolation never
+    straddles the jump. Anything outside the grid returns None so the caller
+    can fall back to the direct calculation.
+    """
+
+    DEFAULT_PATH = "data/win_prob_table.npy"
+
+    MAX_INNING = 12         # Innings >= 9 share one formula, so clamping here is exact
+    MAX_SCORE_DIFF = 15
+    MODIFIER_MIN = 1.0
+    MODIFIER_STEP = 0.05
+    MODIFIER_POINTS = 11    # 1.00+ .. 1.50 (PitcherMonitor range)
+    TTTO = 1                # Live path TTTO placeholder
+
+    def __init__(self, table):
+        expected_shape = (self.MAX_INNING, 2, 24, 2 * self.MAX_SCORE_DIFF + 1, self.MODIFIER_POINTS + 1)
+        if table.shape != expected_shape:
+            raise ValueError(f"Win prob table has shape {table.shape}, expected {expected_shape}")
+        self.table = table
+        self.modifier_max = self.MODIFIER_MIN + self.MODIFIER_STEP * (self.MODIFIER_POINTS - 1)
+
+    @classmethod
+    def modifier_grid(cls):
+        return cls.MODIFIER_MIN + cls.MODIFIER_STEP * np.arange(cls.MODIFIER_POINTS)
+
+    @classmethod
+    def build(cls, markov_service):
+        """
+        Evaluates the Markov sigmoid over the full grid in one broadcast pass.
+        """
+        # RE24 vectors for baseline + every grid modifier: (24, M + 1)
+        grid = cls.modifier_grid()
+        grid[0] = np.nextafter(cls.MODIFIER_MIN, np.inf) # Limit from above
+        
+        re24_columns = [markov_service.get_re24_vector(1.0, cls.TTTO, 1.0)]
+        for mod in grid:
+            matrix, r_imm = markov_service._build_transition(mod, cls.TTTO, 1.0)
+            re24_columns.append(markov_service._calculate_re24_vector(matrix, r_imm))
+        re24 = np.stack(re24_columns, axis=1)
+
+        innings = np.arange(1, cls.MAX_INNING + 1)[:, None, None, None, None]
+        is_top = np.array([True, False])[None, :, None, None, None]
+        current_re24 = re24[None, None, :, None, :]
+        score_diffs = np.arange(-cls.MAX_SCORE_DIFF, cls.MAX_SCORE_DIFF + 1)[None, None, None, :, None]
+
+        table = markov_service._sigmoid_win_prob(current_re24, innings, score_diffs, is_top)
+        return cls(table.astype(np.float32))
+
+    @classmethod
+    def load(cls, path=DEFAULT_PATH):
+        """Memory-maps a table written by save()."""
+        return cls(np.load(path, mmap_mode='r'))
+
+    @classmethod
+    def load_or_build(cls, markov_service, path=DEFAULT_PATH):
+        """Loads the offline table if present, otherwise builds it in memory."""
+        if path and os.path.exists(path):
+            return cls.load(path)
+        print(f"[WinProbabilityTable] {path} not found. Building in memory.")
+        return cls.build(markov_service)
+
+    def save(self, path=DEFAULT_PATH):
+        directory = os.path.dirname(path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+        np.save(path, np.ascontiguousarray(self.table))
+
+    def lookup(self, inning, is_top_inning, state_idx, score_diff, pitcher_mod):
+        """
+        O(1) Home Win Probability. Returns None if the state is off-grid.
+        """
+        if state_idx >= 24 or abs(score_diff) > self.MAX_SCORE_DIFF:
+            return None
+        if not (self.MODIFIER_MIN <= pitcher_mod <= self.modifier_max):
+            return None
+
+        inning_idx = min(max(int(inning), 1), self.MAX_INNING) - 1
+        half_idx = 0 if is_top_inning else 1
+        diff_idx = int(score_diff) + self.MAX_SCORE_DIFF
+
+        row = self.table[inning_idx, half_idx, state_idx, diff_idx]
+        if pitcher_mod == self.MODIFIER_MIN:
+            return float(row[0])
+
+        # Linear interpolation on the modifier axis (grid starts at slot 1)
+        pos = (pitcher_mod - self.MODIFIER_MIN) / self.MODIFIER_STEP
+        lo = min(int(pos), self.MODIFIER_POINTS - 2)
+        w = pos - lo
+        return float(row[lo + 1] * (1.0 - w) + row[lo + 2] * w)
+
+    def lookup_batch(self, innings, is_top_innings, state_idxs, score_diffs, pitcher_mods):
+        """
+        Vectorized lookup. Returns (probs, valid_mask); probs is NaN where off-grid.
+        """
+        innings = np.asarray(innings)
+        state_idxs = np.asarray(state_idxs)
+        score_diffs = np.asarray(score_diffs)
+        pitcher_mods = np.asarray(pitcher_mods, dtype=float)
+
+        valid = (
+            (state_idxs < 24) &
+            (np.abs(score_diffs) <= self.MAX_SCORE_DIFF) &
+            (pitcher_mods >= self.MODIFIER_MIN) &
+            (pitcher_mods <= self.modifier_max)
+        )
+
+        inning_idx = np.clip(innings, 1, self.MAX_INNING) - 1
+        half_idx = np.where(is_top_innings, 0, 1)
+        state_idx = np.where(valid, state_idxs, 0)
+        diff_idx = np.clip(score_diffs, -self.MAX_SCORE_DIFF, self.MAX_SCORE_DIFF) + self.MAX_SCORE_DIFF
+
+        # Grid slots 1..M, interpolated; exact baseline uses slot 0
+        pos = np.clip((pitcher_mods - self.MODIFIER_MIN) / self.MODIFIER_STEP, 0, self.MODIFIER_POINTS - 1)
+        lo = np.minimum(pos.astype(int), self.MODIFIER_POINTS - 2)
+        w = pos - lo
+
+        p_lo = self.table[inning_idx, half_idx, state_idx, diff_idx, lo + 1]
+        p_hi = self.table[inning_idx, half_idx, state_idx, diff_idx, lo + 2]
+        p_base = self.table[inning_idx, half_idx, state_idx, diff_idx, 0]
+        probs = np.where(pitcher_mods == self.MODIFIER_MIN, p_base, p_lo * (1.0 - w) + p_hi * w)
+
+        return np.where(valid, probs, np.nan), valid
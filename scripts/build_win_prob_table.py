@@ -0,0 +1,26 @@
+import sys
+import os
+import time
+
+# Ensure app modules are in path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.markov_chain_service import MarkovChainService
+from app.services.win_prob_table import WinProbabilityTable
+from app.services.transition_ingestor import TransitionStore
+
+def build_table(path=WinProbabilityTable.DEFAULT_PATH):
+    print("=== Building Win Probability Lookup Table ===")
+    
+    start_time = time.time()
+    # Same event rates as the live engine (empirical if ingested)
+    markov_service = MarkovChainService(transition_store=TransitionStore.load_or_none())
+    table = WinProbabilityTable.build(markov_service)
+    table.save(path)
+    
+    print(f"Shape: {table.table.shape} ({table.table.nbytes / 1024:.0f} KB)")
+    print(f"Saved to {path} in {time.time() - start_time:.3f}s")
+    print("Enable in the live engine with MARKOV_LOOKUP_TABLE=1")
+
+if __name__ == "__main__":
+    build_table(sys.argv[1] if len(sys.argv) > 1 else WinProbabilityTable.DEFAULT_PATH)
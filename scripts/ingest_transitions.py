@@ -0,0 +1,47 @@
+import sys
+import os
+import time
+import statsapi
+
+# Ensure app modules are in path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.database_manager import DatabaseManager
+from app.services.transition_ingestor import TransitionIngestor, TransitionStore
+
+def ingest_transitions(season, path=TransitionStore.DEFAULT_PATH):
+    print(f"=== Ingesting {season} Play-by-Play Transitions ===")
+    
+    # 1. Completed regular season games
+    schedule = statsapi.schedule(start_date=f"{season}-03-01", end_date=f"{season}-11-15")
+    game_pks = [
+        g['game_id'] for g in schedule
+        if g.get('game_type') == 'R' and g.get('status') == 'Final'
+    ]
+    print(f"Found {len(game_pks)} final games.")
+    
+    # 2. Extend an existing store (other seasons) if present
+    store = None
+    if os.path.exists(path):
+        loaded = TransitionStore.load(path)
+        if f"{season}/all" in loaded.key_to_idx:
+            print(f"{season} already ingested in {path}. Skipping.")
+            return
+        store = TransitionStore(
+            loaded.keys, loaded.transitions.copy(), loaded.runs.copy(), loaded.events.copy()
+        )
+    
+    # 3. Single streaming pass
+    start_time = time.time()
+    ingestor = TransitionIngestor(DatabaseManager(), store=store)
+    store = ingestor.ingest_season(game_pks, season)
+    store.save(path)
+    
+    print(f"Ingested {ingestor.games_ingested} games into {len(store.keys)} groups in {time.time() - start_time:.1f}s")
+    rates = store.get_event_rates(f"{season}/all")
+    if rates:
+        print("League event rates: " + ", ".join(f"{k}={v:.3f}" for k, v in rates.items()))
+    print(f"Saved to {path}")
+
+if __name__ == "__main__":
+    ingest_transitions(int(sys.argv[1]) if len(sys.argv) > 1 else 2025)
@@ -10,7 +10,7 @@ from app.services.monte_carlo_simulator import MonteCarloSimulator
 def verify_deep_layer():
     print("=== Deep Layer Verification: Roster-Aware Fatigue Model ===")
     
-    sim = MonteCarloSimulator()
+    sim = MonteCarloSimulator(rng=7) # Seeded so reruns print the same numbers
     
     # Scenario: Tie game, Bottom 8th. Home Betting.
     # Current State: 0 Outs, Empty Bases
@@ -18,36 +18,26 @@ def verify_deep_layer():
     print("Scenario: Bottom 8th, Tie Game (3-3). Home Batting.")
     print("Testing impact of AWAY Bullpen Fatigue on Home Win Probability.\n")
     
-    # Run Baseline (Fresh Bullpen)
+    # Paired A/B: both bullpens on the same random draws (common random numbers)
     start_time = time.time()
-    prob_fresh = sim.simulate_game_vectorized(
+    result = sim.simulate_paired(
         initial_state_idx=0,
         home_score=3,
         away_score=3,
         inning=8,
         is_top=False, # Bot 8th
-        home_bullpen_mod=1.0,
-        away_bullpen_mod=1.0, # Fresh
+        mods_a=(1.0, 1.0),  # Fresh
+        mods_b=(1.0, 1.25), # Dead (25% degradation)
         iterations=20000
     )
-    print(f"Test A (Fresh Bullpen): Win Prob {prob_fresh:.2%} (Time: {time.time()-start_time:.3f}s)")
+    prob_fresh = result['prob_a']
+    prob_dead = result['prob_b']
+    print(f"Test A (Fresh Bullpen): Win Prob {prob_fresh:.2%}")
+    print(f"Test B (Dead Bullpen):  Win Prob {prob_dead:.2%}")
+    print(f"(Paired run, {result['iterations']} iterations: {time.time()-start_time:.3f}s)")
     
-    # Run Fatigued (Dead Bullpen)
-    start_time = time.time()
-    prob_dead = sim.simulate_game_vectorized(
-        initial_state_idx=0,
-        home_score=3,
-        away_score=3,
-        inning=8,
-        is_top=False, # Bot 8th
-        home_bullpen_mod=1.0,
-        away_bullpen_mod=1.25, # Dead (25% degradation)
-        iterations=20000
-    )
-    print(f"Test B (Dead Bullpen):  Win Prob {prob_dead:.2%} (Time: {time.time()-start_time:.3f}s)")
-    
-    delta = prob_dead - prob_fresh
-    print(f"\nDelta: {delta:+.2%}")
+    delta = result['diff']
+    print(f"\nDelta: {delta:+.2%} (± {1.96 * result['std_error']:.2%} at 95%)")
     
     if delta > 0.03: # Expect Home WinProb to RISE if Away Pitching is bad
         print("✅ SUCCESS: Win Probability increased significantly against a fatigued bullpen.")
@@ -0,0 +1,27 @@
+"""Shared league and schedule fixtures for the season simulation tests."""
+
+def make_league_fixture(games_per_pair=1):
+    """30 teams (2 leagues x 3 divisions x 5) and a round-robin schedule within each league."""
+    teams = {}
+    for league_idx, league_id in enumerate((103, 104)):
+        for div in range(3):
+            for slot in range(5):
+                team_id = 100 + league_idx * 15 + div * 5 + slot
+                teams[team_id] = {
+                    'id': team_id,
+                    'name': f"Team {team_id}",
+                    'league_id': league_id,
+                    'division_id': league_id * 10 + div,
+                    'w': 70 + slot * 2,
+                    'l': 70 - slot * 2,
+                    'win_percentage': 0.40 + slot * 0.05,
+                }
+
+    ids = sorted(teams)
+    schedule = []
+    for _ in range(games_per_pair):
+        for i, home_id in enumerate(ids):
+            for away_id in ids[i + 1:]:
+                if teams[home_id]['league_id'] == teams[away_id]['league_id']:
+                    schedule.append({'game_id': len(schedule) + 1, 'home_id': home_id, 'away_id': away_id})
+    return teams, schedule
@@ -0,0 +1,86 @@
+import os
+import tempfile
+import unittest
+from datetime import datetime
+from unittest.mock import patch
+import numpy as np
+from app.services.database_manager import DatabaseManager
+
+class CountingDatabaseManager(DatabaseManager):
+    """Counts connections (round trips to the database)."""
+    def get_connection(self):
+        self.connections = getattr(self, 'connections', 0) + 1
+        return super().get_connection()
+
+class TestBulkStatsLoaders(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.tmp.name, "test.db")
+        with patch.dict(os.environ):
+            os.environ.pop("DATABASE_URL", None)
+            self.db = CountingDatabaseManager(self.db_path)
+        
+        self.db.save_advanced_team_stats([
+            {'Team': 'NYY', 'Runs': 800, 'RunsAgainst': 650},
+            {'Team': 'BOS', 'Runs': 700, 'RunsAgainst': 720},
+        ], 2025, id_mapper={'NYY': '147', 'BOS': '111'})
+        self.db.save_pitcher_stats([
+            {'PlayerID': 1, 'Name': 'Ace', 'Team': 'NYY', 'PositionCategory': 'Pitcher', 'InningsPitched': 180,
+             'HomeRunsAllowed': 15, 'Walks': 40, 'HitByPitch': 5, 'Strikeouts': 200, 'EarnedRunAverage': 2.9},
+            {'PlayerID': 2, 'Name': 'Closer', 'Team': 'BOS', 'PositionCategory': 'Pitcher', 'InningsPitched': 60,
+             'HomeRunsAllowed': 6, 'Walks': 20, 'HitByPitch': 1, 'Strikeouts': 70, 'EarnedRunAverage': 3.5},
+            {'PlayerID': 3, 'Name': 'Hitter', 'PositionCategory': 'Infield', 'InningsPitched': 0},
+        ], 2025)
+        self.db.connections = 0
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_bulk_team_and_pitcher_reads(self):
+        """All rows in one connection, as dicts or column arrays."""
+        teams = self.db.get_all_team_stats()
+        self.assertEqual(set(teams), {'147', '111'})
+        self.assertGreater(teams['147']['pythagorean_win_pct'], 0.5)
+        self.assertEqual(self.db.connections, 1)
+        
+        pitchers = self.db.get_pitcher_stats(2025)
+        self.assertEqual(set(pitchers), {1, 2})
+        self.assertEqual(self.db.get_pitcher_stats(2024), {})
+        
+        arrays = self.db.get_pitcher_stats(2025, as_arrays=True)
+        self.assertEqual(arrays['fip'].dtype, np.float64)
+        np.testing.assert_allclose(sorted(arrays['era']), [2.9, 3.5])
+
+    def test_cache_reused_until_another_writer_saves(self):
+        """Repeat reads skip the DB; a save from another writer (same second) refreshes."""
+        first = self.db.get_advanced_team_stats(147)
+        for team_key in ('147', '111', 999):
+            self.db.get_advanced_team_stats(team_key)
+        self.assertEqual(self.db.connections, 1)
+        
+        # Another process rewrites a row; updated_at cannot tell the two saves apart
+        with patch.dict(os.environ):
+            os.environ.pop("DATABASE_URL", None)
+            other = DatabaseManager(self.db_path)
+        with patch('app.services.database_manager.datetime') as clock:
+            clock.now.return_value = datetime(2025, 6, 1, 12, 0, 0)
+            self.db.save_advanced_team_stats([{'Team': 'NYY', 'Runs': 800, 'RunsAgainst': 650}], 2025, id_mapper={'NYY': '147'})
+            self.db.get_advanced_team_stats(147)
+            other.save_advanced_team_stats([{'Team': 'NYY', 'Runs': 900, 'RunsAgainst': 600}], 2025, id_mapper={'NYY': '147'})
+        
+        self.assertEqual(self.db.get_advanced_team_stats(147), first) # Within the TTL
+        self.db.STATS_CACHE_TTL = 0
+        refreshed = other.get_advanced_team_stats(147)
+        self.assertGreater(refreshed, first)
+        self.assertEqual(self.db.get_advanced_team_stats(147), refreshed)
+        self.assertEqual(self.db.get_all_pythagorean_win_pcts()['147'], refreshed)
+
+    def test_local_writes_invalidate_cache(self):
+        self.db.get_pitcher_stats(2025)
+        self.db.save_pitcher_stats([
+            {'PlayerID': 4, 'Name': 'Rookie', 'Team': 'NYY', 'PositionCategory': 'Pitcher', 'InningsPitched': 10},
+        ], 2025)
+        self.assertIn(4, self.db.get_pitcher_stats(2025))
+
+if __name__ == '__main__':
+    unittest.main()
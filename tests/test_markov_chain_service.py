@@ -1,5 +1,6 @@
 import unittest
 import numpy as np
+from concurrent.futures import ThreadPoolExecutor
 from app.services.markov_chain_service import MarkovChainService
 
 class TestMarkovChainService(unittest.TestCase):
@@ -127,5 +128,138 @@ class TestMarkovChainService(unittest.TestCase):
         print(f"Away Pitching: Base={prob_base:.4f}, Fatigued={prob_fatigued:.4f}")
         self.assertGreater(prob_fatigued, prob_base, "Home Win Prob should rise if Away Pitcher is fatigued")
 
+    def test_re24_cache_hits_and_misses(self):
+        """Repeated lookups with the same modifiers should be served from the cache."""
+        self.service.get_instant_win_prob(7, 1, [1, 0, 0], 0, True, pitcher_mod=1.15)
+        self.service.get_instant_win_prob(8, 2, [0, 1, 0], 1, False, pitcher_mod=1.15)
+        self.service.get_instant_win_prob(9, 0, [0, 0, 0], -1, True, pitcher_mod=1.25)
+        
+        stats = self.service.get_cache_stats()
+        self.assertEqual(stats['misses'], 2)
+        self.assertEqual(stats['hits'], 1)
+        self.assertEqual(stats['size'], 2)
+
+    def test_re24_cache_quantizes_modifiers(self):
+        """Modifiers that round to the same key share one cache entry."""
+        vec_a = self.service.get_re24_vector(pitcher_mod=1.1500001)
+        vec_b = self.service.get_re24_vector(pitcher_mod=1.15)
+        
+        self.assertIs(vec_a, vec_b)
+        self.assertEqual(self.service.get_cache_stats()['size'], 1)
+
+    def test_re24_cache_matches_direct_solve(self):
+        """Cached vector must equal a fresh matrix build + solve."""
+        cached = self.service.get_re24_vector(pitcher_mod=1.2, ttto=2, defense_mod=1.1)
+        matrix, r_imm = self.service._build_transition(1.2, 2, 1.1)
+        direct = self.service._calculate_re24_vector(matrix, r_imm)
+        
+        np.testing.assert_allclose(cached, direct)
+
+    def test_re24_cache_lru_eviction(self):
+        """Least recently used entry is evicted once the cache is full."""
+        service = MarkovChainService(cache_size=2)
+        service.get_re24_vector(pitcher_mod=1.0)
+        service.get_re24_vector(pitcher_mod=1.1)
+        service.get_re24_vector(pitcher_mod=1.0) # Refresh 1.0
+        service.get_re24_vector(pitcher_mod=1.2) # Evicts 1.1
+        
+        self.assertEqual(len(service.transition_cache), 2)
+        self.assertIn((1.0, 0, 1.0), service.transition_cache)
+        self.assertNotIn((1.1, 0, 1.0), service.transition_cache)
+
+    def test_batch_matches_scalar(self):
+        """Batched slate scoring must agree with per-game scalar calls."""
+        games = [
+            # inning, outs, runners, score_diff, is_top, pitcher_mod, defense_mod
+            (1, 0, [0, 0, 0], 0, True, 1.0, 1.0),
+            (5, 1, [1, 0, 1], -3, False, 1.15, 1.0),
+            (8, 2, [0, 1, 0], 2, True, 1.25, 1.1),
+            (9, 0, [1, 1, 1], 0, False, 1.15, 1.0),
+            (12, 1, [1, 1, 0], -1, True, 1.0, 1.0),
+            (3, 3, [0, 0, 0], 20, False, 1.4, 1.0),
+        ]
+        expected = [
+            self.service.get_instant_win_prob(inn, o, r, d, top, pitcher_mod=pm, defense_mod=dm)
+            for inn, o, r, d, top, pm, dm in games
+        ]
+        
+        for service in [self.service, MarkovChainService(use_lookup_table=True, table_path=None)]:
+            probs = service.get_instant_win_prob_batch(
+                innings=[g[0] for g in games],
+                outs=[g[1] for g in games],
+                runner_masks=[g[2][0] + 2 * g[2][1] + 4 * g[2][2] for g in games],
+                score_diffs=[g[3] for g in games],
+                is_top_innings=[g[4] for g in games],
+                pitcher_mods=[g[5] for g in games],
+                defense_mods=[g[6] for g in games]
+            )
+            self.assertEqual(probs.shape, (len(games),))
+            np.testing.assert_allclose(probs, expected, atol=1e-5)
+
+    def test_batch_solves_once_per_modifier(self):
+        """A slate with repeated modifiers only solves each distinct combo once."""
+        self.service.get_instant_win_prob_batch(
+            innings=[7, 8, 9, 6], outs=[0, 1, 2, 0], runner_masks=[0, 1, 7, 2],
+            score_diffs=[0, 1, -1, 2], is_top_innings=[True, False, True, False],
+            pitcher_mods=[1.0, 1.15, 1.0, 1.15]
+        )
+        self.assertEqual(self.service.get_cache_stats()['misses'], 2)
+
+    def test_batched_solve_matches_single(self):
+        """Stacked (k, 24, 24) solve must match per-variant solves."""
+        pitcher_mods = [0.9, 1.0, 1.15, 1.25]
+        defense_mods = [1.0, 1.1, 1.0, 1.3]
+        batch = self.service.solve_re24_batch(pitcher_mods, ttto=2, defense_mods=defense_mods)
+        
+        self.assertEqual(batch.shape, (4, 24))
+        for row, pm, dm in zip(batch, pitcher_mods, defense_mods):
+            matrix, r_imm = self.service._build_transition(pm, 2, dm)
+            np.testing.assert_allclose(row, self.service._calculate_re24_vector(matrix, r_imm))
+
+    def test_factorized_solve_matches_inverse(self):
+        """LU solve must agree with the explicit inverse it replaced."""
+        matrix, r_imm = self.service._build_transition(1.15, 2)
+        re24 = self.service._calculate_re24_vector(matrix, r_imm)
+        
+        N = np.linalg.inv(np.eye(24) - matrix[:24, :24])
+        np.testing.assert_allclose(re24, N @ r_imm)
+
+    def test_singular_variants_solve_to_zeros(self):
+        """A singular system gives zeros in both paths instead of raising in the batch."""
+        A = np.stack([np.eye(24), np.zeros((24, 24))])
+        R_imm = np.ones((2, 24))
+        re24 = self.service._solve_re24_systems(A, R_imm)
+        np.testing.assert_array_equal(re24, [np.ones(24), np.zeros(24)])
+        
+        matrix, r_imm = self.service._build_transition(1.0, 0)
+        matrix[:24, :24] = np.eye(24) # Every state loops on itself
+        np.testing.assert_array_equal(self.service._calculate_re24_vector(matrix, r_imm), np.zeros(24))
+
+    def test_shared_instance_is_thread_safe(self):
+        """One service scoring many games from a thread pool matches serial results."""
+        games = [
+            (inning, outs, [outs % 2, 1, 0], diff, inning % 2 == 0, 1.0 + 0.01 * k)
+            for k, (inning, outs, diff) in enumerate(
+                (i, o, d) for i in range(1, 10) for o in range(3) for d in (-2, 0, 2)
+            )
+        ]
+        serial = MarkovChainService(cache_size=8)
+        expected = [serial.get_instant_win_prob(*g[:5], pitcher_mod=g[5]) for g in games]
+        
+        shared = MarkovChainService(cache_size=8) # Small cache forces concurrent evictions
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            actual = list(pool.map(lambda g: shared.get_instant_win_prob(*g[:5], pitcher_mod=g[5]), games * 4))
+        
+        np.testing.assert_allclose(actual, expected * 4)
+        stats = shared.get_cache_stats()
+        self.assertEqual(stats['hits'] + stats['misses'], len(games) * 4)
+        self.assertLessEqual(stats['size'], 8)
+
+    def test_build_transition_is_stateless(self):
+        """Building a matrix must not leave per-call state on the instance."""
+        before = set(vars(self.service))
+        self.service._build_transition(1.25, 3, 1.1)
+        self.assertEqual(set(vars(self.service)), before)
+
 if __name__ == '__main__':
     unittest.main()
@@ -76,5 +76,43 @@ class TestMarkovIntegration(unittest.TestCase):
         self.assertEqual(kwargs['pitcher_mod'], 1.25)
         self.assertEqual(kwargs['inning'], 9)
 
+    @patch('app.services.latency_monitor.datetime')
+    def test_dashboard_scores_slate_in_one_batch(self, mock_datetime):
+        """All live games are scored with a single batched Markov call."""
+        self.mock_api.get_schedule.return_value = [
+            {'game_id': 1, 'status': 'I'},
+            {'game_id': 2, 'status': 'F'},
+            {'game_id': 3, 'status': 'I'},
+        ]
+        self.mock_api.get_live_game_data.return_value = {
+            'metaData': {'timeStamp': "2023-10-27T12:00:00Z"},
+            'gameData': {'teams': {'home': {'id': 1, 'name': 'H'}, 'away': {'id': 2, 'name': 'A'}}},
+            'liveData': {'linescore': {
+                'currentInning': 7,
+                'isTopInning': False,
+                'outs': 1,
+                'teams': {'home': {'runs': 2}, 'away': {'runs': 3}},
+                'offense': {'first': {}, 'third': {}},
+                'defense': {'pitcher': {'id': 42, 'fullName': 'Reliever'}}
+            }}
+        }
+        for game_id in (1, 3):
+            monitor = MagicMock()
+            monitor.get_performance_modifier.return_value = 1.15
+            self.service.monitors[game_id] = {'home': MagicMock(), 'away': monitor}
+        self.service.markov_service.get_instant_win_prob_batch.return_value = [0.41, 0.42]
+        
+        games = self.service.get_live_dashboard_data()
+        
+        self.service.markov_service.get_instant_win_prob.assert_not_called()
+        self.service.markov_service.get_instant_win_prob_batch.assert_called_once()
+        kwargs = self.service.markov_service.get_instant_win_prob_batch.call_args.kwargs
+        self.assertEqual(kwargs['runner_masks'], [5, 5])
+        self.assertEqual(kwargs['score_diffs'], [-1, -1])
+        self.assertEqual(kwargs['pitcher_mods'], [1.15, 1.15])
+        
+        self.assertEqual([g['game_id'] for g in games], [1, 3])
+        self.assertEqual([g['model_prob'] for g in games], [41.0, 42.0])
+
 if __name__ == '__main__':
     unittest.main()
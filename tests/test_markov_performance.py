@@ -10,29 +10,36 @@ class TestMarkovPerformance(unittest.TestCase):
     def test_matrix_generation_speed(self):
         """Benchmark matrix generation and solving."""
         # Warmup
-        self.service._get_transition_matrix(1.0, 0)
+        self.service._calculate_re24_vector(*self.service._build_transition(1.0, 0))
         
         start = time.perf_counter()
         
         # 1. Generate Matrix
-        matrix = self.service._get_transition_matrix(1.15, 2)
+        matrix, r_imm = self.service._build_transition(1.15, 2)
         
-        # 2. Mock Solver (Invert 24x24)
-        # Extract Q (first 24x24)
-        Q = matrix[:24, :24]
-        I = np.eye(24)
-        try:
-            N = np.linalg.inv(I - Q)
-        except np.linalg.LinAlgError:
-            # Singularity possible if probability mass leaks or I-Q is singular (shouldn't be for absorbing chain)
-            pass
+        # 2. Solver (LU factorize + solve, no explicit inverse)
+        re24 = self.service._calculate_re24_vector(matrix, r_imm)
             
         end = time.perf_counter()
         duration_ms = (end - start) * 1000
         
-        print(f"\nMatrix + Inversion Time: {duration_ms:.4f} ms")
+        print(f"\nMatrix + Solve Time: {duration_ms:.4f} ms")
+        self.assertEqual(re24.shape, (24,))
         self.assertLess(duration_ms, 1.0, "Markov calculation must be < 1ms")
 
+    def test_batched_solve_speed(self):
+        """A 100-variant modifier sweep should solve in one batched call."""
+        pitcher_mods = np.linspace(0.9, 1.5, 100)
+        self.service.solve_re24_batch(pitcher_mods[:2]) # Warmup
+        
+        start = time.perf_counter()
+        re24 = self.service.solve_re24_batch(pitcher_mods, ttto=1)
+        duration_ms = (time.perf_counter() - start) * 1000
+        
+        print(f"\nBatched Solve (100 variants): {duration_ms:.4f} ms")
+        self.assertEqual(re24.shape, (100, 24))
+        self.assertLess(duration_ms, 10.0, "Batched sweep must be < 10ms")
+
 if __name__ == '__main__':
     unittest.main()
 
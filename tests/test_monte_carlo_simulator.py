@@ -0,0 +1,268 @@
+import threading
+import unittest
+from unittest.mock import patch
+import numpy as np
+from app.services.monte_carlo_simulator import MonteCarloSimulator
+from app.services.win_expectancy_engine import WinExpectancyEngine
+
+class TestMonteCarloSimulator(unittest.TestCase):
+    def setUp(self):
+        self.sim = MonteCarloSimulator(rng=0)
+
+    def test_alias_tables_reproduce_matrices(self):
+        """Each alias row encodes exactly the transition row it was built from."""
+        matrices = self.sim.transition_matrices.reshape(-1, 25)
+        n_rows, n_cols = matrices.shape
+
+        # P(j) = (prob[j] + sum of (1 - prob[k]) over columns k aliased to j) / n
+        implied = self.sim.alias_prob.copy()
+        rows = np.repeat(np.arange(n_rows), n_cols)
+        np.add.at(implied, (rows, self.sim.alias_idx.ravel()), (1.0 - self.sim.alias_prob).ravel())
+
+        np.testing.assert_allclose(implied / n_cols, matrices, atol=1e-12)
+
+    def test_sampled_frequencies_match_matrix(self):
+        """Alias draws from one state follow that state's transition row."""
+        rng = np.random.default_rng(7)
+        n = 200000
+        state_idx = self.sim.state_engine.get_current_state_index(1, 1, 0, 0)
+
+        rows = np.full(n, state_idx + 25 * self.sim.get_table_index(1.25)) # Fatigued table
+        samples = self.sim._sample_next_states(rows, rng.random(n))
+
+        freq = np.bincount(samples, minlength=25) / n
+        np.testing.assert_allclose(freq, self.sim.transition_matrix_fatigued[state_idx], atol=0.005)
+
+    def test_modifier_bank_is_continuous(self):
+        """A 'Tired' 1.15 bullpen lands between fresh and dead instead of snapping to dead."""
+        args = (0, 3, 3, 8, False)
+        tired = self.sim.simulate_paired(*args, (1.0, 1.0), (1.0, 1.15), iterations=20000)
+        dead = self.sim.simulate_paired(*args, (1.0, 1.0), (1.0, 1.25), iterations=20000)
+        
+        self.assertGreater(tired['diff'], 0.05)
+        self.assertLess(tired['diff'], dead['diff'] - 0.02)
+        
+        out_probs = self.sim.table_out_probs
+        self.assertTrue(np.all(np.diff(out_probs) < 0)) # More fatigue, fewer outs
+
+    def test_table_schedule(self):
+        """Scalars apply from the late innings; sequences set each inning and carry forward."""
+        base = self.sim.baseline_table
+        late = self.sim._table_schedule(1.25)
+        self.assertTrue(np.all(late[:MonteCarloSimulator.LATE_INNING] == base))
+        self.assertTrue(np.all(late[MonteCarloSimulator.LATE_INNING:] == self.sim.get_table_index(1.25)))
+        
+        per_inning = self.sim._table_schedule([1.0, 1.0, 1.1, 1.2])
+        np.testing.assert_array_equal(per_inning[1:5], self.sim.get_table_index([1.0, 1.0, 1.1, 1.2]))
+        self.assertTrue(np.all(per_inning[5:] == self.sim.get_table_index(1.2)))
+        
+        # Off-grid modifiers clamp to the bank edges
+        self.assertEqual(self.sim.get_table_index(3.0), MonteCarloSimulator.MODIFIER_GRID_POINTS - 1)
+        self.assertEqual(self.sim.get_table_index(0.1), 0)
+
+    def test_finished_game_states(self):
+        """Home leading after the top of the 9th has already won."""
+        prob = self.sim.simulate_game_vectorized(24, 5, 3, 9, True, iterations=1000)
+        self.assertEqual(prob, 1.0)
+
+    def test_away_lead_in_extras_is_not_final_mid_inning(self):
+        """An away homer in the top of the 10th leaves the home team its bottom half."""
+        # Bases empty after the homer, away up one: home still bats with a runner on second
+        prob = self.sim.simulate_game_vectorized(0, 3, 4, 10, True, iterations=40000)
+        self.assertGreater(prob, 0.25)
+
+    def test_ghost_runner_extras_match_exact_engine(self):
+        """Tied extras with the runner on second line up with the exact engine."""
+        engine = WinExpectancyEngine()
+        ghost_state = MonteCarloSimulator.GHOST_RUNNER_STATE
+        
+        self.assertAlmostEqual(self.sim.get_extra_inning_value(self.sim.baseline_table, self.sim.baseline_table), 0.5)
+        
+        sampled = self.sim.simulate_game_vectorized(ghost_state, 3, 3, 10, True, iterations=100000)
+        self.assertAlmostEqual(sampled, engine.get_win_prob(10, 0, [0, 1, 0], 0, True), delta=0.01)
+        
+        # Trailing by one in the bottom of the 11th, one out, runner on second
+        state_idx = self.sim.state_engine.get_current_state_index(1, 0, 1, 0)
+        sampled = self.sim.simulate_game_vectorized(state_idx, 3, 4, 11, False, iterations=100000)
+        self.assertAlmostEqual(sampled, engine.get_win_prob(11, 1, [0, 1, 0], -1, False), delta=0.01)
+
+    def test_extra_inning_cap_is_analytic(self):
+        """Capping extras credits ties with the closed-form value instead of playing them out."""
+        full = self.sim.simulate_game_vectorized(0, 2, 2, 9, False, iterations=100000)
+        capped = self.sim.simulate_game_vectorized(0, 2, 2, 9, False, iterations=100000, max_extra_innings=0)
+        self.assertAlmostEqual(full, capped, delta=0.01)
+        
+        # Fatigued home bullpen in extras favours the away team
+        home_slot = self.sim.get_table_index(1.25)
+        self.assertLess(self.sim.get_extra_inning_value(home_slot, self.sim.baseline_table), 0.5)
+
+    def test_scratch_buffers_reused(self):
+        """Buffers grow once and are reused by smaller runs with compact dtypes."""
+        self.sim.simulate_game_vectorized(0, 0, 0, 8, True, iterations=5000)
+        buf = self.sim._get_scratch(1)
+        
+        self.sim.simulate_game_vectorized(0, 0, 0, 8, True, iterations=1000)
+        self.assertIs(self.sim._get_scratch(1000), buf)
+        self.assertEqual(buf['states'].dtype, np.int8)
+        self.assertEqual(buf['runs_home'].dtype, np.int16)
+
+    def test_retire_finished_compacts_active_set(self):
+        """Finished rows are recorded and the survivors stay packed at the front."""
+        n = 6
+        buf = self.sim._get_scratch(n)
+        buf['sim_ids'][:n] = np.arange(n)
+        buf['runs_home'][:n] = np.arange(n) * 10
+        buf['runs_away'][:n] = 0
+        
+        over_mask = np.array([True, False, True, False, False, True])
+        new_n = self.sim._retire_finished(buf, n, over_mask)
+        
+        self.assertEqual(new_n, 3)
+        self.assertEqual(sorted(buf['sim_ids'][:new_n]), [1, 3, 4])
+        np.testing.assert_array_equal(buf['runs_home'][:new_n], buf['sim_ids'][:new_n] * 10)
+        np.testing.assert_array_equal(buf['final_home'][[0, 2, 5]], [0, 20, 50])
+
+    def test_batch_matches_single_scenarios(self):
+        """One batched call agrees with per-scenario calls and keeps scenarios apart."""
+        scenarios = [
+            (0, 3, 3, 8, False, 1.0, 1.25),   # Tied, home bats vs a dead bullpen
+            (9, 2, 4, 7, True, 1.25, 1.0),    # Home trails
+            (24, 5, 3, 9, True, 1.0, 1.0),    # Already decided: home wins
+        ]
+        states, home, away, innings, tops, home_mods, away_mods = map(list, zip(*scenarios))
+        
+        batch = self.sim.simulate_games_batch(states, home, away, innings, tops,
+                                              home_mods, away_mods, iterations=40000)
+        
+        self.assertEqual(batch.shape, (3,))
+        self.assertEqual(batch[2], 1.0)
+        for k, scenario in enumerate(scenarios[:2]):
+            single = self.sim.simulate_game_vectorized(*scenario, iterations=40000)
+            self.assertAlmostEqual(batch[k], single, delta=0.015)
+
+    def test_paired_event_draws_match_matrix(self):
+        """Event-level paired sampling follows the same transition rows."""
+        n = 200000
+        state_idx = self.sim.state_engine.get_current_state_index(0, 1, 1, 0)
+        states = np.full(n, state_idx, dtype=np.int8)
+        
+        samples = self.sim._sample_paired_next_states(
+            states, states.astype(np.int16) + 25 * self.sim.get_table_index(1.25), np.arange(n),
+            np.full(n, 8, dtype=np.int16), np.ones(n, dtype=bool), np.zeros(n, dtype=np.int16),
+            np.uint64(99), 0
+        )
+        
+        freq = np.bincount(samples, minlength=25) / n
+        np.testing.assert_allclose(freq, self.sim.transition_matrix_fatigued[state_idx], atol=0.005)
+
+    def test_paired_identical_arms_cancel(self):
+        """Common random numbers: identical settings give exactly zero difference."""
+        result = self.sim.simulate_paired(0, 3, 3, 8, False, (1.0, 1.25), (1.0, 1.25), iterations=5000)
+        
+        self.assertEqual(result['diff'], 0.0)
+        self.assertEqual(result['std_error'], 0.0)
+        self.assertEqual(result['prob_a'], result['prob_b'])
+
+    def test_paired_fatigue_edge_has_smaller_error(self):
+        """Paired A/B beats two independent runs of the same size on standard error."""
+        for antithetic in (False, True):
+            result = self.sim.simulate_paired(0, 3, 3, 8, False, (1.0, 1.0), (1.0, 1.25),
+                                              iterations=20001, antithetic=antithetic)
+            p_a, p_b, n = result['prob_a'], result['prob_b'], result['iterations']
+            independent_se = np.sqrt((p_a * (1 - p_a) + p_b * (1 - p_b)) / n)
+            
+            self.assertGreater(result['diff'], 0.08) # Dead away bullpen helps home
+            self.assertLess(result['std_error'], 0.7 * independent_se)
+            self.assertEqual(n % 2, int(not antithetic))
+
+    def test_adaptive_stops_early_in_lopsided_states(self):
+        """A blowout converges in one chunk; a coin flip needs many more."""
+        blowout = self.sim.simulate_game_adaptive(0, 9, 1, 8, True, tolerance=0.005)
+        close = self.sim.simulate_game_adaptive(0, 3, 3, 8, False, tolerance=0.005)
+        
+        self.assertTrue(blowout['converged'])
+        self.assertEqual(blowout['iterations'], MonteCarloSimulator.ADAPTIVE_CHUNK_SIZE)
+        self.assertTrue(close['converged'])
+        self.assertGreater(close['iterations'], 10 * blowout['iterations'])
+        self.assertLessEqual(close['half_width'], 0.005)
+        
+        low, high = close['ci']
+        self.assertLess(low, close['home_win_prob'])
+        self.assertLess(close['home_win_prob'], high)
+
+    def test_adaptive_respects_limits(self):
+        """An unreachable tolerance stops at the time budget or the iteration cap."""
+        capped = self.sim.simulate_game_adaptive(0, 3, 3, 8, False, tolerance=1e-6, max_iterations=5000)
+        self.assertFalse(capped['converged'])
+        self.assertEqual(capped['iterations'], 5000)
+        
+        timed = self.sim.simulate_game_adaptive(0, 3, 3, 8, False, tolerance=1e-6, time_budget=0.0)
+        self.assertFalse(timed['converged'])
+        self.assertEqual(timed['iterations'], MonteCarloSimulator.ADAPTIVE_CHUNK_SIZE)
+        
+        for limits in ({'max_iterations': 0}, {'chunk_size': 0}, {'chunk_size': -5}):
+            with self.assertRaises(ValueError):
+                self.sim.simulate_game_adaptive(0, 3, 3, 8, False, **limits)
+
+    def test_score_distribution_prices_all_markets(self):
+        """One pass gives the moneyline plus totals and run line that partition the histogram."""
+        dist = MonteCarloSimulator(rng=3).simulate_game_distribution(0, 3, 3, 8, False, iterations=20000)
+        moneyline = MonteCarloSimulator(rng=3).simulate_game_vectorized(0, 3, 3, 8, False, iterations=20000)
+
+        self.assertEqual(dist.score_hist.sum(), 20000)
+        self.assertAlmostEqual(dist.home_win_prob, moneyline, places=12)
+
+        # Scores never drop below the starting score
+        self.assertEqual(dist.score_hist[:3].sum() + dist.score_hist[:, :3].sum(), 0)
+        self.assertGreaterEqual(dist.expected_total(), 6.0)
+
+        totals = dist.total_probs(8.5)
+        self.assertAlmostEqual(sum(totals.values()), 1.0)
+        self.assertEqual(totals['push'], 0.0)
+
+        # Home -1.5 covers only on a 2+ run win; +0.5 is the moneyline without ties
+        run_line = dist.run_line_probs(-1.5)
+        self.assertAlmostEqual(sum(run_line.values()), 1.0)
+        self.assertLess(run_line['home'], dist.home_win_prob)
+        self.assertAlmostEqual(dist.run_line_probs(0.5)['away'], 1.0 - dist.home_win_prob)
+
+    def test_seeded_simulators_are_deterministic(self):
+        """Simulators seeded alike draw the same stream; the global RNG is untouched."""
+        first = MonteCarloSimulator(rng=2024)
+        second = MonteCarloSimulator(rng=np.random.default_rng(2024))
+        
+        state = np.random.get_state()
+        self.assertEqual(
+            first.simulate_game_vectorized(0, 3, 3, 8, False, iterations=5000),
+            second.simulate_game_vectorized(0, 3, 3, 8, False, iterations=5000)
+        )
+        self.assertEqual(np.random.get_state()[1].tolist(), state[1].tolist())
+
+    def test_parallel_reproducible_for_seed(self):
+        """Same seed gives the same answer in-process and across a process pool."""
+        args = (0, 3, 3, 8, False)
+        serial = self.sim.simulate_game_parallel(*args, iterations=30000, seed=42,
+                                                 n_workers=1, chunk_size=10000)
+        pooled = self.sim.simulate_game_parallel(*args, iterations=30000, seed=42,
+                                                 n_workers=2, chunk_size=10000)
+        
+        self.assertEqual(serial, pooled)
+        self.assertAlmostEqual(serial, 0.59, delta=0.02)
+
+    def test_parallel_stays_in_process_off_main_thread(self):
+        """From a server thread no pool is spawned (it would re-import the app); the answer is unchanged."""
+        args = (0, 3, 3, 8, False)
+        serial = self.sim.simulate_game_parallel(*args, iterations=20000, seed=7, n_workers=1, chunk_size=10000)
+        
+        results = []
+        def request_handler():
+            results.append(self.sim.simulate_game_parallel(*args, iterations=20000, seed=7, n_workers=4, chunk_size=10000))
+        
+        with patch('app.services.monte_carlo_simulator.ProcessPoolExecutor', side_effect=AssertionError("pool started")):
+            thread = threading.Thread(target=request_handler)
+            thread.start()
+            thread.join()
+        self.assertEqual(results, [serial])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,239 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+from app.services.season_simulator import SeasonSimulator, SeasonCheckpoint, series_win_probability
+from app.services.forecasting_model import ForecastingModel
+from league_fixtures import make_league_fixture
+
+class CountingStatsDb:
+    """Serves Pythagorean win % for some teams and counts round trips."""
+    def __init__(self, pcts):
+        self.pcts = pcts
+        self.queries = 0
+
+    def get_all_pythagorean_win_pcts(self):
+        self.queries += 1
+        return dict(self.pcts)
+
+    def get_advanced_team_stats(self, team_key):
+        self.queries += 1
+        return self.pcts.get(str(team_key))
+
+class TestSeasonSimulator(unittest.TestCase):
+    def setUp(self):
+        self.teams, self.schedule = make_league_fixture()
+
+    def test_seeded_runs_are_reproducible(self):
+        """Two simulators with the same seed produce identical probabilities."""
+        first = SeasonSimulator(self.teams, self.schedule, rng=123)
+        second = SeasonSimulator(self.teams, self.schedule, rng=123)
+        first.run_simulation(iterations=20)
+        second.run_simulation(iterations=20)
+        
+        self.assertEqual(first.get_probabilities(), second.get_probabilities())
+
+    def test_probabilities_are_consistent(self):
+        """Six playoff spots, one pennant per league and one champion per run."""
+        simulator = SeasonSimulator(self.teams, self.schedule, rng=7)
+        simulator.run_simulation(iterations=20)
+        probs = simulator.get_probabilities()
+        
+        self.assertAlmostEqual(sum(p['playoff_spot'] for p in probs.values()), 12.0)
+        self.assertAlmostEqual(sum(p['division_winner'] for p in probs.values()), 6.0)
+        self.assertAlmostEqual(sum(p['league_champion'] for p in probs.values()), 2.0)
+        self.assertAlmostEqual(sum(p['world_series_winner'] for p in probs.values()), 1.0)
+
+    def test_vectorized_season_wins(self):
+        """Every game produces one win and expected wins follow the game probabilities."""
+        simulator = SeasonSimulator(self.teams, self.schedule, rng=11)
+        simulator.MAX_CHUNK_DRAWS = 5000 # Force several chunks
+        wins = simulator.simulate_season_wins(4000)
+        
+        base_wins = np.array([self.teams[t]['w'] for t in simulator.team_ids])
+        self.assertEqual(wins.shape, (4000, 30))
+        np.testing.assert_array_equal(wins.sum(axis=1), base_wins.sum() + len(self.schedule))
+        
+        home_idx, away_idx, home_probs = simulator.get_game_arrays()
+        expected = base_wins + np.bincount(home_idx, home_probs, 30) + np.bincount(away_idx, 1.0 - home_probs, 30)
+        np.testing.assert_allclose(wins.mean(axis=0), expected, atol=0.1)
+
+    def test_series_win_probability_exact(self):
+        """Matches a direct recursion over game outcomes with home-field ordering."""
+        def recurse(p_home, p_away, pattern, need1, need2, game=0):
+            if need1 == 0: return 1.0
+            if need2 == 0: return 0.0
+            p = p_home if pattern[game] else p_away
+            return (p * recurse(p_home, p_away, pattern, need1 - 1, need2, game + 1) +
+                    (1 - p) * recurse(p_home, p_away, pattern, need1, need2 - 1, game + 1))
+
+        p_home = np.array([0.3, 0.5, 0.62])
+        p_away = np.array([0.25, 0.5, 0.55])
+        for games_needed, pattern in SeasonSimulator.SERIES_HOME_PATTERNS.items():
+            expected = [recurse(h, a, pattern, games_needed, games_needed) for h, a in zip(p_home, p_away)]
+            np.testing.assert_allclose(series_win_probability(p_home, p_away, pattern), expected)
+
+    def test_series_table_home_field(self):
+        """Table lookups are complementary and home field helps the stronger side."""
+        simulator = SeasonSimulator(self.teams, self.schedule, rng=4)
+        table = simulator.get_series_table()
+        self.assertEqual(table.shape, (30, 30, 3))
+        self.assertIs(simulator.get_series_table(), table)
+        
+        with_home = simulator.get_series_probability(104, 100, 4)
+        without_home = simulator.get_series_probability(104, 100, 4, team1_home=False)
+        self.assertGreater(with_home, without_home)
+        self.assertAlmostEqual(without_home, 1.0 - simulator.get_series_probability(100, 104, 4))
+
+    def test_postseason_bracket_qualifiers(self):
+        """Division winners and wild cards from a fixed wins matrix."""
+        simulator = SeasonSimulator(self.teams, self.schedule, rng=4)
+        wins = np.array([[self.teams[t]['w'] for t in simulator.team_ids]] * 50)
+        counts = simulator.simulate_postseason(wins)
+        
+        # Slot 4 of every division wins it; each division runner-up takes a wild card
+        ids = simulator.team_ids
+        div_winners = {ids[i] for i in np.flatnonzero(counts['division_winner'] == 50)}
+        playoff = {ids[i] for i in np.flatnonzero(counts['playoff_spot'] == 50)}
+        self.assertEqual(div_winners, {104, 109, 114, 119, 124, 129})
+        self.assertEqual(playoff - div_winners, {103, 108, 113, 118, 123, 128})
+        self.assertEqual(counts['world_series_winner'].sum(), 50)
+        self.assertTrue(set(np.flatnonzero(counts['league_champion'])) <= {ids.index(t) for t in playoff})
+
+    def test_checkpoint_applies_results_as_delta(self):
+        """Resolved games are forced in every iteration; only flipped iterations change."""
+        simulator = SeasonSimulator(self.teams, self.schedule, rng=9)
+        checkpoint = simulator.create_checkpoint(2000)
+        before = checkpoint.wins.copy()
+        
+        # Game 1 is 100 (home) vs 101; the away team wins
+        home, away = simulator.team_index[100], simulator.team_index[101]
+        sim_home_won = np.unpackbits(checkpoint.outcomes, axis=1)[:, 0].astype(bool)
+        rerun = checkpoint.apply_results({1: False, 99999: True}, simulator)
+        
+        self.assertEqual(rerun, sim_home_won.sum())
+        np.testing.assert_array_equal(checkpoint.wins[~sim_home_won], before[~sim_home_won])
+        np.testing.assert_array_equal(checkpoint.wins[sim_home_won, away], before[sim_home_won, away] + 1)
+        np.testing.assert_array_equal(checkpoint.wins[sim_home_won, home], before[sim_home_won, home] - 1)
+        self.assertFalse(np.unpackbits(checkpoint.outcomes, axis=1)[:, 0].any())
+        
+        # Applying the same result again is a no-op
+        self.assertEqual(checkpoint.apply_results({1: False}, simulator), 0)
+
+    def test_checkpoint_catches_up_missed_days(self):
+        """Every date since the last applied one is fetched, so a two-day gap loses no finals."""
+        simulator = SeasonSimulator(self.teams, self.schedule, rng=9)
+        checkpoint = simulator.create_checkpoint(500)
+        checkpoint.applied_through = '2026-06-01'
+        finals = {'2026-06-02': {1: False}, '2026-06-03': {2: True}}
+        fetched = []
+        def get_final_results(date):
+            fetched.append(date)
+            return finals.get(date, {})
+        
+        checkpoint.apply_results_through('2026-06-03', get_final_results, simulator)
+        self.assertEqual(fetched, ['2026-06-02', '2026-06-03'])
+        self.assertEqual(checkpoint.applied_through, '2026-06-03')
+        bits = np.unpackbits(checkpoint.outcomes, axis=1)
+        col1, col2 = checkpoint.game_col[1], checkpoint.game_col[2]
+        self.assertFalse(bits[:, col1].any())
+        self.assertTrue(bits[:, col2].all())
+        
+        # Nothing new to fetch on a same-day rerun
+        checkpoint.apply_results_through('2026-06-03', get_final_results, simulator)
+        self.assertEqual(len(fetched), 2)
+
+    def test_checkpoint_what_if_and_round_trip(self):
+        """What-if leaves the checkpoint untouched; save/load keeps every array."""
+        simulator = SeasonSimulator(self.teams, self.schedule, rng=10)
+        checkpoint = simulator.create_checkpoint(1000)
+        baseline = checkpoint.get_probabilities()
+        
+        # Team 104 loses all of its remaining games
+        losses = {g['game_id']: g['away_id'] == 104 for g in self.schedule if 104 in (g['home_id'], g['away_id'])}
+        what_if = checkpoint.what_if(losses, simulator)
+        self.assertLess(what_if[104]['playoff_spot'], baseline[104]['playoff_spot'])
+        self.assertEqual(checkpoint.get_probabilities(), baseline)
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "checkpoint.npz")
+            checkpoint.save(path)
+            loaded = SeasonCheckpoint.load(path)
+        self.assertEqual(loaded.team_ids, checkpoint.team_ids)
+        self.assertEqual(loaded.created_at, checkpoint.created_at)
+        self.assertIsNone(loaded.applied_through)
+        np.testing.assert_array_equal(loaded.resolved, checkpoint.resolved)
+        np.testing.assert_array_equal(loaded.outcomes, checkpoint.outcomes)
+        self.assertEqual(loaded.get_probabilities(), baseline)
+
+    def test_game_leverage_matches_conditioning(self):
+        """Matmul conditioning equals filtering the iterations by each outcome."""
+        simulator = SeasonSimulator(self.teams, self.schedule, rng=12)
+        checkpoint = simulator.create_checkpoint(3000)
+        checkpoint.LEVERAGE_CHUNK_ROWS = 700 # Force several chunks
+        if_home, if_away, std_error = checkpoint.get_game_leverage("playoff_spot")
+        
+        home_won = np.unpackbits(checkpoint.outcomes, axis=1, count=len(self.schedule)).astype(bool)
+        in_playoffs = (checkpoint.flags & 2) != 0
+        for g in (0, 50, len(self.schedule) - 1):
+            np.testing.assert_allclose(if_home[g], in_playoffs[home_won[:, g]].mean(axis=0))
+            np.testing.assert_allclose(if_away[g], in_playoffs[~home_won[:, g]].mean(axis=0))
+        self.assertTrue((std_error > 0).any())
+        
+        ranked = checkpoint.rank_games_by_leverage(top_n=5)
+        self.assertEqual(len(ranked), 5)
+        self.assertEqual([r['leverage'] for r in ranked], sorted((r['leverage'] for r in ranked), reverse=True))
+        top = ranked[0]
+        self.assertGreater(top['swings'][top['home_id']], 0)
+        
+        # Once a game is final it drops out of the ranking
+        checkpoint.apply_results({top['game_id']: True}, simulator)
+        ranked = checkpoint.rank_games_by_leverage()
+        self.assertNotIn(top['game_id'], [r['game_id'] for r in ranked])
+        self.assertEqual(len(ranked), len(self.schedule) - 1)
+
+    def test_matchup_matrix_matches_per_game_log5(self):
+        """One bulk query; every entry equals the per-call Log5 + home field."""
+        db = CountingStatsDb({'100': 0.62, '101': 0.38, '115': 0.5})
+        model = ForecastingModel(db)
+        matrix, team_index = model.build_matchup_matrix(self.teams)
+        self.assertEqual(db.queries, 1)
+        self.assertEqual(list(team_index), list(self.teams))
+        
+        reference = ForecastingModel(CountingStatsDb(db.pcts))
+        teams = list(self.teams.values())
+        expected = [[reference.get_matchup_probability(h, a) for a in teams] for h in teams]
+        np.testing.assert_array_equal(matrix, expected)
+        
+        simulator = SeasonSimulator(self.teams, self.schedule, db, rng=1)
+        home_idx, away_idx, home_probs = simulator.get_game_arrays()
+        simulator.get_series_table()
+        self.assertEqual(db.queries, 2)
+        np.testing.assert_array_equal(home_probs, np.asarray(expected)[home_idx, away_idx])
+
+    def test_matchup_matrix_follows_fresh_stats(self):
+        """A long-lived model rebuilds from the latest stats instead of its first cached values."""
+        db = CountingStatsDb({'100': 0.62, '101': 0.38})
+        model = ForecastingModel(db)
+        before, team_index = model.build_matchup_matrix(self.teams)
+        
+        db.pcts['100'] = 0.40
+        after, _ = model.build_matchup_matrix(self.teams)
+        home, away = team_index[100], team_index[101]
+        self.assertLess(after[home, away], before[home, away])
+        self.assertEqual(model.get_matchup_probability(self.teams[100], self.teams[101]), after[home, away])
+
+    def test_forecasting_model_shares_generator(self):
+        """The forecasting model draws from the simulator's stream."""
+        simulator = SeasonSimulator(self.teams, self.schedule, rng=1)
+        self.assertIs(simulator.forecasting_model.rng, simulator.rng)
+        
+        model_a = ForecastingModel(rng=5)
+        model_b = ForecastingModel(rng=5)
+        home, away = self.teams[100], self.teams[104]
+        picks_a = [model_a.predict_winner(home, away)['id'] for _ in range(50)]
+        picks_b = [model_b.predict_winner(home, away)['id'] for _ in range(50)]
+        self.assertEqual(picks_a, picks_b)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -39,6 +39,24 @@ def verify_performance():
         print("SUCCESS: Performance target met (<200ms)")
     else:
         print("WARNING: Performance target NOT met (>200ms)")
+    
+    # Precision mode: 1M iterations sharded across a process pool
+    precision_iterations = 1000000
+    print(f"\nRunning {precision_iterations} simulations across processes (seed=42)...")
+    start_time = time.time()
+    
+    precise_prob = sim.simulate_game_parallel(
+        initial_state_idx=state_idx,
+        home_score=4,
+        away_score=4,
+        inning=8,
+        is_top=True,
+        iterations=precision_iterations,
+        seed=42
+    )
+    
+    print(f"Win Probability (Home): {precise_prob:.4f}")
+    print(f"Execution Time: {(time.time() - start_time) * 1000:.2f} ms")
 
 if __name__ == "__main__":
     verify_performance()
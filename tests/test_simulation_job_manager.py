@@ -0,0 +1,98 @@
+import json
+import unittest
+from app.services.simulation_job_manager import SimulationJobManager
+from league_fixtures import make_league_fixture
+
+class FakeMlbApi:
+    def __init__(self, teams, schedule):
+        self.teams = teams
+        self.schedule = schedule
+
+    def get_teams_for_simulation(self):
+        return self.teams
+
+    def get_remaining_schedule(self):
+        return self.schedule
+
+class RecordingDb:
+    def __init__(self):
+        self.saved = []
+
+    def get_all_pythagorean_win_pcts(self):
+        return {}
+
+    def save_simulation_results(self, iterations, probabilities):
+        self.saved.append((iterations, probabilities))
+        return len(self.saved)
+
+class TestSimulationJobManager(unittest.TestCase):
+    def setUp(self):
+        teams, schedule = make_league_fixture()
+        self.db = RecordingDb()
+        self.manager = SimulationJobManager(self.db, FakeMlbApi(teams, schedule))
+        self.manager.CHUNK_SIZE = 100
+
+    def read_events(self, job_id):
+        events = []
+        for frame in self.manager.stream(job_id):
+            if frame.startswith(':'):
+                continue
+            event, data = frame.strip().split('\n')
+            events.append((event[len('event: '):], json.loads(data[len('data: '):])))
+        return events
+
+    def test_stream_reports_progress_until_done(self):
+        """Partial snapshots with intervals arrive per chunk, then a final save."""
+        job = self.manager.start(500)
+        events = self.read_events(job.id)
+        
+        kind, final = events[-1]
+        self.assertEqual(kind, 'done')
+        self.assertEqual(final['status'], 'completed')
+        self.assertEqual(final['completed'], 500)
+        self.assertEqual(final['run_id'], 1)
+        self.assertEqual(self.db.saved[0][0], 500)
+        
+        # Slow readers skip to the latest snapshot, so progress only grows
+        progress = [e['completed'] for kind, e in events if kind == 'progress']
+        self.assertEqual(progress, sorted(progress))
+        self.assertTrue(all(c % 100 == 0 for c in progress))
+        stats = final['probabilities']['104']
+        low, high = stats['ci']['playoff_spot']
+        self.assertLessEqual(low, stats['playoff_spot'])
+        self.assertGreaterEqual(high, stats['playoff_spot'])
+
+    def test_cancel_stops_job(self):
+        """A cancelled job ends without saving results."""
+        job = self.manager.start(1000000)
+        self.manager.cancel(job.id)
+        
+        kind, final = self.read_events(job.id)[-1]
+        self.assertEqual(kind, 'done')
+        self.assertEqual(final['status'], 'cancelled')
+        self.assertLess(final['completed'], 1000000)
+        self.assertEqual(self.db.saved, [])
+
+    def test_running_jobs_are_capped(self):
+        """Starts beyond MAX_RUNNING_JOBS are refused until a job finishes."""
+        self.manager.MAX_RUNNING_JOBS = 1
+        job = self.manager.start(1000000)
+        self.assertIsNone(self.manager.start(100))
+        
+        self.manager.cancel(job.id)
+        self.read_events(job.id)
+        second = self.manager.start(100)
+        self.assertIsNotNone(second)
+        self.assertEqual(self.read_events(second.id)[-1][1]['status'], 'completed')
+
+    def test_missing_data_fails(self):
+        """Jobs without teams or schedule fail instead of hanging the stream."""
+        self.manager.mlb_api = FakeMlbApi({}, [])
+        job = self.manager.start(100)
+        
+        kind, final = self.read_events(job.id)[-1]
+        self.assertEqual(final['status'], 'failed')
+        self.assertIsNone(self.manager.cancel('missing'))
+
+if __name__ == '__main__':
+    unittest.main()
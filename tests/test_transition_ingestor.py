@@ -0,0 +1,152 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+from unittest.mock import MagicMock, patch
+from app.services.transition_ingestor import TransitionIngestor, TransitionStore
+from app.services.markov_chain_service import MarkovChainService
+from app.services.monte_carlo_simulator import MonteCarloSimulator
+
+def make_play(inning, is_top, outs, event, home, away, on=(), origins=()):
+    matchup = {}
+    if 1 in on: matchup['postOnFirst'] = {'id': 1}
+    if 2 in on: matchup['postOnSecond'] = {'id': 2}
+    if 3 in on: matchup['postOnThird'] = {'id': 3}
+    return {
+        'result': {'type': 'atBat', 'eventType': event, 'homeScore': home, 'awayScore': away},
+        'about': {'inning': inning, 'isTopInning': is_top},
+        'count': {'outs': outs},
+        'matchup': matchup,
+        'runners': [{'movement': {'originBase': b}} for b in origins]
+    }
+
+def make_feed(plays, venue_id=15):
+    return {
+        'gameData': {'teams': {'home': {'id': 1}, 'away': {'id': 2}}, 'venue': {'id': venue_id}},
+        'liveData': {'plays': {'allPlays': plays}}
+    }
+
+class TestTransitionIngestor(unittest.TestCase):
+    def setUp(self):
+        with patch('app.services.transition_ingestor.MlbApi'):
+            self.ingestor = TransitionIngestor(MagicMock())
+        
+        # Top 1: single, HR (2 runs), 3 outs. Bot 1: walk, strikeout x3.
+        self.feed = make_feed([
+            make_play(1, True, 0, 'single', 0, 0, on=(1,)),
+            make_play(1, True, 0, 'home_run', 0, 2),
+            make_play(1, True, 1, 'strikeout', 0, 2),
+            make_play(1, True, 2, 'field_out', 0, 2),
+            make_play(1, True, 3, 'field_out', 0, 2),
+            make_play(1, False, 0, 'walk', 0, 2, on=(1,)),
+            make_play(1, False, 1, 'strikeout', 0, 2, on=(1,)),
+            make_play(1, False, 2, 'strikeout', 0, 2, on=(1,)),
+            make_play(1, False, 3, 'strikeout', 0, 2),
+        ])
+
+    def test_counts_transitions_and_runs(self):
+        self.ingestor.ingest_game(self.feed, 2025)
+        store = self.ingestor.store
+        g = store.key_to_idx["2025/all"]
+        
+        self.assertEqual(store.transitions[g].sum(), 9)
+        self.assertEqual(store.transitions[g][0, 4], 2)     # Empty -> runner on 1st (1B, BB)
+        self.assertEqual(store.transitions[g][4, 0], 1)     # HR clears the bases
+        self.assertEqual(store.runs[g][4, 0], 2)
+        self.assertEqual(store.transitions[g][16, 24], 1)   # 2 outs -> End of Inning
+        
+        events = store.events[g].sum(axis=0)
+        self.assertEqual(list(events), [6, 1, 1, 0, 0, 1])
+
+    def test_team_and_park_groups(self):
+        self.ingestor.ingest_game(self.feed, 2025)
+        store = self.ingestor.store
+        
+        self.assertEqual(store.transitions[store.key_to_idx["2025/team/2"]].sum(), 5) # Away batted top
+        self.assertEqual(store.transitions[store.key_to_idx["2025/team/1"]].sum(), 4)
+        self.assertEqual(store.transitions[store.key_to_idx["2025/park/15"]].sum(), 9)
+
+    def test_extra_inning_runner_start_state(self):
+        """The automatic runner on 2nd is the start state even when he does not move."""
+        feed = make_feed([
+            make_play(10, True, 1, 'strikeout', 0, 0, on=(2,)),                        # Runner stays put
+            make_play(10, True, 1, 'single', 0, 1, on=(1,), origins=('2B', None)),     # Runner scores
+        ])
+        self.ingestor.ingest_game(feed, 2025)
+        g = self.ingestor.store.key_to_idx["2025/all"]
+        transitions = self.ingestor.store.transitions[g]
+        self.assertEqual(transitions[2, 10], 1)         # 0 out, on 2nd -> 1 out, on 2nd
+        self.assertEqual(transitions[10, 12], 1)
+        self.assertEqual(transitions[0].sum(), 0)       # No false start from empty bases
+        
+        # Postseason and pre-2020 extras start with the bases empty
+        self.ingestor.ingest_game(feed, 2019)
+        g = self.ingestor.store.key_to_idx["2019/all"]
+        self.assertEqual(self.ingestor.store.transitions[g][0, 10], 1)
+
+    def test_streams_games_one_at_a_time(self):
+        self.ingestor.mlb_api.get_cached_game_feed.side_effect = [self.feed, None, self.feed]
+        store = self.ingestor.ingest_season([1, 2, 3], 2025)
+        
+        self.assertEqual(self.ingestor.games_ingested, 2)
+        self.assertEqual(store.transitions[store.key_to_idx["2025/all"]].sum(), 18)
+
+    def test_save_and_memory_map(self):
+        self.ingestor.ingest_game(self.feed, 2025)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "transition_counts.npz")
+            self.ingestor.store.save(path)
+            loaded = TransitionStore.load(path)
+            
+            self.assertIsInstance(loaded.transitions, np.memmap)
+            self.assertEqual(loaded.keys, self.ingestor.store.keys)
+            np.testing.assert_array_equal(loaded.transitions, self.ingestor.store.transitions)
+            np.testing.assert_array_equal(loaded.events, self.ingestor.store.events)
+            
+            matrix, run_matrix = loaded.get_transition_matrix("2025/all")
+            np.testing.assert_allclose(matrix.sum(axis=1), 1.0)
+            self.assertEqual(run_matrix[4, 0], 2.0)
+            del loaded
+
+    def test_event_rates_drive_markov_engine(self):
+        self.ingestor.ingest_game(self.feed, 2025)
+        rates = self.ingestor.store.get_event_rates("2025/all")
+        
+        self.assertAlmostEqual(sum(rates.values()), 1.0)
+        service = MarkovChainService(base_rates=rates)
+        matrix = service._get_transition_matrix()
+        np.testing.assert_allclose(matrix.sum(axis=1), 1.0)
+        self.assertAlmostEqual(matrix[0, 8], rates['out'] / sum(rates.values()))
+
+    def test_engines_load_store_rates(self):
+        """A loaded store replaces the hardcoded rates; a missing file keeps them."""
+        self.ingestor.ingest_game(self.feed, 2024)
+        self.ingestor.ingest_game(self.feed, 2025)
+        self.ingestor.ingest_game(self.feed, 2025)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "transition_counts.npz")
+            self.assertIsNone(TransitionStore.load_or_none(path))
+            self.ingestor.store.save(path)
+            store = TransitionStore.load_or_none(path)
+            
+            rates = store.get_league_event_rates()
+            self.assertEqual(rates, store.get_event_rates("2025/all"))
+            
+            markov = MarkovChainService(transition_store=store)
+            simulator = MonteCarloSimulator(transition_store=store, rng=0)
+            for event, rate in rates.items():
+                self.assertAlmostEqual(markov.base_rates[event], rate)
+                self.assertAlmostEqual(simulator.base_rates[event], rate)
+            self.assertAlmostEqual(simulator.table_out_probs[simulator.baseline_table], rates['out'])
+            del store
+
+    def test_simulator_honours_out_rate(self):
+        simulator = MonteCarloSimulator(base_rates={'out': 0.5}, rng=0)
+        expected = 0.5 / (0.5 + 0.32)
+        self.assertAlmostEqual(simulator.table_out_probs[simulator.baseline_table], expected)
+        np.testing.assert_allclose(simulator.transition_matrix_normal[0, 8], expected)
+        with self.assertRaises(ValueError):
+            MonteCarloSimulator(base_rates={'out': -1.0})
+
+if __name__ == '__main__':
+    unittest.main()
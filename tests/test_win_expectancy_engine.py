@@ -0,0 +1,82 @@
+import unittest
+import numpy as np
+from app.services.win_expectancy_engine import WinExpectancyEngine
+from app.services.monte_carlo_simulator import MonteCarloSimulator
+
+class TestWinExpectancyEngine(unittest.TestCase):
+    def setUp(self):
+        self.engine = WinExpectancyEngine()
+
+    def test_run_distribution_is_valid(self):
+        """Each base/out state yields a proper distribution whose mean is RE24."""
+        dist = self.engine.get_run_distribution(1.15, 0, 1.0)
+        
+        self.assertEqual(dist.shape, (24, WinExpectancyEngine.MAX_RUNS + 1))
+        np.testing.assert_allclose(dist.sum(axis=1), 1.0)
+        self.assertTrue(np.all(dist >= 0))
+        
+        expected_runs = dist @ np.arange(WinExpectancyEngine.MAX_RUNS + 1)
+        re24 = self.engine.markov.get_re24_vector(1.15, 0, 1.0)
+        np.testing.assert_allclose(expected_runs, re24, atol=1e-6)
+
+    def test_symmetric_game_start(self):
+        """With identical offenses, a tied game at first pitch is a coin flip."""
+        prob = self.engine.get_win_prob(1, 0, [0, 0, 0], 0, True)
+        self.assertAlmostEqual(prob, 0.5, places=6)
+
+    def test_walkoff_and_final_states(self):
+        """Home leading in the bottom of the 9th has already won."""
+        self.assertEqual(self.engine.get_win_prob(9, 1, [0, 0, 0], 1, False), 1.0)
+        
+        # Three outs in the bottom of the 9th while trailing is a loss
+        self.assertEqual(self.engine.get_win_prob(9, 3, [0, 0, 0], -1, False), 0.0)
+        
+        # Tied, bottom 9, bases loaded, 0 outs: very likely walk-off
+        self.assertGreater(self.engine.get_win_prob(9, 0, [1, 1, 1], 0, False), 0.80)
+
+    def test_extra_innings_start_with_runner_on_second(self):
+        """Tied extras are a coin flip once both sides get the runner on second."""
+        tied_ghost = self.engine.get_win_prob(10, 0, [0, 1, 0], 0, True)
+        self.assertAlmostEqual(tied_ghost, 0.5, places=6)
+        self.assertAlmostEqual(self.engine.get_value_tables()['extra_tie'], 0.5, places=6)
+        
+        # Away already stranded its runner: home still gets one in the bottom half
+        self.assertGreater(self.engine.get_win_prob(10, 3, [0, 0, 0], 0, True), 0.5)
+        
+        # Every extra inning shares the same stationary value
+        self.assertAlmostEqual(
+            self.engine.get_win_prob(10, 1, [1, 0, 0], -1, False),
+            self.engine.get_win_prob(14, 1, [1, 0, 0], -1, False)
+        )
+
+    def test_monotonic_in_score(self):
+        """More home runs on the board can never lower Home Win Probability."""
+        probs = [self.engine.get_win_prob(6, 1, [1, 0, 0], d, True) for d in range(-5, 6)]
+        self.assertTrue(all(a < b for a, b in zip(probs, probs[1:])))
+
+    def test_bullpen_fatigue_direction(self):
+        """A tired away bullpen helps the home team, a tired home bullpen hurts it."""
+        base = self.engine.get_win_prob(7, 0, [0, 0, 0], 0, True)
+        away_tired = self.engine.get_win_prob(7, 0, [0, 0, 0], 0, True, away_bullpen_mod=1.25)
+        home_tired = self.engine.get_win_prob(7, 0, [0, 0, 0], 0, True, home_bullpen_mod=1.25)
+        
+        self.assertGreater(away_tired, base)
+        self.assertLess(home_tired, base)
+
+    def test_value_tables_are_cached(self):
+        tables = self.engine.get_value_tables(1.0, 1.15)
+        self.assertIs(self.engine.get_value_tables(1.0, 1.1500001), tables)
+        self.assertEqual(len(self.engine.value_cache), 1)
+
+    def test_agrees_with_monte_carlo(self):
+        """Exact answer should sit inside Monte Carlo sampling noise (baseline rates)."""
+        sim = MonteCarloSimulator(rng=7)
+        state_idx = sim.state_engine.get_current_state_index(1, 0, 1, 0)
+        
+        exact = self.engine.get_win_prob(8, 1, [0, 1, 0], -1, True)
+        sampled = sim.simulate_game_vectorized(state_idx, 3, 4, 8, True, iterations=50000)
+        
+        self.assertAlmostEqual(exact, sampled, delta=0.015)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,59 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+from app.services.markov_chain_service import MarkovChainService
+from app.services.win_prob_table import WinProbabilityTable
+
+class TestWinProbabilityTable(unittest.TestCase):
+    def setUp(self):
+        self.direct = MarkovChainService()
+        self.fast = MarkovChainService(use_lookup_table=True, table_path=None)
+
+    def test_grid_points_match_direct(self):
+        """On-grid modifiers should reproduce the sigmoid exactly (float32 precision)."""
+        for inning, outs, runners, diff, is_top, mod in [
+            (1, 0, [0, 0, 0], 0, True, 1.0),
+            (7, 1, [1, 0, 1], -2, False, 1.15),
+            (9, 2, [1, 1, 1], 1, True, 1.25),
+            (11, 0, [0, 1, 0], 0, False, 1.5),
+        ]:
+            expected = self.direct.get_instant_win_prob(inning, outs, runners, diff, is_top, pitcher_mod=mod)
+            actual = self.fast.get_instant_win_prob(inning, outs, runners, diff, is_top, pitcher_mod=mod)
+            self.assertAlmostEqual(actual, expected, places=5)
+
+    def test_modifier_interpolation(self):
+        """Off-grid modifiers are interpolated within a tight tolerance."""
+        for mod in [1.001, 1.03, 1.265, 1.3915]:
+            expected = self.direct.get_instant_win_prob(8, 1, [1, 1, 0], 0, False, pitcher_mod=mod)
+            actual = self.fast.get_instant_win_prob(8, 1, [1, 1, 0], 0, False, pitcher_mod=mod)
+            self.assertAlmostEqual(actual, expected, places=3)
+
+    def test_off_grid_falls_back(self):
+        """Score diffs and modifiers outside the tensor use the direct calculation."""
+        table = self.fast.win_prob_table
+        self.assertIsNone(table.lookup(3, True, 0, 16, 1.0))
+        self.assertIsNone(table.lookup(3, True, 0, 0, 1.6))
+        self.assertIsNone(table.lookup(3, True, 0, 0, 0.9))
+        
+        expected = self.direct.get_instant_win_prob(3, 0, [0, 0, 0], 16, True, pitcher_mod=1.0)
+        actual = self.fast.get_instant_win_prob(3, 0, [0, 0, 0], 16, True, pitcher_mod=1.0)
+        self.assertEqual(actual, expected)
+
+    def test_save_and_memory_map(self):
+        """Saved tables load back as a read-only memory map."""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "win_prob_table.npy")
+            self.fast.win_prob_table.save(path)
+            
+            loaded = WinProbabilityTable.load(path)
+            self.assertIsInstance(loaded.table, np.memmap)
+            np.testing.assert_array_equal(loaded.table, self.fast.win_prob_table.table)
+            del loaded
+
+    def test_rejects_wrong_shape(self):
+        with self.assertRaises(ValueError):
+            WinProbabilityTable(np.zeros((9, 2, 24, 31, 12), dtype=np.float32))
+
+if __name__ == '__main__':
+    unittest.main()